@@ -0,0 +1,128 @@
+"""
+Сравнение кодеков `LazyCache` на турнирной таблице (`ContestStandings`).
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.lazy_cache_codecs --contestants 1000 5000 --repeat 50
+
+Для каждого размера таблицы печатает медианное время записи (encode), чтения (decode) и размер значения.
+Строка `legacy` - прежний путь `LazyCache`: `model_dump_json()` и `json.loads` + `model_validate`.
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import (
+    Callable,
+    List,
+    Tuple,
+)
+
+from backend.core.optimazers.cache.codecs import (
+    ICacheCodec,
+    MsgpackTrustedCodec,
+    OrjsonTrustedCodec,
+    PydanticJsonCodec,
+)
+from backend.core.schemas.contest import (
+    ArrayContestantInStandings,
+    ContestantInStandings,
+    ContestStandings,
+)
+
+
+class _LegacyCodec(ICacheCodec):
+    name = "legacy"
+
+    def encode(self, value: ContestStandings) -> str:
+        return value.model_dump_json()
+
+    def decode(self, model_class, payload: str) -> ContestStandings:
+        return model_class.model_validate(json.loads(payload))
+
+
+def _make_standings(
+        contestants: int,
+) -> ContestStandings:
+    rng = random.Random(contestants)
+    points = sorted((rng.randint(0, 5000) for _ in range(contestants)), reverse=True)
+    started_at = datetime(2025, 3, 1, 10, 0, 0)
+
+    return ContestStandings(
+        contest_id=1,
+        name="Benchmark contest",
+        started_at=started_at,
+        closed_at=started_at + timedelta(hours=5),
+        standings=ArrayContestantInStandings(
+            body=[
+                ContestantInStandings(
+                    contestant_id=i + 1,
+                    name=f"Команда участника №{i + 1}",
+                    points=p,
+                    rank=i + 1,
+                )
+                for i, p in enumerate(points)
+            ]
+        ),
+        total=contestants,
+        freeze_at=started_at + timedelta(hours=4),
+    )
+
+
+def _median_ms(
+        action: Callable[[], object],
+        repeat: int,
+) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings) * 1000
+
+
+def _available_codecs() -> List[ICacheCodec]:
+    codecs: List[ICacheCodec] = [_LegacyCodec(), PydanticJsonCodec()]
+    for codec_class in (OrjsonTrustedCodec, MsgpackTrustedCodec):
+        try:
+            codecs.append(codec_class())
+        except RuntimeError as e:
+            print(f"skip {codec_class.__name__}: {e}")
+    return codecs
+
+
+def _bench_codec(
+        codec: ICacheCodec,
+        standings: ContestStandings,
+        repeat: int,
+) -> Tuple[float, float, int]:
+    payload = codec.encode(standings)
+    decoded = codec.decode(ContestStandings, payload)
+    # Кодек обязан вернуть то же, что отдаст ручка
+    assert decoded.model_dump(mode="json") == standings.model_dump(mode="json"), f"{codec.name} changed the payload"
+
+    encode_ms = _median_ms(lambda: codec.encode(standings), repeat)
+    decode_ms = _median_ms(lambda: codec.decode(ContestStandings, payload), repeat)
+    return encode_ms, decode_ms, len(payload.encode())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contestants", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    codecs = _available_codecs()
+    for contestants in args.contestants:
+        # Значение проходит через кеш уже провалидированным - как результат сервиса
+        standings = _make_standings(contestants)
+        print(f"\n{contestants} contestants")
+        print(f"{'codec':<10}{'encode, ms':>12}{'decode, ms':>12}{'size, KiB':>12}")
+        for codec in codecs:
+            encode_ms, decode_ms, size = _bench_codec(codec, standings, args.repeat)
+            print(f"{codec.name:<10}{encode_ms:>12.3f}{decode_ms:>12.3f}{size / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Вход сотен участников в начале контеста: проверка пароля bcrypt в event loop'е против пула `PASSWORD_HASHING_EXECUTOR`.
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.login_storm --logins 300 --arrival-s 5
+
+Логины приходят равномерно за `arrival-s` секунд, параллельно event loop обслуживает "прочие запросы" -
+корутину, которая каждые 5 мс просыпается и замеряет, насколько позже срока её разбудили. Для каждого
+режима печатает пропускную способность логинов и задержку event loop'а (p50, p99, max): именно её видят
+все остальные запросы воркера.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import (
+    Awaitable,
+    Callable,
+    List,
+)
+
+from backend.core.services.security import (
+    hash_password,
+    verify_password,
+    verify_password_async,
+)
+
+_TICK_S = 0.005
+
+
+async def _verify_inline(plain: str, hashed: str) -> bool:
+    return verify_password(plain, hashed)
+
+
+async def _measure_loop_lag(
+        lags: List[float],
+        stop: asyncio.Event,
+) -> None:
+    while not stop.is_set():
+        expected_at = time.perf_counter() + _TICK_S
+        await asyncio.sleep(_TICK_S)
+        lags.append(max(0.0, time.perf_counter() - expected_at))
+
+
+async def _storm(
+        verify: Callable[[str, str], Awaitable[bool]],
+        hashed: str,
+        logins: int,
+        arrival_s: float,
+) -> None:
+    lags: List[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_measure_loop_lag(lags, stop))
+
+    async def login(delay_s: float) -> None:
+        await asyncio.sleep(delay_s)
+        assert await verify("benchmark-password", hashed)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(login(i * arrival_s / logins) for i in range(logins)))
+    elapsed_s = time.perf_counter() - started_at
+
+    stop.set()
+    await ticker
+
+    lags.sort()
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(
+        f"{verify.__name__:>24} {logins / elapsed_s:>10.1f} "
+        f"{statistics.median(lags) * 1000:>10.1f} {p99 * 1000:>10.1f} {lags[-1] * 1000:>10.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=300)
+    parser.add_argument("--arrival-s", type=float, default=5.0)
+    args = parser.parse_args()
+
+    hashed = hash_password("benchmark-password")
+
+    print(f"{'mode':>24} {'logins/s':>10} {'lag p50ms':>10} {'lag p99ms':>10} {'lag maxms':>10}")
+    for verify in (_verify_inline, verify_password_async):
+        asyncio.run(_storm(verify, hashed, args.logins, args.arrival_s))
+
+
+if __name__ == "__main__":
+    main()
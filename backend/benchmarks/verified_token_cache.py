@@ -0,0 +1,64 @@
+"""
+Стоимость проверки JWT на запрос: `jwt.decode` на каждом запросе против кеша проверенных токенов (`decode_token`).
+
+Запуск из корня репозитория:
+    python -m backend.benchmarks.verified_token_cache --users 100 5000 --requests 200000 --rps 3000
+
+Запросы раскладываются по `users` активным токенам случайно, как от SPA участников, переиспользующих
+свой access-токен. Для каждого числа пользователей печатает среднее время проверки на запрос и долю
+одного ядра, которую проверка занимает при `rps` запросах в секунду.
+"""
+import argparse
+import random
+import time
+from typing import (
+    Callable,
+    List,
+)
+
+from jose import jwt
+
+from backend.core.services.security import (
+    ALGORITHM,
+    SECRET_KEY,
+    _verified_tokens,
+    create_access_token,
+    decode_token,
+)
+
+
+def _uncached_decode(token: str):
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+
+def _measure(
+        decode: Callable[[str], dict],
+        requests: List[str],
+) -> float:
+    started_at = time.perf_counter()
+    for token in requests:
+        decode(token)
+    return (time.perf_counter() - started_at) / len(requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, nargs="+", default=[100, 5000])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--rps", type=int, default=3000)
+    args = parser.parse_args()
+
+    print(f"{'users':>8} {'mode':>10} {'us/request':>12} {'core share':>12}")
+    for users in args.users:
+        tokens = [create_access_token({"sub": f"user-{i}"}) for i in range(users)]
+        rng = random.Random(users)
+        requests = [rng.choice(tokens) for _ in range(args.requests)]
+
+        _verified_tokens.clear()
+        for mode, decode in (("uncached", _uncached_decode), ("cached", decode_token)):
+            per_request_s = _measure(decode, requests)
+            print(f"{users:>8} {mode:>10} {per_request_s * 1e6:>12.2f} {per_request_s * args.rps:>11.1%}")
+
+
+if __name__ == "__main__":
+    main()
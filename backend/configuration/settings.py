@@ -34,6 +34,57 @@ class Settings(BaseSettings):
     REDIS_KV_SIMPLE_CACHE_HOST: str = 'localhost'
     REDIS_KV_SIMPLE_CACHE_PORT: int = 6379
     REDIS_KV_SIMPLE_CACHE_DB: int = 0
+    # Хранилище `IKeyValueSimpleCache`: "redis" или "memory" (без сети, только для развёртывания в один процесс)
+    KV_SIMPLE_CACHE_BACKEND: str = "redis"
+    MEMORY_KV_SIMPLE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Клиентское кеширование редко меняющихся ключей (чёрный список токенов) по сообщениям Redis client tracking:
+    # срок жизни локального значения и число локальных значений на процесс
+    REDIS_KV_CLIENT_TRACKING: bool = False
+    REDIS_KV_CLIENT_TRACKING_LOCAL_TTL_S: float = 60.0
+    REDIS_KV_CLIENT_TRACKING_MAX_ENTRIES: int = 100_000
+    # Время жизни версии тега кеша - должно превышать время жизни любой закешированной записи
+    CACHE_TAG_TTL_S: int = 7 * 24 * 60 * 60
+    # Шина инвалидации in-process кешей: транспорт ("redis" или "postgres") и допустимое время без вестей от него.
+    # Дольше этого времени процесс не доверяет своим in-process кешам
+    CACHE_INVALIDATION_TRANSPORT: str = "redis"
+    CACHE_INVALIDATION_MAX_STALENESS_S: float = 3.0
+    # Фильтр Блума отозванных токенов в памяти процесса: ширина корзины по времени истечения, ёмкость корзины,
+    # доля ложноположительных ответов и интервал перестроения из индекса в Redis.
+    # С `KV_SIMPLE_CACHE_BACKEND=memory` не используется: чёрный список и так в памяти процесса
+    TOKEN_BLACKLIST_BLOOM_FILTER: bool = True
+    TOKEN_BLACKLIST_BLOOM_BUCKET_S: int = 3600
+    TOKEN_BLACKLIST_BLOOM_BUCKET_CAPACITY: int = 100_000
+    TOKEN_BLACKLIST_BLOOM_ERROR_RATE: float = 0.001
+    TOKEN_BLACKLIST_BLOOM_RESYNC_S: int = 60
+    # Unix-время выкладки, после которой записи чёрного списка пишутся только по SHA-256 токена (2026-10-18 UTC).
+    # Записи прежнего формата (токен целиком как ключ) проверяются только для токенов, выпущенных раньше
+    TOKEN_BLACKLIST_LEGACY_CUTOFF_AT: float = 1792281600.0
+    # In-process кеш пользователей для аутентификации и проверок доступа (сбрасывается при изменении пользователя)
+    PRINCIPAL_CACHE_TTL_S: int = 300
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 50_000
+    # Кеш проверенных JWT в процессе: запись живёт до `exp` токена, но не дольше TTL
+    VERIFIED_TOKEN_CACHE_TTL_S: int = 300
+    VERIFIED_TOKEN_CACHE_MAX_ENTRIES: int = 100_000
+    # Пул для bcrypt: "thread" или "process" и число воркеров пула
+    PASSWORD_HASHING_EXECUTOR: str = "thread"
+    PASSWORD_HASHING_WORKERS: int = 4
+    # Допуск запросов /auth/login и /auth/refresh: одновременно выполняемые проверки, длина очереди
+    # каждого приоритета, время ожидания в очереди и Retry-After для отклонённых
+    AUTH_ADMISSION_MAX_CONCURRENCY: int = 8
+    AUTH_ADMISSION_MAX_QUEUE: int = 64
+    AUTH_ADMISSION_QUEUE_TIMEOUT_S: float = 2.0
+    AUTH_ADMISSION_RETRY_AFTER_S: int = 2
+
+    REDIS_STANDINGS_DB: int = 2
+    # Как часто (в секундах) турнирная таблица в Redis пересобирается из БД
+    STANDINGS_REBUILD_INTERVAL_S: int = 300
+    # Сколько (в секундах) после заморозки таблица считается по истории очков на каждое чтение, прежде чем
+    # сохраниться снимком: столько могут коммититься транзакции, начатые до заморозки
+    STANDINGS_FROZEN_SNAPSHOT_GRACE_S: int = 60
+    # Поток турнирной таблицы: интервал keep-alive и максимальная длительность соединения.
+    # По истечении длительности клиент переподключается - так заново проверяются токен и права доступа
+    STANDINGS_STREAM_HEARTBEAT_S: int = 15
+    STANDINGS_STREAM_MAX_LIFETIME_S: int = 300
 
     #  Fernet key must be 32 url-safe base64-encoded bytes.
     FERNET_KEY: str = "vHf2zp7vofWyFNhkfbR1pEXZ8718gaUF1i-KXIHXpdg="
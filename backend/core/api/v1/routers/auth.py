@@ -1,5 +1,10 @@
 import asyncio
-from typing import Annotated
+import math
+from contextlib import asynccontextmanager
+from typing import (
+    Annotated,
+    AsyncIterator,
+)
 
 import fastapi
 from fastapi import (
@@ -14,6 +19,10 @@ from backend.core.dependencies.authorization import get_user_with_access_token
 from backend.core.dependencies.repository import get_repository
 from backend.core.forms.authorization import CustomLoginForm
 from backend.core.models.user import User
+from backend.core.optimazers.admission import (
+    AdmissionRejected,
+    get_auth_admission_gate,
+)
 from backend.core.repository.crud.user import UserCRUDRepository
 from backend.core.schemas.user import (
     SiteUserCreate,
@@ -36,6 +45,33 @@ from backend.handlers.token_blacklist.interface import ITokenBlacklistHandler
 
 router = fastapi.APIRouter(prefix="/auth", tags=["authentication"])
 
+# Приоритеты в шлюзе допуска (меньше - раньше): продление сессии уже вошедших важнее новых входов
+_REFRESH_PRIORITY = 0
+_LOGIN_PRIORITY = 1
+
+
+@asynccontextmanager
+async def _admit_auth_request(priority: int) -> AsyncIterator[None]:
+    """
+    Допускает запрос через шлюз проверок учётных данных или отвечает 503 с Retry-After.
+
+    Во время массового входа в начале контеста шлюз ограничивает число одновременных проверок паролей,
+    чтобы они не занимали все соединения с БД и пул bcrypt в ущерб запросам уже вошедших участников.
+    """
+    gate = get_auth_admission_gate()
+    try:
+        await gate.acquire(priority)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many sign-in requests, retry later.",
+            headers={"Retry-After": str(math.ceil(e.retry_after_s))},
+        )
+    try:
+        yield
+    finally:
+        gate.release()
+
 
 @router.post(
     path="/register",
@@ -122,6 +158,7 @@ async def login_for_access_token(
 
     Raises:
         TokenException: Если аутентификация не удалась (неверные учётные данные) — возвращает 401.
+        HTTPException(503): Если проверок учётных данных слишком много (с заголовком Retry-After).
 
     Куки (refresh_token):
         - Устанавливается в защищённый режим (httponly, secure, samesite="none")
@@ -133,18 +170,18 @@ async def login_for_access_token(
         В режиме отладки могут быть изменены на менее строгие значения.
     """
 
-    access_token: str = (
-        await auth_service.authenticate_user(
-            domain_number=form_data.domain_number,
-            username=form_data.username,
-            password=form_data.password,
-            user_repo=user_repo,
+    async with _admit_auth_request(_LOGIN_PRIORITY):
+        user: User = (
+            await auth_service.authenticate_user(
+                domain_number=form_data.domain_number,
+                username=form_data.username,
+                password=form_data.password,
+                user_repo=user_repo,
+            )
         )
-    )
-    user: User = (
-        await user_repo.get_user_by_username_and_domain(
-            username=form_data.username,
-            domain_number=form_data.domain_number,
+    access_token: str = (
+        create_access_token(
+            data={"sub": user.uuid},
         )
     )
     refresh_token: str = (
@@ -202,6 +239,8 @@ async def refresh_access_token(
         HTTPException(401):
             - Если refresh_token отсутствует в куках
             - Если refresh_token недействителен или пользователь не найден
+        HTTPException(503):
+            - Если проверок учётных данных слишком много (с заголовком Retry-After)
 
     Примечание:
         Сам refresh-токен не обновляется — используется существующий с тем же сроком жизни.
@@ -211,12 +250,13 @@ async def refresh_access_token(
     if not refresh_token:
         raise HTTPException(status_code=401, detail="Refresh token missing.")
 
-    user: User | None = (
-        await verify_refresh_token(
-            token=refresh_token,
-            user_repo=user_repo,
+    async with _admit_auth_request(_REFRESH_PRIORITY):
+        user: User | None = (
+            await verify_refresh_token(
+                token=refresh_token,
+                user_repo=user_repo,
+            )
         )
-    )
     if not user:
         raise HTTPException(status_code=401, detail="User not found.")
 
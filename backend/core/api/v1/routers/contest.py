@@ -1,13 +1,20 @@
+from typing import AsyncIterator
+
 import fastapi
 from fastapi import (
     Body,
     Depends,
     Query,
 )
-from starlette.responses import JSONResponse
+from starlette.responses import (
+    JSONResponse,
+    StreamingResponse,
+)
 
+from backend.configuration.settings import settings
 from backend.core.dependencies.authorization import get_user
-from backend.core.models import User
+from backend.core.dependencies.etag import ContestETag
+from backend.core.optimazers.cache.principal import Principal
 from backend.core.schemas.contest import (
     ContestId,
     ContestCreateRequest,
@@ -16,16 +23,24 @@ from backend.core.schemas.contest import (
     ContestInfoForContestant,
     ArrayContestShortInfo,
     ContestStandings,
+    ContestStandingsEvent,
+    ContestStandingsEventType,
+    ContestStandingsHistory,
     ContestSubmissions
 )
+from backend.core.services.access_policies.contest import ContestAccessPolicy
 from backend.core.services.interfaces.contest import IContestService
 from backend.core.services.providers.contest import get_contest_service
 from backend.core.utilities.exceptions.database import EntityDoesNotExist
 from backend.core.utilities.exceptions.handlers.http400 import async_http_exception_mapper
+from backend.core.utilities.exceptions.logic import FeatureUnavailable
 from backend.core.utilities.exceptions.permission import PermissionDenied
 
 router = fastapi.APIRouter(prefix="/contest", tags=["contest"])
 
+# Проверки доступа, которые ETag-зависимость выполняет до ответа 304
+_contest_access_policy = ContestAccessPolicy()
+
 
 @router.post(
     path="/",
@@ -39,7 +54,7 @@ router = fastapi.APIRouter(prefix="/contest", tags=["contest"])
 )
 async def create_contest(
         params: ContestCreateRequest = Body(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contest_service: IContestService = Depends(get_contest_service),
 ) -> ContestId:
     """
@@ -56,7 +71,7 @@ async def create_contest(
             - closed_at: дата и время окончания
             - start_points: стартовый баланс участников (0–10000)
             - number_of_slots_for_problems: количество задач, которые участник может держать одновременно (1–5)
-        user (User): Авторизованный пользователь, создающий контест (определяется по JWT).
+        user (Principal): Авторизованный пользователь, создающий контест (определяется по JWT).
         contest_service (IContestService): Сервис для создания контеста.
 
     Returns:
@@ -92,7 +107,7 @@ async def create_contest(
 )
 async def update_contest(
         params: ContestUpdateRequest = Body(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contest_service: IContestService = Depends(get_contest_service),
 ) -> JSONResponse:
     """
@@ -110,7 +125,7 @@ async def update_contest(
             - number_of_slots_for_problems: количество задач, которые можно держать одновременно (1–5)
             - rule_type: тип правил контеста
             - flag_user_can_have_negative_points: разрешены ли отрицательные баллы у участников
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         contest_service (IContestService): Сервис для обновления контеста.
 
     Returns:
@@ -146,7 +161,7 @@ async def update_contest(
 )
 async def delete_contest(
         contest_id: int = Query(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contest_service: IContestService = Depends(get_contest_service),
 ) -> None:
     """
@@ -157,7 +172,7 @@ async def delete_contest(
 
     Args:
         contest_id (int): ID контеста, который необходимо удалить (передаётся в query-параметре).
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         contest_service (IContestService): Сервис для удаления контеста.
 
     Returns:
@@ -192,7 +207,7 @@ async def delete_contest(
     }
 )
 async def view_contests(
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contest_service: IContestService = Depends(get_contest_service),
 ) -> ArrayContestShortInfo:
     """
@@ -201,7 +216,7 @@ async def view_contests(
     Возвращает краткую информацию о каждом контесте: ID, название, даты начала и окончания.
 
     Args:
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         contest_service (IContestService): Сервис для получения списка контестов пользователя.
 
     Returns:
@@ -236,7 +251,7 @@ async def view_contests(
 )
 async def contest_info_for_editor(
         contest_id: int = Query(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contest_service: IContestService = Depends(get_contest_service),
 ) -> ContestInfoForEditor:
     """
@@ -247,7 +262,7 @@ async def contest_info_for_editor(
 
     Args:
         contest_id (int): ID контеста, информация о котором запрашивается (передаётся в query).
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         contest_service (IContestService): Сервис для получения данных контеста.
 
     Returns:
@@ -286,7 +301,7 @@ async def contest_info_for_editor(
     }
 )
 async def contest_info_for_contestant(
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contest_service: IContestService = Depends(get_contest_service),
 ) -> ContestInfoForContestant:
     """
@@ -296,7 +311,7 @@ async def contest_info_for_contestant(
     Возвращает общедоступные данные: название, ID и временные рамки контеста.
 
     Args:
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         contest_service (IContestService): Сервис для получения данных контеста.
 
     Returns:
@@ -328,7 +343,13 @@ async def contest_info_for_contestant(
 )
 async def contest_standings(
         contest_id: int = Query(...),
-        user: User = Depends(get_user),
+        offset: int = Query(0, ge=0),
+        limit: int | None = Query(None, ge=1, le=1000),
+        around_me: int | None = Query(None, ge=0, le=100),
+        user: Principal = Depends(get_user),
+        _etag: str | None = Depends(ContestETag(
+            access_check=_contest_access_policy.can_user_view_contest_standing,
+        )),
         contest_service: IContestService = Depends(get_contest_service),
 ) -> ContestStandings:
     """
@@ -336,10 +357,18 @@ async def contest_standings(
 
     Доступно участникам контеста и пользователям с правами на просмотр standings.
     Содержит список участников с их баллами, именами и местами в рейтинге.
+    Таблицу можно запрашивать окнами: первые N (`limit`), страницу (`offset` + `limit`)
+    или окрестность текущего участника (`around_me`).
 
     Args:
         contest_id (int): ID контеста, таблица которого запрашивается (в query-параметре).
-        user (User): Авторизованный пользователь (определяется по JWT).
+        offset (int): С какой позиции (с нуля) отдавать таблицу.
+        limit (int | None): Сколько участников отдать. По умолчанию - до конца таблицы.
+        around_me (int | None): Отдать `around_me` позиций выше и ниже текущего участника
+            (offset и limit игнорируются). Для не-участников контеста не действует.
+        user (Principal): Авторизованный пользователь (определяется по JWT).
+        _etag (str | None): ETag ответа, если доступ есть. Если он совпадает с `If-None-Match`, ручка отвечает 304
+            без обращения к сервису.
         contest_service (IContestService): Сервис для получения данных таблицы.
 
     Returns:
@@ -349,6 +378,11 @@ async def contest_standings(
             - started_at, closed_at: даты начала и окончания
             - standings: список участников с баллами и местами
             - use_cache: флаг, указывающий, используются ли кэшированные данные (по умолчанию False)
+            - offset: позиция (с нуля) первого участника в `standings`
+            - total: общее число участников в таблице
+            - freeze_at: момент заморозки таблицы (если задан)
+            - is_frozen: таблица заморожена - участникам отдаётся снимок на момент freeze_at,
+              менеджерам контеста - живая таблица
 
         Каждый участник в `standings.body` содержит:
             - contestant_id: ID участника
@@ -364,12 +398,153 @@ async def contest_standings(
     result: ContestStandings = await contest_service.contest_standings(
         user_id=user.id,
         contest_id=contest_id,
+        offset=offset,
+        limit=limit,
+        around_me=around_me,
+    )
+    result = result.model_dump()
+
+    return result
+
+
+@router.get(
+    path="/standings/history",
+    response_model=ContestStandingsHistory,
+    status_code=200,
+)
+@async_http_exception_mapper(
+    mapping={
+        PermissionDenied: (403, None),
+        EntityDoesNotExist: (404, None),
+    }
+)
+async def contest_standings_history(
+        contest_id: int = Query(...),
+        top_k: int = Query(10, ge=1, le=50),
+        max_points: int = Query(100, ge=2, le=1000),
+        user: Principal = Depends(get_user),
+        _etag: str | None = Depends(ContestETag(
+            access_check=_contest_access_policy.can_user_view_contest_standing,
+            time_quantum_s=60,
+        )),
+        contest_service: IContestService = Depends(get_contest_service),
+) -> ContestStandingsHistory:
+    """
+    Возвращает историю очков лидеров контеста для графика.
+
+    Права доступа те же, что и у `/standings`. Во время заморозки участники получают лидеров
+    и историю на момент заморозки.
+
+    Args:
+        contest_id (int): ID контеста (в query-параметре).
+        top_k (int): Для скольких лидеров текущей таблицы отдать историю (1–50).
+        max_points (int): Максимум точек в истории одного участника (2–1000).
+            Длинная история прореживается: от каждого из `max_points` равных интервалов контеста
+            остаётся последнее значение очков.
+        user (Principal): Авторизованный пользователь (определяется по JWT).
+        _etag (str | None): ETag ответа, если доступ есть. Если он совпадает с `If-None-Match`, ручка отвечает 304
+            без обращения к сервису.
+        contest_service (IContestService): Сервис для получения данных таблицы.
+
+    Returns:
+        ContestStandingsHistory: Объект с информацией:
+            - contest_id, started_at, closed_at: данные контеста
+            - is_frozen: история обрезана моментом заморозки таблицы
+            - series: лидеры в порядке таблицы (contestant_id, name, rank) и их `history` -
+              точки (at, points) по возрастанию времени
+
+    Raises:
+        PermissionDenied: Если пользователь не имеет прав на просмотр таблицы (возвращает 403).
+        EntityDoesNotExist: Если контест с указанным ID не существует (возвращает 404).
+    """
+
+    result: ContestStandingsHistory = await contest_service.contest_standings_history(
+        user_id=user.id,
+        contest_id=contest_id,
+        top_k=top_k,
+        max_points=max_points,
     )
     result = result.model_dump()
 
     return result
 
 
+@router.get(
+    path="/standings/stream",
+    response_class=StreamingResponse,
+    status_code=200,
+)
+@async_http_exception_mapper(
+    mapping={
+        PermissionDenied: (403, None),
+        EntityDoesNotExist: (404, None),
+        FeatureUnavailable: (503, None),
+    }
+)
+async def contest_standings_stream(
+        contest_id: int = Query(...),
+        user: Principal = Depends(get_user),
+        contest_service: IContestService = Depends(get_contest_service),
+) -> StreamingResponse:
+    """
+    Отдаёт изменения турнирной таблицы контеста потоком Server-Sent Events вместо периодического опроса `/standings`.
+
+    Права доступа те же, что и у `/standings`, и проверяются до начала потока.
+
+    События (`event:` - тип, `id:` - порядковый номер изменения, `data:` - JSON `ContestStandingsEvent`):
+        - snapshot: таблица целиком. Первое событие потока; повторяется, если таблица была пересобрана
+          или клиент не успевал получать изменения;
+        - delta: только участники, у которых изменились очки или место - их записи заменяют прежние.
+    Раз в `STANDINGS_STREAM_HEARTBEAT_S` секунд без изменений отправляется комментарий-keep-alive.
+    Через `STANDINGS_STREAM_MAX_LIFETIME_S` секунд поток закрывается - клиент переподключается
+    (EventSource делает это сам), заново проходя проверку токена и прав.
+
+    Args:
+        contest_id (int): ID контеста (в query-параметре).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
+        contest_service (IContestService): Сервис для получения данных таблицы.
+
+    Returns:
+        StreamingResponse: Поток `text/event-stream`.
+
+    Raises:
+        PermissionDenied: Если пользователь не имеет прав на просмотр таблицы (возвращает 403).
+        EntityDoesNotExist: Если контест с указанным ID не существует (возвращает 404).
+        FeatureUnavailable: Если поток таблицы не настроен на сервере (возвращает 503).
+    """
+
+    events: AsyncIterator[ContestStandingsEvent] = await contest_service.contest_standings_events(
+        user_id=user.id,
+        contest_id=contest_id,
+        heartbeat_interval_s=settings.STANDINGS_STREAM_HEARTBEAT_S,
+        max_lifetime_s=settings.STANDINGS_STREAM_MAX_LIFETIME_S,
+    )
+
+    return StreamingResponse(
+        _format_server_sent_events(events),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Отключаем буферизацию ответа в nginx
+        },
+    )
+
+
+async def _format_server_sent_events(
+        events: AsyncIterator[ContestStandingsEvent],
+) -> AsyncIterator[str]:
+    async for event in events:
+        if event.event_type == ContestStandingsEventType.HEARTBEAT:
+            yield ": heartbeat\n\n"
+            continue
+
+        lines = [f"event: {event.event_type.value.lower()}"]
+        if event.seq is not None:
+            lines.append(f"id: {event.seq}")
+        lines.append(f"data: {event.model_dump_json(by_alias=True)}")
+        yield "\n".join(lines) + "\n\n"
+
+
 @router.get(
     path="/submissions",
     response_model=ContestSubmissions,
@@ -384,7 +559,10 @@ async def contest_standings(
 async def contest_submissions(
         contest_id: int = Query(...),
         show_user_only: bool = Query(False),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
+        _etag: str | None = Depends(ContestETag(
+            access_check=_contest_access_policy.can_user_view_contest_submissions,
+        )),
         contest_service: IContestService = Depends(get_contest_service),
 ) -> ContestSubmissions:
     """
@@ -395,7 +573,9 @@ async def contest_submissions(
     Args:
         contest_id (int): ID контеста, посылки которого запрашиваются (передаётся в query).
         show_user_only(bool): Флаг: отдавать только посылки пользователя (по умолчанию - нет).
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
+        _etag (str | None): ETag ответа, если доступ есть. Если он совпадает с `If-None-Match`, ручка отвечает 304
+            без обращения к сервису.
         contest_service (IContestService): Сервис для получения данных о посылках.
 
     Returns:
@@ -6,7 +6,7 @@ from fastapi import (
 )
 
 from backend.core.dependencies.authorization import get_user
-from backend.core.models import User
+from backend.core.optimazers.cache.principal import Principal
 from backend.core.schemas.contestant import (
     ArrayContestantInfoForEditor,
     ContestantId,
@@ -44,7 +44,7 @@ router = fastapi.APIRouter(prefix="/contestant", tags=["contestant"])
 )
 async def create_contestant(
         params: ContestantInCreate = Body(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contest_service: IContestService = Depends(get_contest_service),
 ) -> ContestantId:
     """
@@ -60,7 +60,7 @@ async def create_contestant(
             - name: имя пользователя, которое видно на странице соревнования
             - contest_id: ID контеста, для которого регистрируется участник
             - points: начальный баланс участника
-        user (User): Текущий авторизованный пользователь (из JWT).
+        user (Principal): Текущий авторизованный пользователь (из JWT).
         contest_service (IContestService): Сервис для работы с контестом.
 
     Returns:
@@ -95,7 +95,7 @@ async def create_contestant(
     }
 )
 async def preview_contestant_info(
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contestant_service: IContestantService = Depends(get_contestant_service),
 ) -> ContestantPreviewInfo:
     """
@@ -104,7 +104,7 @@ async def preview_contestant_info(
     Используется на фронтенде для отображения карточки участия перед входом в интерфейс контеста.
 
     Args:
-        user (User): Авторизованный пользователь (определяется по JWT-токену).
+        user (Principal): Авторизованный пользователь (определяется по JWT-токену).
         contestant_service (IContestantService): Сервис для получения данных участника.
 
     Returns:
@@ -144,7 +144,7 @@ async def preview_contestant_info(
     }
 )
 async def preview_contestant_info(
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contestant_service: IContestantService = Depends(get_contestant_service),
 ) -> ContestantInfoInContest:
     """
@@ -153,7 +153,7 @@ async def preview_contestant_info(
     Используется в интерфейсе контеста.
 
     Args:
-        user (User): Авторизованный пользователь (определяется по JWT-токену).
+        user (Principal): Авторизованный пользователь (определяется по JWT-токену).
         contestant_service (IContestantService): Сервис для получения данных участника.
 
     Returns:
@@ -192,7 +192,7 @@ async def preview_contestant_info(
 )
 async def view_contestants(
         contest_id: int = Query(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contestant_service: IContestantService = Depends(get_contestant_service),
 ) -> ArrayContestantInfoForEditor:
     """
@@ -203,7 +203,7 @@ async def view_contestants(
 
     Args:
         contest_id (int): ID контеста, участники которого запрашиваются.
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         contestant_service (IContestantService): Сервис для получения данных об участниках.
 
     Returns:
@@ -237,7 +237,7 @@ async def view_contestants(
     }
 )
 async def contestant_logs_in_contest(
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contestant_service: IContestantService = Depends(get_contestant_service),
 ) -> ContestantLogPaginatedResponse:
     res: ContestantLogPaginatedResponse = (
@@ -263,7 +263,7 @@ async def contestant_logs_in_contest(
 )
 async def get_contestant_info_for_editor(
         contestant_id: int = Query(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contestant_service: IContestantService = Depends(get_contestant_service),
 ) -> ContestantInfoForEditor:
     """
@@ -294,7 +294,7 @@ async def get_contestant_info_for_editor(
 )
 async def preview_contestant_info(
         params: ContestantPatchRequest = Body(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         contestant_service: IContestantService = Depends(get_contestant_service),
 ) -> ContestantId:
     """
@@ -6,7 +6,7 @@ from fastapi import (
 )
 
 from backend.core.dependencies.authorization import get_user
-from backend.core.models import User
+from backend.core.optimazers.cache.principal import Principal
 from backend.core.schemas.problem_card import (
     ProblemCardId,
     ProblemCardInfoForEditor,
@@ -48,7 +48,7 @@ async def update_problem_card(
 )
 async def problem_card_info_for_editor(
         problem_card_id: int = Query(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         problem_card_service: IProblemCardService = Depends(get_problem_card_service),
 ) -> ProblemCardInfoForEditor:
     """
@@ -59,7 +59,7 @@ async def problem_card_info_for_editor(
 
     Args:
         problem_card_id (int): ID карточки задачи, информация о которой запрашивается (в query).
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         problem_card_service (IProblemCardService): Сервис для получения данных карточки.
 
     Returns:
@@ -107,7 +107,7 @@ async def problem_card_info_for_editor(
 )
 async def problem_card_update_with_problem(
         params: ProblemCardWithProblemUpdateRequest = Body(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         problem_card_service: IProblemCardService = Depends(get_problem_card_service),
 ) -> ProblemCardId:
     """
@@ -127,7 +127,7 @@ async def problem_card_update_with_problem(
             - category_price: новая стоимость (0–10000)
             - statement: новое условие задачи (до 2048 символов)
             - answer: новый правильный ответ (до 32 символов)
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         problem_card_service (IProblemCardService): Сервис для обновления карточки и задачи.
 
     Returns:
@@ -165,7 +165,7 @@ async def problem_card_update_with_problem(
 )
 async def problem_card_create_with_problem(
         params: ProblemCardWithProblemCreateRequest = Body(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         problem_card_service: IProblemCardService = Depends(get_problem_card_service),
 ) -> ProblemCardId:
     """
@@ -181,7 +181,7 @@ async def problem_card_create_with_problem(
             - category_price: стоимость задачи в баллах (0–10000)
             - statement: условие задачи (до 2048 символов)
             - answer: правильный ответ (до 32 символов)
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         problem_card_service (IProblemCardService): Сервис для создания карточки и задачи.
 
     Returns:
@@ -6,7 +6,8 @@ from fastapi import (
 )
 
 from backend.core.dependencies.authorization import get_user
-from backend.core.models import User
+from backend.core.dependencies.etag import ContestETag
+from backend.core.optimazers.cache.principal import Principal
 from backend.core.schemas.quiz_field import (
     QuizFieldId,
     QuizFieldUpdateRequest,
@@ -35,7 +36,7 @@ router = fastapi.APIRouter(prefix="/quiz-field", tags=["quiz-field"])
 )
 async def update_quiz_field(
         params: QuizFieldUpdateRequest = Body(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         quiz_service: IQuizFieldService = Depends(get_quiz_field_service),
 ) -> QuizFieldId:
     """
@@ -49,7 +50,7 @@ async def update_quiz_field(
             - quiz_field_id: ID поля, которое необходимо обновить
             - number_of_rows: новое количество строк (от 1 до 8)
             - number_of_columns: новое количество столбцов (от 1 до 8)
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         quiz_service (IQuizFieldService): Сервис для обновления поля.
 
     Returns:
@@ -90,7 +91,7 @@ async def update_quiz_field(
 )
 async def quiz_field_info_for_editor(
         contest_id: int = Query(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         quiz_field_service: IQuizFieldService = Depends(get_quiz_field_service),
 ) -> QuizFieldInfoForEditor:
     """
@@ -101,7 +102,7 @@ async def quiz_field_info_for_editor(
 
     Args:
         contest_id (int): ID контеста, поле которого запрашивается (в query).
-        user (User): Авторизованный пользователь (определяется по JWT).
+        user (Principal): Авторизованный пользователь (определяется по JWT).
         quiz_field_service (IQuizFieldService): Сервис для получения данных поля.
 
     Returns:
@@ -148,7 +149,8 @@ async def quiz_field_info_for_editor(
     }
 )
 async def quiz_field_info_for_contestant(
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
+        _etag: str | None = Depends(ContestETag(use_domain_number=True)),
         quiz_field_service: IQuizFieldService = Depends(get_quiz_field_service),
 ) -> QuizFieldInfoForContestant:
     """
@@ -158,7 +160,8 @@ async def quiz_field_info_for_contestant(
     открыта ли она, доступна ли для выбора, решена ли и т.д. Используется в интерфейсе участника для отображения игрового поля .
 
     Args:
-        user (User): Авторизованный участник (определяется по JWT).
+        user (Principal): Авторизованный участник (определяется по JWT).
+        _etag (str | None): ETag ответа. Если он совпадает с `If-None-Match`, ручка отвечает 304 без обращения к сервису.
         quiz_field_service (IQuizFieldService): Сервис для получения данных поля.
 
     Returns:
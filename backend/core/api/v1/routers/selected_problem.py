@@ -5,7 +5,8 @@ from fastapi import (
 )
 
 from backend.core.dependencies.authorization import get_user
-from backend.core.models import User
+from backend.core.dependencies.etag import ContestETag
+from backend.core.optimazers.cache.principal import Principal
 from backend.core.schemas.selected_problem import (
     SelectedProblemId,
     SelectedProblemBuyRequest,
@@ -35,7 +36,7 @@ router = fastapi.APIRouter(prefix="/selected-problem", tags=["selected-problem"]
 )
 async def buy_problem(
         params: SelectedProblemBuyRequest = Body(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         selected_problem_service: ISelectedProblemService = Depends(get_selected_problem_service),
 ) -> SelectedProblemId:
     """
@@ -47,7 +48,7 @@ async def buy_problem(
     Args:
         params (SelectedProblemBuyRequest): Параметры запроса:
             - problem_card_id: ID карточки задачи, которую участник хочет выбрать
-        user (User): Авторизованный участник (определяется по JWT).
+        user (Principal): Авторизованный участник (определяется по JWT).
         selected_problem_service (ISelectedProblemService): Сервис для управления выбранными задачами.
 
     Returns:
@@ -95,7 +96,8 @@ async def buy_problem(
     }
 )
 async def get_contestant_selected_problems(
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
+        _etag: str | None = Depends(ContestETag(use_domain_number=True)),
         selected_problem_service: ISelectedProblemService = Depends(get_selected_problem_service),
 ) -> ArraySelectedProblemInfoForContestant:
     """
@@ -106,7 +108,8 @@ async def get_contestant_selected_problems(
     для отображения текущих задач.
 
     Args:
-        user (User): Авторизованный участник (определяется по JWT).
+        user (Principal): Авторизованный участник (определяется по JWT).
+        _etag (str | None): ETag ответа. Если он совпадает с `If-None-Match`, ручка отвечает 304 без обращения к сервису.
         selected_problem_service (ISelectedProblemService): Сервис для получения данных о выбранных задачах.
 
     Returns:
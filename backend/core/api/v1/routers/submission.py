@@ -6,7 +6,7 @@ from fastapi import (
 from starlette.responses import JSONResponse
 
 from backend.core.dependencies.authorization import get_user
-from backend.core.models import User
+from backend.core.optimazers.cache.principal import Principal
 from backend.core.schemas.submission import (
     SubmissionId,
     SubmissionCreateRequest,
@@ -35,7 +35,7 @@ router = fastapi.APIRouter(prefix="/submission", tags=["submission"])
 )
 async def check_submission(
         params: SubmissionCreateRequest = Body(...),
-        user: User = Depends(get_user),
+        user: Principal = Depends(get_user),
         submission_service: ISubmissionService = Depends(get_submission_service),
 ) -> JSONResponse:
     """
@@ -48,7 +48,7 @@ async def check_submission(
         params (SubmissionCreateRequest): Данные отправки:
             - selected_problem_id: ID выбранной задачи, к которой относится ответ
             - answer: текст ответа (до 32 символов)
-        user (User): Авторизованный участник (определяется по JWT).
+        user (Principal): Авторизованный участник (определяется по JWT).
         submission_service (ISubmissionService): Сервис для обработки и проверки посылок.
 
     Returns:
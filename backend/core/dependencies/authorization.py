@@ -9,6 +9,7 @@ from jose import JWTError
 
 from backend.core.dependencies.repository import get_repository
 from backend.core.models.user import User
+from backend.core.optimazers.cache.principal import Principal
 from backend.core.repository.crud.user import UserCRUDRepository
 from backend.core.services.domain import auth as auth_service
 from backend.core.utilities.exceptions.database import EntityDoesNotExist
@@ -26,7 +27,7 @@ async def get_user(
         token: str = Depends(oauth2_schema),
         token_blacklist_handler: ITokenBlacklistHandler = Depends(get_token_blacklist_handler),
         user_repo: UserCRUDRepository = Depends(get_repository(UserCRUDRepository)),
-) -> User:
+) -> Principal:
     """
     Извлекает пользователя из JWT-токена, проверяя его валидность и отсутствие токенов в чёрном списке.
 
@@ -39,7 +40,7 @@ async def get_user(
         user_repo (UserCRUDRepository): Репозиторий для получения данных пользователя из БД.
 
     Returns:
-        User: Объект пользователя, соответствующий токену.
+        Principal: Снимок пользователя, соответствующего токену (без хеша пароля, может быть взят из кеша).
 
     Raises:
         HTTPException 401: Если токен отсутствует, недействителен, находится в чёрном списке или не содержит нужных данных.
@@ -62,12 +63,12 @@ async def get_user(
         if user_uuid is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
 
-        user: User = (
-            await auth_service.get_user_by_uuid(
+        user: Principal = (
+            await auth_service.get_principal_by_uuid(
                 user_uuid=user_uuid,
                 user_repo=user_repo,
             )
-        )  # Если пользователь не найден, то поднимется исключение от `auth_service.get_user_by_uuid`
+        )  # Если пользователь не найден, то поднимется исключение от `auth_service.get_principal_by_uuid`
 
         return user
 
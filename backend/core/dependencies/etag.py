@@ -0,0 +1,151 @@
+import hashlib
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import (
+    Awaitable,
+    Callable,
+    Optional,
+)
+
+from fastapi import (
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+)
+
+from backend.core.dependencies.authorization import get_user
+from backend.core.models import Contest
+from backend.core.optimazers.cache.principal import Principal
+from backend.core.repository.crud.uow import (
+    UnitOfWork,
+    get_unit_of_work,
+)
+from backend.core.schemas.permission import PermissionPromise
+from backend.core.services.access_policies.context import get_policy_context
+from backend.handlers.contest_version.impl.redis_counter.provider import get_contest_version_handler
+from backend.handlers.contest_version.interface import IContestVersionHandler
+
+# Проверка доступа к контесту: метод политики с сигнатурой `(uow, user_id, contest_id, raise_if_none)`
+AccessCheck = Callable[..., Awaitable[Optional[PermissionPromise]]]
+
+
+class ContestETag:
+    """
+    Зависимость условного GET для ручек, ответ которых определяется данными одного контеста.
+
+    ETag строится из версии контеста (`IContestVersionHandler`), пути, query-параметров и пользователя.
+    Если клиент прислал совпадающий `If-None-Match`, запрос завершается ответом 304 ещё до вызова сервиса;
+    иначе ETag выставляется в заголовки ответа.
+
+    Если задана `access_check`, сначала выполняется она: без доступа ETag не выставляется и 304 не отдаётся -
+    ошибку вернёт сама ручка. Проверка идёт через Unit of Work запроса, поэтому сервис затем находит
+    пользователя и контест в контексте политик, не читая их из БД повторно. Ответ таких ручек зависит
+    и от времени - начала, заморозки, разморозки и окончания контеста, - поэтому ETag включает,
+    какие из этих моментов уже прошли. С `time_quantum_s` ETag идущего контеста вдобавок меняется
+    каждые `time_quantum_s` секунд - для ответов, построенных до текущего момента.
+
+    Версия читается до того, как сервис прочитает данные. Если между этими чтениями кто-то закоммитит
+    изменение, ответ получит устаревший ETag - следующий запрос просто не совпадёт и вернёт свежие данные.
+
+    Args:
+        use_domain_number (bool): Брать контест из `user.domain_number` (ручки участника),
+            а не из query-параметра `contest_id`.
+        access_check (AccessCheck | None): Проверка доступа, которую сервис ручки выполнит сам.
+        time_quantum_s (float | None): Как часто меняется ETag идущего контеста. Требует `access_check`.
+    """
+
+    def __init__(
+            self,
+            use_domain_number: bool = False,
+            access_check: Optional[AccessCheck] = None,
+            time_quantum_s: Optional[float] = None,
+    ) -> None:
+        self._use_domain_number = use_domain_number
+        self._access_check = access_check
+        self._time_quantum_s = time_quantum_s
+
+    async def __call__(
+            self,
+            request: Request,
+            response: Response,
+            user: Principal = Depends(get_user),
+            uow: UnitOfWork = Depends(get_unit_of_work),
+    ) -> Optional[str]:
+        contest_id = self._get_contest_id(request, user)
+        if contest_id is None:  # Некорректный запрос - пусть его отклонит валидация ручки
+            return None
+
+        time_state = ""
+        if self._access_check is not None:
+            if await self._access_check(uow=uow, user_id=user.id, contest_id=contest_id, raise_if_none=False) is None:
+                return None
+            access = await get_policy_context(uow).get_contest_access(user_id=user.id, contest_id=contest_id)
+            time_state = self._get_time_state(access.contest)
+
+        contest_version_handler: IContestVersionHandler = get_contest_version_handler()
+        version = await contest_version_handler.get_version(contest_id=contest_id)
+        etag = self._make_etag(request, user, version, time_state)
+
+        if self._matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        # Разрешаем хранить ответ, но каждый раз сверять его с сервером
+        response.headers["Cache-Control"] = "private, no-cache"
+        return etag
+
+    def _get_time_state(
+            self,
+            contest: Contest,
+    ) -> str:
+        current_time = datetime.now(timezone.utc)
+        moments = (contest.started_at, contest.freeze_at, contest.unfreeze_at, contest.closed_at)
+        state = "".join("1" if moment is not None and moment <= current_time else "0" for moment in moments)
+
+        if self._time_quantum_s is not None and contest.started_at <= current_time < contest.closed_at:
+            state += f":{int(current_time.timestamp() // self._time_quantum_s)}"
+        return state
+
+    def _get_contest_id(
+            self,
+            request: Request,
+            user: Principal,
+    ) -> Optional[int]:
+        if self._use_domain_number:
+            return user.domain_number
+
+        try:
+            return int(request.query_params["contest_id"])
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _make_etag(
+            request: Request,
+            user: Principal,
+            version: int,
+            time_state: str = "",
+    ) -> str:
+        fingerprint = "|".join((
+            request.url.path,
+            "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items())),
+            str(user.id),
+            time_state,
+        ))
+        digest = hashlib.sha1(fingerprint.encode()).hexdigest()[:16]
+        return f'W/"{version}-{digest}"'
+
+    @staticmethod
+    def _matches(
+            if_none_match: Optional[str],
+            etag: str,
+    ) -> bool:
+        if not if_none_match:
+            return False
+
+        # Слабое сравнение (RFC 9110, 13.1.2): префикс W/ не учитывается
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag.removeprefix("W/") in candidates
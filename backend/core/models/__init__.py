@@ -8,3 +8,5 @@ from .selected_problem import SelectedProblem
 from .submission import Submission
 from .user import User
 from .contestant_log import ContestantLog
+from .contest_standings_snapshot import ContestStandingsSnapshot
+from .contestant_points_history import ContestantPointsHistory
@@ -90,6 +90,18 @@ class Contest(Base):
         default=False,
     )
 
+    # Заморозка таблицы результатов: с `freeze_at` до `unfreeze_at` участники видят таблицу на момент заморозки.
+    # Если `unfreeze_at` не задан - таблица остаётся замороженной, пока менеджер его не выставит
+    freeze_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    unfreeze_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
     created_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
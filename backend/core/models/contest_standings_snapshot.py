@@ -0,0 +1,47 @@
+import datetime
+
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Text,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+from sqlalchemy.sql import functions as sqlalchemy_functions
+
+from backend.core.database.connection import Base
+
+
+class ContestStandingsSnapshot(Base):
+    """
+    Замороженная таблица результатов контеста.
+
+    Считается один раз после наступления `Contest.freeze_at` и отдаётся участникам до разморозки.
+    """
+
+    __tablename__ = "contest_standings_snapshot"
+
+    contest_id: Mapped[int] = mapped_column(
+        ForeignKey("contest.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # Момент заморозки, для которого сделан снимок. Если `Contest.freeze_at` изменится - снимок устарел
+    frozen_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+
+    # Сериализованный `ArrayContestantInStandings`
+    body: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy_functions.now(),
+    )
@@ -0,0 +1,58 @@
+import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+)
+from sqlalchemy.sql import functions as sqlalchemy_functions
+
+from backend.core.database.connection import Base
+
+
+class ContestantPointsHistory(Base):
+    """
+    История очков участников: одна строка на каждое изменение очков (только добавление).
+
+    Узкая таблица из целочисленных колонок - строится график очков без разбора посылок и `contestant_log`.
+    `contest_id` денормализован, чтобы выборка по контесту шла по индексу без join'ов.
+    """
+
+    __tablename__ = "contestant_points_history"
+
+    __table_args__ = (
+        Index("idx_contestant_points_history_contest_contestant_time", "contest_id", "contestant_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+    )
+
+    contest_id: Mapped[int] = mapped_column(
+        ForeignKey("contest.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    contestant_id: Mapped[int] = mapped_column(
+        ForeignKey("contestant.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Очки участника после изменения
+    points: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=sqlalchemy_functions.now(),
+    )
@@ -0,0 +1,119 @@
+import asyncio
+from collections import deque
+from typing import (
+    Deque,
+    Dict,
+    Optional,
+)
+
+from backend.configuration.settings import settings
+
+
+class AdmissionRejected(Exception):
+    """
+    Запрос не допущен: очередь его приоритета заполнена или ожидание в ней превысило допустимое.
+    """
+
+    def __init__(
+            self,
+            retry_after_s: float,
+    ) -> None:
+        super().__init__(f"Admission rejected, retry after {retry_after_s} s")
+        self.retry_after_s = retry_after_s
+
+
+class PriorityAdmissionGate:
+    """
+    Ограничение числа одновременно выполняемых дорогих запросов с очередями по приоритетам.
+
+    Свободный слот занимается сразу. Иначе запрос ждёт в очереди своего приоритета не дольше
+    `queue_timeout_s`; при заполненной очереди он отклоняется сразу. Освободившийся слот передаётся
+    ожидающему с наименьшим значением приоритета, внутри приоритета - по порядку прихода.
+
+    Args:
+        max_concurrency (int): Число одновременно допущенных запросов.
+        max_queue (int): Максимальная длина очереди каждого приоритета.
+        queue_timeout_s (float): Максимальное время ожидания в очереди.
+        retry_after_s (float): Через сколько секунд отклонённому запросу стоит повторить попытку.
+    """
+
+    def __init__(
+            self,
+            max_concurrency: int,
+            max_queue: int,
+            queue_timeout_s: float,
+            retry_after_s: float,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._max_queue = max_queue
+        self._queue_timeout_s = queue_timeout_s
+        self._retry_after_s = retry_after_s
+
+        self._active = 0
+        self._queues: Dict[int, Deque[asyncio.Future]] = {}
+
+    async def acquire(
+            self,
+            priority: int = 0,
+    ) -> None:
+        """
+        Занимает слот; `AdmissionRejected`, если слот не получен. Занятый слот освобождается `release`.
+        """
+        if self._active < self._max_concurrency and not any(self._queues.values()):
+            self._active += 1
+            return
+
+        queue = self._queues.setdefault(priority, deque())
+        if len(queue) >= self._max_queue:
+            raise AdmissionRejected(self._retry_after_s)
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        try:
+            await asyncio.wait((waiter,), timeout=self._queue_timeout_s)
+        except BaseException:
+            self._abandon(queue, waiter)
+            raise
+
+        if not waiter.done():
+            self._abandon(queue, waiter)
+            raise AdmissionRejected(self._retry_after_s)
+
+    def release(self) -> None:
+        for priority in sorted(self._queues):
+            queue = self._queues[priority]
+            if queue:
+                # Слот переходит ожидающему, число занятых слотов не меняется
+                queue.popleft().set_result(None)
+                return
+        self._active -= 1
+
+    def _abandon(
+            self,
+            queue: Deque[asyncio.Future],
+            waiter: asyncio.Future,
+    ) -> None:
+        if waiter.done():  # Слот уже передан этому запросу - передаём дальше
+            self.release()
+        else:
+            waiter.cancel()
+            queue.remove(waiter)
+
+
+_auth_admission_gate: Optional[PriorityAdmissionGate] = None
+
+
+def get_auth_admission_gate() -> PriorityAdmissionGate:
+    """
+    Общий на процесс шлюз для проверок учётных данных (`/auth/login`, `/auth/refresh`).
+    """
+    global _auth_admission_gate
+
+    if _auth_admission_gate is None:
+        _auth_admission_gate = PriorityAdmissionGate(
+            max_concurrency=settings.AUTH_ADMISSION_MAX_CONCURRENCY,
+            max_queue=settings.AUTH_ADMISSION_MAX_QUEUE,
+            queue_timeout_s=settings.AUTH_ADMISSION_QUEUE_TIMEOUT_S,
+            retry_after_s=settings.AUTH_ADMISSION_RETRY_AFTER_S,
+        )
+    return _auth_admission_gate
@@ -0,0 +1,269 @@
+import collections.abc
+import datetime
+import json
+import types
+import typing
+from enum import Enum
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Protocol,
+    Tuple,
+    Type,
+    runtime_checkable,
+)
+
+from pydantic import (
+    BaseModel,
+    TypeAdapter,
+)
+
+try:
+    import orjson
+except ImportError:  # Необязательная зависимость - без неё доступны остальные кодеки
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Необязательная зависимость - без неё доступны остальные кодеки
+    msgpack = None
+
+
+@runtime_checkable
+class ICacheCodec(Protocol):
+    """
+    Сериализация результатов, которые кеширует `LazyCache`.
+
+    Все кодеки обязаны читать JSON вида `model_dump_json()`: так записывает значения воркер MQ
+    (`cache_method_result_proxy`).
+    """
+
+    # Входит в ключ кеша: значения разных кодеков не читаются друг другом по ошибке
+    name: str
+
+    def encode(
+            self,
+            value: BaseModel,
+    ) -> str:
+        ...
+
+    def decode(
+            self,
+            model_class: Type[BaseModel],
+            payload: str,
+    ) -> BaseModel:
+        ...
+
+
+class PydanticJsonCodec(ICacheCodec):
+    """
+    JSON средствами pydantic с полной валидацией при чтении. Медленнее остальных, но не доверяет содержимому кеша.
+    """
+
+    name = "json"
+
+    def encode(
+            self,
+            value: BaseModel,
+    ) -> str:
+        return value.model_dump_json()
+
+    def decode(
+            self,
+            model_class: Type[BaseModel],
+            payload: str,
+    ) -> BaseModel:
+        return model_class.model_validate_json(payload)
+
+
+class OrjsonTrustedCodec(ICacheCodec):
+    """
+    JSON через orjson; при чтении модель собирается без валидации (`construct_trusted`).
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise RuntimeError("OrjsonTrustedCodec requires the 'orjson' package")
+
+    def encode(
+            self,
+            value: BaseModel,
+    ) -> str:
+        # mode="json" - чтобы даты прошли через `json_encoders` схемы так же, как в `model_dump_json`
+        return orjson.dumps(value.model_dump(mode="json")).decode()
+
+    def decode(
+            self,
+            model_class: Type[BaseModel],
+            payload: str,
+    ) -> BaseModel:
+        return construct_trusted(model_class, orjson.loads(payload))
+
+
+class MsgpackTrustedCodec(ICacheCodec):
+    """
+    MessagePack; при чтении модель собирается без валидации (`construct_trusted`).
+
+    Хранилище кеша строковое, поэтому байты переносятся в строку через latin-1 (байт в байт, без base64).
+    JSON, записанный воркером MQ, распознаётся по первому символу: MessagePack-словарь с `{` не начинается.
+    """
+
+    name = "msgpack"
+
+    def __init__(self) -> None:
+        if msgpack is None:
+            raise RuntimeError("MsgpackTrustedCodec requires the 'msgpack' package")
+
+    def encode(
+            self,
+            value: BaseModel,
+    ) -> str:
+        return msgpack.packb(value.model_dump(mode="json")).decode("latin-1")
+
+    def decode(
+            self,
+            model_class: Type[BaseModel],
+            payload: str,
+    ) -> BaseModel:
+        if payload.startswith("{"):
+            return construct_trusted(model_class, json.loads(payload))
+        return construct_trusted(model_class, msgpack.unpackb(payload.encode("latin-1")))
+
+
+def construct_trusted(
+        model_class: Type[BaseModel],
+        data: Dict[str, Any],
+) -> BaseModel:
+    """
+    Собирает модель из данных, которые когда-то уже прошли её валидацию (например, из собственного кеша),
+    через `model_construct` - без валидации, рекурсивно для вложенных моделей.
+
+    Восстанавливает только то, что теряется при сериализации в JSON: вложенные модели, Enum, даты,
+    кортежи и множества. Неоднозначные объединения типов разбираются обычной валидацией.
+    """
+
+    return _get_model_converter(model_class)(data)
+
+
+_Converter = Callable[[Any], Any]
+
+# Конвертеры по аннотации: строятся один раз на тип
+_converters: Dict[Any, Optional[_Converter]] = {}
+
+
+def _get_model_converter(
+        model_class: Type[BaseModel],
+) -> _Converter:
+    converter = _converters.get(model_class)
+    if converter is None:
+        # Заглушка на время построения - для рекурсивных моделей
+        _converters[model_class] = lambda data: _get_model_converter(model_class)(data)
+        converter = _build_model_converter(model_class)
+        _converters[model_class] = converter
+    return converter
+
+
+def _build_model_converter(
+        model_class: Type[BaseModel],
+) -> _Converter:
+    fields: Tuple[Tuple[str, str | None, Optional[_Converter]], ...] = tuple(
+        (name, field.alias, _get_converter(field.annotation))
+        for name, field in model_class.model_fields.items()
+    )
+
+    def convert(data: Dict[str, Any]) -> BaseModel:
+        values = {}
+        for name, alias, converter in fields:
+            if name in data:
+                value = data[name]
+            elif alias is not None and alias in data:
+                value = data[alias]
+            else:
+                continue  # Значение по умолчанию подставит `model_construct`
+            values[name] = value if converter is None or value is None else converter(value)
+        return model_class.model_construct(**values)
+
+    return convert
+
+
+def _get_converter(
+        annotation: Any,
+) -> Optional[_Converter]:
+    """
+    Возвращает функцию восстановления значения из JSON-представления или None, если значение не меняется.
+    """
+    try:
+        if annotation in _converters:
+            return _converters[annotation]
+    except TypeError:  # Нехешируемая аннотация - строим без кеша
+        return _build_converter(annotation)
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _get_model_converter(annotation)
+
+    converter = _build_converter(annotation)
+    _converters[annotation] = converter
+    return converter
+
+
+def _build_converter(
+        annotation: Any,
+) -> Optional[_Converter]:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is Annotated:
+        return _get_converter(args[0])
+
+    if origin in (typing.Union, types.UnionType):
+        not_none_args = [arg for arg in args if arg is not type(None)]
+        if len(not_none_args) == 1:
+            return _get_converter(not_none_args[0])
+        if all(_get_converter(arg) is None for arg in not_none_args):
+            return None
+        return TypeAdapter(annotation).validate_python
+
+    if origin in (list, collections.abc.Sequence, collections.abc.MutableSequence, collections.abc.Iterable):
+        item_converter = _get_converter(args[0]) if args else None
+        if item_converter is None:
+            return None
+        return lambda value: [item_converter(item) for item in value]
+
+    if origin in (set, frozenset, collections.abc.Set):
+        item_converter = (_get_converter(args[0]) if args else None) or (lambda item: item)
+        container = frozenset if origin is frozenset else set
+        return lambda value: container(item_converter(item) for item in value)
+
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            item_converter = _get_converter(args[0]) or (lambda item: item)
+            return lambda value: tuple(item_converter(item) for item in value)
+        item_converters = [_get_converter(arg) or (lambda item: item) for arg in args]
+        return lambda value: tuple(convert(item) for convert, item in zip(item_converters, value))
+
+    if origin in (dict, collections.abc.Mapping):
+        # Ключи JSON - строки: нестроковые ключи восстанавливаем валидацией
+        if args and args[0] is not str:
+            return TypeAdapter(annotation).validate_python
+        value_converter = _get_converter(args[1]) if args else None
+        if value_converter is None:
+            return None
+        return lambda value: {key: value_converter(item) for key, item in value.items()}
+
+    if isinstance(annotation, type):
+        if issubclass(annotation, Enum):
+            return annotation
+        if issubclass(annotation, datetime.datetime):
+            return datetime.datetime.fromisoformat
+        if issubclass(annotation, datetime.date):
+            return datetime.date.fromisoformat
+        if issubclass(annotation, (datetime.time, datetime.timedelta)):
+            return TypeAdapter(annotation).validate_python
+
+    return None
+
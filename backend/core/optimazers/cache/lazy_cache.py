@@ -1,30 +1,159 @@
+import asyncio
 import functools
 import hashlib
+import inspect
 import json
+import math
+import random
+import time
+import uuid
 from datetime import datetime
-from typing import Type, Callable, Awaitable, Any
+from enum import Enum
+from typing import Type, Callable, Awaitable, Any, Dict, Iterable, Mapping, Optional, Set, Tuple
 
 from pydantic import BaseModel
 
+from backend.core.optimazers.cache.codecs import (
+    ICacheCodec,
+    PydanticJsonCodec,
+)
+from backend.core.optimazers.cache.memory_lru import MemoryLRUCache
+from backend.core.optimazers.cache.tags import (
+    CacheTagRegistry,
+    get_cache_tag_registry,
+)
+from backend.core.utilities.exceptions.database import EntityDoesNotExist
+from backend.core.utilities.exceptions.permission import PermissionDenied
+from backend.core.utilities.loggers.logger import logger
 from backend.core.utilities.methods.registry import function_registry
+from backend.handlers.cache_invalidation.interface import ICacheInvalidationBus
+from backend.handlers.cache_invalidation.provider import get_cache_invalidation_bus
+from backend.metrics.cache import (
+    LAZY_CACHE_HITS,
+    LAZY_CACHE_MISSES,
+    LAZY_CACHE_PAYLOAD_SIZE,
+    LAZY_CACHE_RECOMPUTE_DURATION,
+    LAZY_CACHE_REFRESHES,
+    LAZY_CACHE_STALE_SERVES,
+)
 from backend.storages.kv.simple_cache.interface import IKeyValueSimpleCache
+from backend.storages.kv.simple_cache.provider import get_kv_simple_cache
 from backend.storages.mq.rabbit_mq.interface import IVoidMessageQueue
 
 
-def _make_key(class_name: str | None, func_name: str, kwargs: dict) -> str:
-    raw = f"{class_name}.{func_name}:{json.dumps(kwargs, sort_keys=True)}"
+def _make_key(class_name: str | None, func_name: str, kwargs: dict, codec_name: str) -> str:
+    raw = f"{codec_name}:{class_name}.{func_name}:{json.dumps(kwargs, sort_keys=True)}"
     return hashlib.sha256(raw.encode()).hexdigest()
 
 
+def _get_refresh_function_name(func: Callable) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def _make_tagged_key(key: str, tag_versions: Tuple[str, ...]) -> str:
+    raw = f"{key}:{':'.join(tag_versions)}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# Запись в L2: "<префикс><время вычисления, с>\n<значение>". Значения, записанные без него
+# (например, `cache_method_result_proxy`), читаются как есть - с неизвестным временем вычисления
+_COMPUTE_TIME_PREFIX = "d="
+
+
+def _pack_entry(payload: str, compute_time_s: float) -> str:
+    return f"{_COMPUTE_TIME_PREFIX}{compute_time_s:.6f}\n{payload}"
+
+
+def _unpack_entry(raw: str) -> Tuple[str, float | None]:
+    if not raw.startswith(_COMPUTE_TIME_PREFIX):
+        return raw, None
+
+    head, _, payload = raw.partition("\n")
+    return payload, float(head[len(_COMPUTE_TIME_PREFIX):])
+
+
+# Закешированный отказ: "<префикс><имя класса исключения>\n<сообщение>"
+_NEGATIVE_PREFIX = "e="
+
+
+def _pack_negative(exception_class: Type[Exception], message: str) -> str:
+    return f"{_NEGATIVE_PREFIX}{exception_class.__name__}\n{message}"
+
+
+# Отказы, которые имеет смысл кешировать, и их время жизни в секундах - значение для `negative_cache_ttls`
+DEFAULT_NEGATIVE_CACHE_TTLS: Mapping[Type[Exception], int] = {
+    EntityDoesNotExist: 10,
+    PermissionDenied: 3,
+}
+
+
+class ExpiryPolicy(str, Enum):
+    TTL = "TTL"  # Значение пересчитывается, когда истечёт его срок жизни в L2
+    XFETCH = "XFETCH"  # Вероятностное раннее обновление (XFetch): чем ближе истечение и дороже вычисление - тем вероятнее
+
+
 class LazyCache:
+    """
+    Двухуровневый кеш результатов асинхронных функций.
+
+    L1 - ограниченный in-process LRU (`MemoryLRUCache`): отдаёт свежие значения без сетевых обращений.
+    L2 - общий для всех процессов `IKeyValueSimpleCache` (Redis).
+
+    Промахи по одному ключу схлопываются (single-flight): функцию вычисляет одна корутина процесса,
+    остальные ждут её результат. С `distributed_lock_s > 0` то же делается между процессами через блокировку в L2.
+
+    Устаревшее значение отдаётся сразу, а его обновление планируется не чаще одного раза на ключ за окно
+    (stale-while-revalidate): через MQ, если она передана, иначе фоновой задачей в текущем процессе.
+
+    Значения можно пометить тегами зависимостей (`contest:{id}` и т.п.): ключ L2 включает текущие версии тегов,
+    поэтому после инвалидации тега (`CacheTagRegistry.invalidate`) старые записи больше не читаются.
+    Записи L1 с этим тегом сбрасываются сразу, если инвалидация сделана в этом процессе,
+    и по сообщению `invalidation_bus`, если в другом. Пока шина не свежа (`is_fresh`), L1 не используется,
+    а после её переподключения сбрасывается целиком.
+
+    Args:
+        cache_instance (IKeyValueSimpleCache): Хранилище L2.
+        message_queue_instance (IVoidMessageQueue | None): Очередь для ленивого обновления кеша.
+        l1_cache (MemoryLRUCache | None): Хранилище L1. По умолчанию - новый `MemoryLRUCache` с границами по умолчанию.
+        tag_registry (CacheTagRegistry | None): Версии тегов зависимостей. Без него теги недоступны.
+        invalidation_bus (ICacheInvalidationBus | None): Инвалидации L1 от других процессов. Без неё записи L1
+            с тегами в других процессах живут до истечения `get_from_cache_not_later_than_s`.
+        codec (ICacheCodec | None): Сериализация результатов по умолчанию. По умолчанию - `PydanticJsonCodec`.
+    """
+
+    # Сколько живёт запись индекса "тег -> ключи L1" - с запасом больше времени жизни любой записи L1
+    _L1_TAG_INDEX_TTL_S = 60 * 60
 
     def __init__(
             self,
             cache_instance: IKeyValueSimpleCache,
             message_queue_instance: IVoidMessageQueue | None = None,
+            l1_cache: MemoryLRUCache | None = None,
+            tag_registry: CacheTagRegistry | None = None,
+            invalidation_bus: ICacheInvalidationBus | None = None,
+            codec: ICacheCodec | None = None,
     ):
         self._cache_instance = cache_instance
         self._message_queue_instance = message_queue_instance
+        self._l1_cache = l1_cache if l1_cache is not None else MemoryLRUCache()
+        self._codec = codec if codec is not None else PydanticJsonCodec()
+        # Вычисления, идущие прямо сейчас: ключ кеша -> задача, вычисляющая и сохраняющая значение
+        self._in_flight: Dict[str, asyncio.Future[str]] = {}
+        # Ключи, обновление которых этот процесс уже запланировал в текущем окне - чтобы не ходить в L2 за SETNX
+        self._refresh_claims = MemoryLRUCache(max_entries=4096)
+        # Ссылки на фоновые обновления, иначе event loop может собрать их сборщиком мусора
+        self._background_refreshes: Set[asyncio.Task] = set()
+
+        self._tag_registry = tag_registry
+        # Тег -> ключи L1, помеченные им: чтобы сбросить их при инвалидации тега
+        self._l1_keys_by_tag = MemoryLRUCache(max_entries=16384)
+        # Растёт при каждой инвалидации в процессе: значение, вычисленное до неё, в L1 не кладём
+        self._invalidation_epoch = 0
+        if tag_registry is not None:
+            tag_registry.add_listener(self._on_tags_invalidated)
+        self._invalidation_bus = invalidation_bus
+        if invalidation_bus is not None:
+            invalidation_bus.subscribe(self._on_tags_invalidated, self._flush_l1)
 
     def decorator_fabric(
             self,
@@ -32,43 +161,106 @@ class LazyCache:
             get_from_cache_not_later_than_s: int = 1,
             result_cached_time_s: int = 2,
             refresh_cache_if_ttl_less_than_s: int = -1,
+            use_l1: bool = True,
+            single_flight: bool = True,
+            distributed_lock_s: int = 0,
+            refresh_dedup_window_s: int | None = None,
+            expiry_policy: ExpiryPolicy = ExpiryPolicy.TTL,
+            xfetch_beta: float = 1.0,
+            tags: Callable[..., Iterable[str]] | None = None,
+            codec: ICacheCodec | None = None,
+            negative_cache_ttls: Mapping[Type[Exception], int] | None = None,
     ) -> Callable[
         [Callable[..., Awaitable[Any]]],
         Callable[..., Awaitable[BaseModel]]
     ]:
         """
         Создаёт декоратор, оборачивающий асинхронные функции с кешированием результата и возможностью
-        ленивого обновления кеша через очередь сообщений.
+        ленивого обновления кеша через очередь сообщений или фоновой задачей.
 
         Args:
             model_class (Type[BaseModel]): Класс модели, для валидации и десериализации результата.
             get_from_cache_not_later_than_s (int): Максимальный "возраст" значения в кеше, допустимый для использования.
             result_cached_time_s (int): Время жизни закешированного значения.
-            refresh_cache_if_ttl_less_than_s (int): Если кеш устарел дольше указанного порога — инициировать обновление через MQ.
-                Если ≤ 0 — ленивое обновление отключено.
+            refresh_cache_if_ttl_less_than_s (int): Если кеш устарел дольше указанного порога — инициировать обновление
+                через MQ (или фоновой задачей, если MQ не передана). Если ≤ 0 — ленивое обновление отключено.
+                Обновление выполняет функция, зарегистрированная в `function_registry` под именем
+                `<module>.<qualname>` оборачиваемой функции (прокси со своей сессией БД). Функция без `self`
+                регистрируется там сама при декорировании; методу, привязанному к сессии запроса, нужен прокси.
+            use_l1 (bool): Использовать in-process L1. Значение живёт в L1, пока его возраст (с момента записи в L2)
+                меньше `get_from_cache_not_later_than_s` - такие попадания обходятся без обращений к Redis.
+            single_flight (bool): Схлопывать одновременные промахи по одному ключу в одно вычисление на процесс.
+            distributed_lock_s (int): Если > 0 - схлопывать промахи и между процессами: вычисляет тот, кто взял
+                блокировку в L2 (на `distributed_lock_s` секунд), остальные ждут появления значения в L2.
+                Время жизни блокировки должно быть больше времени вычисления функции.
+            refresh_dedup_window_s (int | None): Окно, в течение которого обновление ключа планируется
+                не больше одного раза на весь кластер (SETNX в L2). По умолчанию - `get_from_cache_not_later_than_s`.
+            expiry_policy (ExpiryPolicy): Когда пересчитывать значение из L2. При XFETCH каждый читатель
+                с вероятностью, растущей к концу срока жизни, пересчитывает значение заранее:
+                `-delta * beta * ln(rand()) >= оставшееся время`, где delta - измеренное время вычисления.
+                Так обновления популярных ключей не совпадают во времени у разных процессов.
+            xfetch_beta (float): Агрессивность XFETCH: > 1 - обновлять раньше, < 1 - позже.
+            tags (Callable[..., Iterable[str]] | None): Теги зависимостей значения. Вызывается с теми же
+                именованными аргументами, что и функция, например
+                `lambda contest_id, **_: [contest_tag(contest_id)]`. Позволяет держать большой
+                `result_cached_time_s`: значение перестаёт читаться при первом коммите, инвалидирующем его тег.
+                Префиксы тегов должны входить в `tracked_prefixes` реестра (`TRACKED_TAG_PREFIXES`).
+            codec (ICacheCodec | None): Сериализация результата, например `OrjsonTrustedCodec()` для больших
+                моделей, где валидация при чтении дороже обращения к Redis. По умолчанию - кодек кеша.
+            negative_cache_ttls (Mapping[Type[Exception], int] | None): Кешировать и эти исходы: класс исключения
+                (с подклассами) -> время жизни отказа в L2, например `DEFAULT_NEGATIVE_CACHE_TTLS`. Повторный вызов
+                поднимет то же исключение с тем же сообщением, не обращаясь к БД. С `tags` отказ сбрасывается, когда
+                сущность появляется. Отказы не попадают в L1 и не обновляются в фоне.
 
         Raises:
-            ValueError: Если включено ленивое обновление (refresh_cache_if_ttl_less_than_s > 0),
-                        но не передана очередь сообщений.
+            ValueError: Переданы `tags`, а `tag_registry` у кеша нет. Ленивое обновление метода без MQ,
+                а прокси для него не зарегистрирован. При вызове - тег не отслеживается реестром.
         """
 
-        if refresh_cache_if_ttl_less_than_s > 0 and self._message_queue_instance is None:
-            raise ValueError(
-                "<message_queue_instance> cannot be None when refresh_cache_if_ttl_less_than_s is set"
-            )
+        if tags is not None and self._tag_registry is None:
+            raise ValueError("Cache tags require LazyCache to be created with a tag_registry")
+
+        result_codec = codec if codec is not None else self._codec
+        refresh_window_s = max(refresh_dedup_window_s or get_from_cache_not_later_than_s, 1)
 
         def decorator(
                 func: Callable[..., Awaitable[Any]]
         ) -> Callable[..., Awaitable[BaseModel]]:
 
+            # Метрики функции: дочерние серии создаются один раз, а не на каждый вызов
+            function_name = func.__qualname__
+            hits_l1 = LAZY_CACHE_HITS.labels(function=function_name, tier="l1")
+            hits_l2 = LAZY_CACHE_HITS.labels(function=function_name, tier="l2")
+            hits_negative = LAZY_CACHE_HITS.labels(function=function_name, tier="negative")
+            misses = LAZY_CACHE_MISSES.labels(function=function_name)
+            stale_serves = LAZY_CACHE_STALE_SERVES.labels(function=function_name)
+            xfetch_refreshes = LAZY_CACHE_REFRESHES.labels(function=function_name, mode="xfetch")
+
+            if refresh_cache_if_ttl_less_than_s > 0:
+                self._register_refresh_function(func)
+
             @functools.wraps(func)
             async def async_wrapper(*args, **kwargs) -> BaseModel:
 
-                function_registry.register_function(func)
-
                 class_name = args[0].__class__.__name__ if args else None
                 func_name = func.__name__
-                cache_key = _make_key(class_name, func_name, kwargs)
+                cache_key = _make_key(class_name, func_name, kwargs, result_codec.name)
+                # L1 сбрасывается по тегам явно, поэтому его ключ версий тегов не содержит
+                l1_key = cache_key
+
+                l1_enabled = use_l1 and (self._invalidation_bus is None or self._invalidation_bus.is_fresh())
+
+                if l1_enabled:
+                    l1_cached_result = self._l1_cache.get(l1_key)
+                    if l1_cached_result is not None:
+                        hits_l1.inc()
+                        return self._to_result(model_class, result_codec, l1_cached_result, used_cache=True)
+
+                invalidation_epoch = self._invalidation_epoch
+                tag_names = tuple(tags(**kwargs)) if tags is not None else ()
+                if tag_names:
+                    tag_versions = await self._tag_registry.get_versions(tag_names)
+                    cache_key = _make_tagged_key(cache_key, tag_versions)
 
                 cached_result_with_time_when_set = await self._cache_instance.get_str_value_by_str_key_with_time_when_set(
                     key=cache_key,
@@ -76,61 +268,353 @@ class LazyCache:
                 cached_result, time_when_set = cached_result_with_time_when_set
                 used_cache = True
 
-                if cached_result is None:
-                    # Если нет в кеше — вызываем функцию и кешируем результат
-                    res = await func(*args, **kwargs)
-                    used_cache = False
-
-                    await self._cache_instance.set_str_value_by_str_key(
-                        key=cache_key,
-                        value=res.model_dump_json(),
-                        expires_in_seconds=result_cached_time_s,
+                async def load() -> str:
+                    return await self._compute_and_store(
+                        func, args, kwargs, cache_key, result_cached_time_s, result_codec, negative_cache_ttls,
+                        function_name=function_name,
                     )
-                    cached_result = res.model_dump_json()
+
+                if distributed_lock_s > 0:
+                    load = functools.partial(self._load_with_distributed_lock, cache_key, load, distributed_lock_s)
+                if single_flight:
+                    load = functools.partial(self._load_single_flight, cache_key, load)
+
+                compute_time_s = None
+                if cached_result is not None:
+                    cached_result, compute_time_s = _unpack_entry(cached_result)
+                    if cached_result.startswith(_NEGATIVE_PREFIX):
+                        negative = self._restore_negative(cached_result, negative_cache_ttls)
+                        if negative is not None:
+                            hits_negative.inc()
+                            raise negative
+                        cached_result = None  # Этот отказ больше не кешируется - считаем промахом
 
                 dt_s = None
                 if time_when_set:
                     dt = datetime.now() - time_when_set
                     dt_s = dt.total_seconds()
 
+                if cached_result is None:
+                    # Если нет в кеше — вызываем функцию и кешируем результат
+                    misses.inc()
+                    cached_result = await load()
+                    used_cache = False
+                    dt_s = None
+                    if cached_result.startswith(_NEGATIVE_PREFIX):  # Отказ, закешированный другим процессом
+                        negative = self._restore_negative(cached_result, negative_cache_ttls)
+                        if negative is not None:
+                            hits_negative.inc()
+                            raise negative
+                        cached_result = await self._compute_and_store(
+                            func, args, kwargs, cache_key, result_cached_time_s, result_codec, negative_cache_ttls,
+                            function_name=function_name,
+                        )
+                elif expiry_policy == ExpiryPolicy.XFETCH and self._should_recompute_early(
+                        dt_s, result_cached_time_s, compute_time_s, xfetch_beta,
+                ):
+                    # Раннее обновление: значение в L2 ещё есть, поэтому распределённая блокировка не нужна -
+                    # её повторная проверка L2 вернула бы то же старое значение
+                    xfetch_refreshes.inc()
+                    cached_result = await self._load_single_flight(
+                        cache_key,
+                        functools.partial(
+                            self._compute_and_store,
+                            func, args, kwargs, cache_key, result_cached_time_s, result_codec, negative_cache_ttls,
+                            function_name=function_name,
+                        ),
+                    )
+                    used_cache = False
+                    dt_s = None
+                else:
+                    hits_l2.inc()
+                    if dt_s is not None and dt_s >= get_from_cache_not_later_than_s:
+                        stale_serves.inc()
+
+                if l1_enabled and invalidation_epoch == self._invalidation_epoch:
+                    # В L1 значение живёт, пока не станет старше допустимого возраста
+                    self._l1_cache.set(
+                        l1_key,
+                        cached_result,
+                        ttl_s=get_from_cache_not_later_than_s - (dt_s or 0),
+                        size=len(cached_result),
+                    )
+                    self._index_l1_key_by_tags(l1_key, tag_names)
+
+                # dt_s is None - значение только что вычислено, обновлять нечего
                 should_refresh = (
                         refresh_cache_if_ttl_less_than_s > 0 and
-                        (dt_s is None or dt_s >= get_from_cache_not_later_than_s)
+                        dt_s is not None and dt_s >= get_from_cache_not_later_than_s
                 )
-                if should_refresh:
-                    await self._message_queue_instance.add_void(
-                        void=func,
-                        callback=function_registry.get_function(
-                            "backend.core.services.proxies.cache.cache_method_result_proxy"
-                        ),
-                        callback_params={'void_name': cache_key, 'ttl_s': result_cached_time_s},
-                        use_void_result_in_callback_params=True,
-                        **kwargs,
+                if should_refresh and await self._claim_refresh(cache_key, refresh_window_s):
+                    await self._schedule_refresh(
+                        func, kwargs, cache_key, result_cached_time_s, result_codec, negative_cache_ttls,
+                        function_name=function_name,
                     )
 
-                parsed = json.loads(cached_result)
-                result = model_class.model_validate(parsed)
-                # Добавляем атрибут, чтобы сообщить, откуда взялось значение
-                setattr(result, "use_cache", used_cache)
-
-                return result
+                return self._to_result(model_class, result_codec, cached_result, used_cache=used_cache)
 
             return async_wrapper
 
         return decorator
 
+    def _register_refresh_function(
+            self,
+            func: Callable[..., Awaitable[Any]],
+    ) -> None:
+        """
+        Делает `func` доступной обновлению: регистрирует её под `<module>.<qualname>`, если прокси там ещё нет.
+
+        Функцию без `self` можно вызывать вне запроса саму. Метод сервиса привязан к сессии запроса, поэтому
+        его обновляет только прокси; без MQ он должен быть зарегистрирован до декорирования - иначе ошибка,
+        а не молча пропускаемые обновления.
+        """
+        name = _get_refresh_function_name(func)
+        if function_registry.get_function(name) is not None:
+            return
+
+        if next(iter(inspect.signature(func).parameters), None) != "self":
+            function_registry.register_function()(func)
+        elif self._message_queue_instance is None:
+            raise ValueError(f"Cache refresh of {name} without MQ requires a proxy registered under this name")
+
+    def _index_l1_key_by_tags(
+            self,
+            l1_key: str,
+            tag_names: Tuple[str, ...],
+    ) -> None:
+        for tag in tag_names:
+            keys: Set[str] | None = self._l1_keys_by_tag.get(tag)
+            if keys is None:
+                keys = set()
+                self._l1_keys_by_tag.set(tag, keys, ttl_s=self._L1_TAG_INDEX_TTL_S)
+            keys.add(l1_key)
+
+    def _on_tags_invalidated(
+            self,
+            tag_names: Tuple[str, ...],
+    ) -> None:
+        self._invalidation_epoch += 1
+        for tag in tag_names:
+            keys: Set[str] | None = self._l1_keys_by_tag.get(tag)
+            if keys is None:
+                continue
+            self._l1_keys_by_tag.delete(tag)
+            for key in keys:
+                self._l1_cache.delete(key)
+
+    def _flush_l1(self) -> None:
+        self._invalidation_epoch += 1
+        self._l1_cache.clear()
+        self._l1_keys_by_tag.clear()
+
+    @staticmethod
+    def _restore_negative(
+            cached_result: str,
+            negative_cache_ttls: Mapping[Type[Exception], int] | None,
+    ) -> Exception | None:
+        """
+        Восстанавливает закешированное исключение, если его класс по-прежнему кешируется этой функцией.
+        """
+        head, _, message = cached_result.partition("\n")
+        exception_name = head[len(_NEGATIVE_PREFIX):]
+        for exception_class in negative_cache_ttls or ():
+            if exception_class.__name__ == exception_name:
+                return exception_class(message)
+        return None
+
+    @staticmethod
+    def _should_recompute_early(
+            age_s: float | None,
+            ttl_s: int,
+            compute_time_s: float | None,
+            beta: float,
+    ) -> bool:
+        if age_s is None or not compute_time_s:
+            return False
+
+        remaining_s = ttl_s - age_s
+        # 1 - random() лежит в (0, 1], логарифм определён
+        return -compute_time_s * beta * math.log(1.0 - random.random()) >= remaining_s
+
+    async def _compute_and_store(
+            self,
+            func: Callable[..., Awaitable[Any]],
+            args: tuple,
+            kwargs: dict,
+            cache_key: str,
+            result_cached_time_s: int,
+            codec: ICacheCodec,
+            negative_cache_ttls: Mapping[Type[Exception], int] | None = None,
+            function_name: str | None = None,
+    ) -> str:
+        started_at = time.perf_counter()
+        try:
+            res = await func(*args, **kwargs)
+        except Exception as e:
+            for exception_class, ttl_s in (negative_cache_ttls or {}).items():
+                if isinstance(e, exception_class):
+                    await self._cache_instance.set_str_value_by_str_key(
+                        key=cache_key,
+                        value=_pack_negative(exception_class, str(e)),
+                        expires_in_seconds=ttl_s,
+                    )
+                    break
+            raise
+        compute_time_s = time.perf_counter() - started_at
+        value = codec.encode(res)
+
+        if function_name is not None:
+            LAZY_CACHE_RECOMPUTE_DURATION.labels(function=function_name).observe(compute_time_s)
+            LAZY_CACHE_PAYLOAD_SIZE.labels(function=function_name).observe(len(value))
+
+        await self._cache_instance.set_str_value_by_str_key(
+            key=cache_key,
+            value=_pack_entry(value, compute_time_s),
+            expires_in_seconds=result_cached_time_s,
+        )
+        return value
+
+    async def _claim_refresh(
+            self,
+            cache_key: str,
+            window_s: int,
+    ) -> bool:
+        """
+        Возвращает True, если обновление ключа в этом окне должен запланировать текущий вызов.
+        """
+        if self._refresh_claims.get(cache_key) is not None:
+            return False
+        self._refresh_claims.set(cache_key, True, ttl_s=window_s)
+
+        return await self._cache_instance.set_str_value_by_str_key_if_not_exists(
+            key=f"refresh:{cache_key}", value="1", expires_in_seconds=window_s,
+        )
+
+    async def _schedule_refresh(
+            self,
+            func: Callable[..., Awaitable[Any]],
+            kwargs: dict,
+            cache_key: str,
+            result_cached_time_s: int,
+            codec: ICacheCodec,
+            negative_cache_ttls: Mapping[Type[Exception], int] | None,
+            function_name: str,
+    ) -> None:
+        # Воркер MQ сохраняет `model_dump_json()` - его читает любой кодек
+        if self._message_queue_instance is not None:
+            await self._message_queue_instance.add_void(
+                void=func,
+                callback=function_registry.get_function(
+                    "backend.core.services.proxies.cache.cache_method_result_proxy"
+                ),
+                callback_params={'void_name': cache_key, 'ttl_s': result_cached_time_s},
+                use_void_result_in_callback_params=True,
+                **kwargs,
+            )
+            LAZY_CACHE_REFRESHES.labels(function=function_name, mode="mq").inc()
+            return
+
+        # Без MQ обновляем в фоне функцией из реестра (см. `_register_refresh_function`)
+        proxy = function_registry.get_function(_get_refresh_function_name(func))
+        if proxy is None:
+            logger.warning(f"Skip cache refresh: {_get_refresh_function_name(func)} is not registered")
+            return
+
+        async def load() -> str:
+            return await self._compute_and_store(
+                proxy, (), kwargs, cache_key, result_cached_time_s, codec, negative_cache_ttls,
+                function_name=function_name,
+            )
+
+        task = asyncio.create_task(self._load_single_flight(cache_key, load))
+        LAZY_CACHE_REFRESHES.labels(function=function_name, mode="background").inc()
+        self._background_refreshes.add(task)
+        task.add_done_callback(self._on_background_refresh_done)
+
+    def _on_background_refresh_done(
+            self,
+            task: asyncio.Task,
+    ) -> None:
+        self._background_refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background cache refresh failed: {task.exception()}")
+
+    async def _load_single_flight(
+            self,
+            cache_key: str,
+            load: Callable[[], Awaitable[str]],
+    ) -> str:
+        future = self._in_flight.get(cache_key)
+        if future is None:
+            future = asyncio.ensure_future(load())
+            self._in_flight[cache_key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+
+        # Отмена одного ожидающего (например, клиент закрыл соединение) не должна отменять вычисление для остальных
+        return await asyncio.shield(future)
+
+    async def _load_with_distributed_lock(
+            self,
+            cache_key: str,
+            load: Callable[[], Awaitable[str]],
+            lock_ttl_s: int,
+            poll_interval_s: float = 0.05,
+    ) -> str:
+        lock_key = f"lock:{cache_key}"
+        lock_token = uuid.uuid4().hex
+
+        if await self._cache_instance.set_str_value_by_str_key_if_not_exists(
+                key=lock_key, value=lock_token, expires_in_seconds=lock_ttl_s, ):
+            try:
+                # Значение могли записать, пока мы шли за блокировкой
+                value = await self._cache_instance.get_str_value_by_str_key(key=cache_key)
+                return _unpack_entry(value)[0] if value is not None else await load()
+            finally:
+                # Если `load` шёл дольше `lock_ttl_s`, блокировка могла истечь и достаться другому процессу -
+                # снимаем только свою
+                await self._cache_instance.delete_str_key_if_value_equals(key=lock_key, value=lock_token)
+
+        # Блокировка у другого процесса - ждём его результат, но не дольше срока блокировки
+        deadline = time.monotonic() + lock_ttl_s
+        while time.monotonic() < deadline:
+            await asyncio.sleep(poll_interval_s)
+            value = await self._cache_instance.get_str_value_by_str_key(key=cache_key)
+            if value is not None:
+                return _unpack_entry(value)[0]
+
+        return await load()
+
+    @staticmethod
+    def _to_result(
+            model_class: Type[BaseModel],
+            codec: ICacheCodec,
+            cached_result: str,
+            used_cache: bool,
+    ) -> BaseModel:
+        result = codec.decode(model_class, cached_result)
+        # Добавляем атрибут, чтобы сообщить, откуда взялось значение
+        setattr(result, "use_cache", used_cache)
+
+        return result
+
+
+_lazy_cache: Optional[LazyCache] = None
+
+
+def get_lazy_cache() -> LazyCache:
+    """
+    Общий кеш приложения: L2 - `get_kv_simple_cache()`, теги - `get_cache_tag_registry()`.
+
+    Без MQ: устаревшие значения обновляются фоновыми задачами процесса (см. `refresh_cache_if_ttl_less_than_s`).
+    Использование:
+        @get_lazy_cache().decorator_fabric(model_class=..., tags=lambda contest_id, **_: [contest_tag(contest_id)])
+    """
+    global _lazy_cache
 
-# Пример создания экземпляра для общего кеша
-def get_lazy_cache(
-        cache_instance: IKeyValueSimpleCache,
-        message_queue_instance: IVoidMessageQueue,
-) -> LazyCache:
-    return LazyCache(
-        cache_instance=cache_instance,
-        message_queue_instance=message_queue_instance,
-    )
-
-# Использование:
-# lazy_cache = get_lazy_cache(...)
-# @lazy_cache.decorator_fabric(model_class=ContestStandings)
-# async def some_func(...): ...
+    if _lazy_cache is None:
+        _lazy_cache = LazyCache(
+            cache_instance=get_kv_simple_cache(),
+            tag_registry=get_cache_tag_registry(),
+            invalidation_bus=get_cache_invalidation_bus(),
+        )
+    return _lazy_cache
@@ -0,0 +1,103 @@
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    NamedTuple,
+    Optional,
+)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+    size: int
+
+
+class MemoryLRUCache:
+    """
+    In-process LRU-кеш с TTL на запись и двумя ограничениями: по числу записей и по суммарному размеру.
+
+    При переполнении вытесняются давно не использованные записи. Просроченные записи удаляются лениво -
+    при обращении к ним или при вытеснении. Не потокобезопасен: рассчитан на один event loop.
+
+    Args:
+        max_entries (int): Максимальное число записей.
+        max_bytes (int): Максимальный суммарный размер записей (размер задаёт вызывающий в `set`).
+        clock (Callable[[], float]): Источник монотонного времени в секундах.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 1024,
+            max_bytes: int = 32 * 1024 * 1024,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._clock = clock
+
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(
+            self,
+            key: Hashable,
+    ) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def set(
+            self,
+            key: Hashable,
+            value: Any,
+            ttl_s: float,
+            size: int = 1,
+    ) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+        # Запись больше всего кеша не кладём - она вытеснила бы всё остальное
+        if ttl_s <= 0 or size > self._max_bytes:
+            return
+
+        self._entries[key] = _Entry(value, self._clock() + ttl_s, size)
+        self._bytes += size
+
+        while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    def delete(
+            self,
+            key: Hashable,
+    ) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(
+            self,
+            key: Hashable,
+    ) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
@@ -0,0 +1,136 @@
+import datetime
+from typing import (
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from backend.configuration.settings import settings
+from backend.core.optimazers.cache.memory_lru import MemoryLRUCache
+from backend.core.optimazers.cache.tags import (
+    USER_TAG_PREFIX,
+    CacheTagRegistry,
+    get_cache_tag_registry,
+)
+from backend.handlers.cache_invalidation.interface import ICacheInvalidationBus
+from backend.handlers.cache_invalidation.provider import get_cache_invalidation_bus
+
+
+class Principal(NamedTuple):
+    """
+    Снимок полей пользователя, нужных для аутентификации и проверок доступа. Хеш пароля не кешируется.
+    """
+    id: int
+    uuid: str
+    domain_number: int
+    username: str
+    created_at: datetime.datetime
+
+
+class PrincipalCache:
+    """
+    In-process кеш пользователей по id и UUID - чтобы аутентификация и проверки доступа не ходили в БД
+    за одним и тем же пользователем на каждом запросе.
+
+    Записи сбрасываются тегом `user_tag(user_id)`: своим процессом - через `CacheTagRegistry`, остальными -
+    через шину инвалидации. Пока шина не свежа, кеш не отдаёт и не принимает записи.
+    UUID и id пользователя не меняются, поэтому индекс UUID -> id не инвалидируется.
+
+    Args:
+        ttl_s (float): Предельный срок жизни записи.
+        max_entries (int): Максимальное число записей.
+        tag_registry (CacheTagRegistry | None): Реестр тегов, о локальных инвалидациях которого узнаёт кеш.
+        invalidation_bus (ICacheInvalidationBus | None): Шина инвалидаций других процессов.
+    """
+
+    def __init__(
+            self,
+            ttl_s: float,
+            max_entries: int,
+            tag_registry: CacheTagRegistry | None = None,
+            invalidation_bus: ICacheInvalidationBus | None = None,
+    ) -> None:
+        self._ttl_s = ttl_s
+        self._by_id = MemoryLRUCache(max_entries=max_entries)
+        self._id_by_uuid = MemoryLRUCache(max_entries=max_entries)
+        # Растёт при каждой инвалидации: значение, прочитанное из БД до неё, не кладётся в кеш
+        self._invalidation_epoch = 0
+
+        if tag_registry is not None:
+            tag_registry.add_listener(self._on_tags_invalidated)
+        self._invalidation_bus = invalidation_bus
+        if invalidation_bus is not None:
+            invalidation_bus.subscribe(self._on_tags_invalidated, self._flush)
+
+    @property
+    def epoch(self) -> int:
+        """
+        Текущая эпоха инвалидаций - берётся до чтения из БД и передаётся в `put`.
+        """
+        return self._invalidation_epoch
+
+    def get_by_id(
+            self,
+            user_id: int,
+    ) -> Optional[Principal]:
+        if not self._is_usable():
+            return None
+        return self._by_id.get(user_id)
+
+    def get_by_uuid(
+            self,
+            user_uuid: str,
+    ) -> Optional[Principal]:
+        if not self._is_usable():
+            return None
+        user_id: int | None = self._id_by_uuid.get(user_uuid)
+        return self._by_id.get(user_id) if user_id is not None else None
+
+    def put(
+            self,
+            principal: Principal,
+            epoch: int,
+    ) -> None:
+        if epoch != self._invalidation_epoch or not self._is_usable():
+            return
+        self._by_id.set(principal.id, principal, ttl_s=self._ttl_s)
+        self._id_by_uuid.set(principal.uuid, principal.id, ttl_s=self._ttl_s)
+
+    def forget(
+            self,
+            user_id: int,
+    ) -> None:
+        self._invalidation_epoch += 1
+        self._by_id.delete(user_id)
+
+    def _is_usable(self) -> bool:
+        return self._invalidation_bus is None or self._invalidation_bus.is_fresh()
+
+    def _on_tags_invalidated(
+            self,
+            tag_names: Tuple[str, ...],
+    ) -> None:
+        for tag in tag_names:
+            prefix, _, user_id = tag.partition(":")
+            if prefix == USER_TAG_PREFIX and user_id.isdigit():
+                self.forget(int(user_id))
+
+    def _flush(self) -> None:
+        self._invalidation_epoch += 1
+        self._by_id.clear()
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _principal_cache
+
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache(
+            ttl_s=settings.PRINCIPAL_CACHE_TTL_S,
+            max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+            tag_registry=get_cache_tag_registry(),
+            invalidation_bus=get_cache_invalidation_bus(),
+        )
+    return _principal_cache
@@ -0,0 +1,139 @@
+import uuid
+from typing import (
+    Callable,
+    Collection,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from backend.configuration.settings import settings
+from backend.handlers.cache_invalidation.interface import ICacheInvalidationBus
+from backend.handlers.cache_invalidation.provider import get_cache_invalidation_bus
+from backend.storages.kv.simple_cache.interface import IKeyValueSimpleCache
+from backend.storages.kv.simple_cache.provider import get_kv_simple_cache
+
+# Версия тега, для которого ещё ни разу не было инвалидации (или ключ версии истёк)
+_INITIAL_TAG_VERSION = "0"
+
+CONTEST_TAG_PREFIX = "contest"
+USER_TAG_PREFIX = "user"
+
+# Префиксы тегов, по которым сейчас что-то кешируется: `LazyCache` - данные контеста
+# (см. `QuizFieldService`, `ContestService`), `PrincipalCache` - пользователь.
+# Инвалидация остальных тегов ничего не делает; подключая кеш с новым тегом, добавьте сюда его префикс
+TRACKED_TAG_PREFIXES = (
+    CONTEST_TAG_PREFIX,
+    USER_TAG_PREFIX,
+)
+
+
+def contest_tag(contest_id: int) -> str:
+    return f"{CONTEST_TAG_PREFIX}:{contest_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"{USER_TAG_PREFIX}:{user_id}"
+
+
+class CacheTagRegistry:
+    """
+    Версии тегов зависимостей закешированных значений.
+
+    Значение, помеченное тегами, кешируется под ключом, в который входят текущие версии его тегов.
+    Инвалидация тега записывает ему новую версию: прежние записи становятся недостижимыми и доживают
+    свой TTL в хранилище, а следующее чтение вычисляет значение заново. Так инвалидация стоит одну запись
+    на тег независимо от числа зависящих от него значений.
+
+    Локальные слушатели (`add_listener`) узнают об инвалидации, сделанной этим процессом, - например,
+    чтобы сбросить in-process кеши. Остальным процессам теги рассылаются через `invalidation_bus`.
+
+    Версии ведутся только для тегов с префиксами из `tracked_prefixes`: инвалидация прочих тегов
+    не обращается ни к хранилищу, ни к шине, а чтение их версий - ошибка конфигурации.
+    Набор префиксов задаётся кодом, а не состоянием процесса, - он одинаков во всех процессах.
+
+    Args:
+        cache_instance (IKeyValueSimpleCache): Хранилище версий тегов.
+        tag_ttl_s (int): Время жизни версии тега. Должно быть больше времени жизни любой записи с этим тегом,
+            иначе истёкшая версия вернётся к начальной и снова откроет старые записи.
+        tracked_prefixes (Collection[str]): Префиксы тегов, по которым что-либо кешируется.
+        invalidation_bus (ICacheInvalidationBus | None): Шина для рассылки инвалидаций другим процессам.
+    """
+
+    def __init__(
+            self,
+            cache_instance: IKeyValueSimpleCache,
+            tag_ttl_s: int,
+            tracked_prefixes: Collection[str] = TRACKED_TAG_PREFIXES,
+            invalidation_bus: ICacheInvalidationBus | None = None,
+    ) -> None:
+        self._cache_instance = cache_instance
+        self._tag_ttl_s = tag_ttl_s
+        self._tracked_prefixes = frozenset(tracked_prefixes)
+        self._invalidation_bus = invalidation_bus
+        self._listeners: List[Callable[[Tuple[str, ...]], None]] = []
+
+    def add_listener(
+            self,
+            listener: Callable[[Tuple[str, ...]], None],
+    ) -> None:
+        self._listeners.append(listener)
+
+    async def get_versions(
+            self,
+            tags: Iterable[str],
+    ) -> Tuple[str, ...]:
+        """
+        Raises:
+            ValueError: Префикс тега не входит в `tracked_prefixes` - его инвалидации не записываются.
+        """
+        tags = tuple(tags)
+        untracked = [tag for tag in tags if not self._is_tracked(tag)]
+        if untracked:
+            raise ValueError(f"Cache tags {untracked} are not tracked: add their prefixes to tracked_prefixes")
+
+        versions = await self._cache_instance.get_many([self._version_key(tag) for tag in tags])
+        return tuple(version or _INITIAL_TAG_VERSION for version in versions)
+
+    async def invalidate(
+            self,
+            *tags: str,
+    ) -> None:
+        tags = tuple(tag for tag in tags if self._is_tracked(tag))
+        if not tags:
+            return
+
+        await self._cache_instance.set_many(
+            {self._version_key(tag): uuid.uuid4().hex for tag in tags},
+            expires_in_seconds=self._tag_ttl_s,
+        )
+        for listener in self._listeners:
+            listener(tags)
+        if self._invalidation_bus is not None:
+            await self._invalidation_bus.publish(tags)
+
+    def _is_tracked(
+            self,
+            tag: str,
+    ) -> bool:
+        return tag.partition(":")[0] in self._tracked_prefixes
+
+    @staticmethod
+    def _version_key(tag: str) -> str:
+        return f"cache_tag:{tag}"
+
+
+_cache_tag_registry: Optional[CacheTagRegistry] = None
+
+
+def get_cache_tag_registry() -> CacheTagRegistry:
+    global _cache_tag_registry
+
+    if _cache_tag_registry is None:
+        _cache_tag_registry = CacheTagRegistry(
+            cache_instance=get_kv_simple_cache(),
+            tag_ttl_s=settings.CACHE_TAG_TTL_S,
+            invalidation_bus=get_cache_invalidation_bus(),
+        )
+    return _cache_tag_registry
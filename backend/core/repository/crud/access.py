@@ -0,0 +1,122 @@
+from typing import (
+    FrozenSet,
+    List,
+    NamedTuple,
+    Sequence,
+    Tuple,
+)
+
+from sqlalchemy import (
+    ColumnElement,
+    exists,
+    select,
+)
+
+from backend.core.models import (
+    Contest,
+    ProblemCard,
+    QuizField,
+)
+from backend.core.models.permission import (
+    Permission,
+    PermissionActionType,
+    PermissionResourceType,
+)
+from backend.core.repository.crud.base import BaseCRUDRepository
+from backend.core.utilities.loggers.log_decorator import log_calls
+
+
+class ContestAccess(NamedTuple):
+    """
+    Контест и типы прав (`PermissionActionType.value`), которые пользователь имеет на него.
+    """
+    contest: Contest
+    granted: FrozenSet[str]
+
+
+class AccessCRUDRepository(BaseCRUDRepository):
+    """
+    Данные для проверок доступа одним запросом: сущность, её контест и права пользователя на контест.
+
+    Цепочка сущность -> поле квиза -> контест -> права собирается через outer join, поэтому отсутствующее
+    звено приходит как None, а не теряет всю строку, - политики различают "нет сущности" и "нет прав".
+    """
+
+    @log_calls
+    async def get_contest_access(
+            self,
+            user_id: int,
+            contest_id: int,
+    ) -> ContestAccess | None:
+        res = await self.async_session.execute(
+            select(Contest, *self._granted_columns(user_id))
+            .where(Contest.id == contest_id)
+        )
+        row = res.one_or_none()
+        if row is None:
+            return None
+        return self._to_contest_access(row[0], row[1:])
+
+    @log_calls
+    async def get_quiz_field_access(
+            self,
+            user_id: int,
+            quiz_field_id: int,
+    ) -> Tuple[QuizField, ContestAccess | None] | None:
+        res = await self.async_session.execute(
+            select(QuizField, Contest, *self._granted_columns(user_id))
+            .outerjoin(Contest, Contest.id == QuizField.contest_id)
+            .where(QuizField.id == quiz_field_id)
+        )
+        row = res.one_or_none()
+        if row is None:
+            return None
+        return row[0], self._to_contest_access(row[1], row[2:])
+
+    @log_calls
+    async def get_problem_card_access(
+            self,
+            user_id: int,
+            problem_card_id: int,
+    ) -> Tuple[ProblemCard, QuizField | None, ContestAccess | None] | None:
+        res = await self.async_session.execute(
+            select(ProblemCard, QuizField, Contest, *self._granted_columns(user_id))
+            .outerjoin(QuizField, QuizField.id == ProblemCard.quiz_field_id)
+            .outerjoin(Contest, Contest.id == QuizField.contest_id)
+            .where(ProblemCard.id == problem_card_id)
+        )
+        row = res.one_or_none()
+        if row is None:
+            return None
+        return row[0], row[1], self._to_contest_access(row[2], row[3:])
+
+    @staticmethod
+    def _granted_columns(
+            user_id: int,
+    ) -> List[ColumnElement[bool]]:
+        # По колонке EXISTS на каждый тип права - в порядке `PermissionActionType`
+        return [
+            exists()
+            .where(
+                Permission.user_id == user_id,
+                Permission.resource_type == PermissionResourceType.CONTEST.value,
+                Permission.resource_id == Contest.id,
+                Permission.permission_type == action.value,
+            )
+            .label(f"has_{action.value.lower()}")
+            for action in PermissionActionType
+        ]
+
+    @staticmethod
+    def _to_contest_access(
+            contest: Contest | None,
+            granted_flags: Sequence[bool],
+    ) -> ContestAccess | None:
+        if contest is None:
+            return None
+        return ContestAccess(
+            contest=contest,
+            granted=frozenset(
+                action.value for action, is_granted in zip(PermissionActionType, granted_flags) if is_granted
+            ),
+        )
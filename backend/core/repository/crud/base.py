@@ -1,5 +1,19 @@
+from functools import partial
+from typing import (
+    Awaitable,
+    Callable,
+)
+
 from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
 
+from backend.core.optimazers.cache.tags import get_cache_tag_registry
+from backend.handlers.contest_version.impl.redis_counter.provider import get_contest_version_handler
+
+# Ключ в `AsyncSession.info`, под которым копятся действия, отложенные до коммита транзакции
+AFTER_COMMIT_HOOKS_KEY = "after_commit_hooks"
+# Ключ в `AsyncSession.info`, под которым живёт контекст проверок доступа запроса (`PolicyContext`)
+POLICY_CONTEXT_KEY = "access_policy_context"
+
 
 class BaseCRUDRepository:
     """
@@ -16,3 +30,52 @@ class BaseCRUDRepository:
             async_session: SQLAlchemyAsyncSession
     ):
         self.async_session = async_session
+
+    def _call_after_commit(
+            self,
+            hook: Callable[[], Awaitable[None]],
+    ) -> None:
+        """
+        Откладывает вызов `hook` до успешного коммита текущей транзакции.
+
+        Используется для синхронизации внешних хранилищ (Redis и т.п.) с данными, которые записал репозиторий:
+        пока транзакция не зафиксирована, внешний мир не должен о ней знать.
+        Хуки выполняет `UnitOfWork` при выходе из контекста; при откате они отбрасываются.
+
+        Args:
+            hook (Callable[[], Awaitable[None]]): Корутинная функция без аргументов.
+        """
+
+        self.async_session.info.setdefault(AFTER_COMMIT_HOOKS_KEY, []).append(hook)
+
+    def _forget_policy_context(self) -> None:
+        """
+        Сбрасывает контекст проверок доступа текущей сессии (`PolicyContext`).
+
+        Вызывается репозиториями, которые меняют пользователей, контесты, поля квиза, карточки задач
+        или права, - то, что контекст запоминает: следующая проверка прочитает их заново.
+        """
+
+        self.async_session.info.pop(POLICY_CONTEXT_KEY, None)
+
+    def _bump_contest_version_after_commit(
+            self,
+            contest_id: int,
+    ) -> None:
+        """
+        После коммита увеличивает версию контеста, сбрасывая ETag'и его ответов.
+
+        Вызывается репозиториями, которые меняют данные, видимые участникам и зрителям контеста.
+        """
+
+        self._call_after_commit(partial(get_contest_version_handler().bump_version, contest_id=contest_id))
+
+    def _invalidate_cache_tags_after_commit(
+            self,
+            *tags: str,
+    ) -> None:
+        """
+        После коммита инвалидирует закешированные значения, помеченные любым из `tags` (см. `CacheTagRegistry`).
+        """
+
+        self._call_after_commit(partial(get_cache_tag_registry().invalidate, *tags))
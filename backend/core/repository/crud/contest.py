@@ -1,3 +1,4 @@
+import functools
 from datetime import datetime
 from typing import (
     Sequence,
@@ -10,8 +11,11 @@ from sqlalchemy import (
     update,
     delete,
     and_,
+    case,
+    exists,
     func,
 )
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 
 from backend.core.models import (
     Contest,
@@ -23,11 +27,14 @@ from backend.core.models import (
     Contestant,
     Submission,
     SelectedProblem,
+    ContestStandingsSnapshot,
+    ContestantPointsHistory,
 )
 from backend.core.models.permission import (
     PermissionResourceType,
     PermissionActionType,
 )
+from backend.core.optimazers.cache.tags import contest_tag
 from backend.core.repository.crud.base import BaseCRUDRepository
 from backend.core.schemas.contest import (
     ContestantInStandings,
@@ -35,6 +42,7 @@ from backend.core.schemas.contest import (
     ProblemCardForSubmissionInfo,
 )
 from backend.core.utilities.loggers.log_decorator import log_calls
+from backend.handlers.standings.impl.redis_zset.provider import get_standings_engine
 
 
 class ContestCRUDRepository(BaseCRUDRepository):
@@ -86,18 +94,53 @@ class ContestCRUDRepository(BaseCRUDRepository):
     async def get_contestant_in_standings(
             self,
             contest_id: int,
+            as_of: datetime | None = None,
     ) -> Sequence[ContestantInStandings]:
-        res = await self.async_session.execute(
+        """
+        Таблица контеста по текущим очкам или, если задан `as_of`, по очкам на этот момент из истории очков.
+
+        На момент `as_of` берётся последнее значение из истории не позже него. Участник без записей до `as_of`
+        получает стартовые очки контеста, если записи у него есть (он создан или впервые получил очки позже),
+        и текущие очки, если записей нет совсем (очки не менялись с начала ведения истории).
+        """
+        points = Contestant.points
+        if as_of is not None:
+            h = ContestantPointsHistory
+            points_as_of = (
+                select(h.points)
+                .where(h.contest_id == contest_id)
+                .where(h.contestant_id == Contestant.id)
+                .where(h.created_at <= as_of)
+                .order_by(h.created_at.desc(), h.id.desc())
+                .limit(1)
+                .scalar_subquery()
+            )
+            has_history = (
+                exists()
+                .where(h.contest_id == contest_id)
+                .where(h.contestant_id == Contestant.id)
+            )
+            points = func.coalesce(points_as_of, case((has_history, Contest.start_points), else_=Contestant.points))
+
+        standings = (
             select(
                 Contestant.id.label("contestant_id"),
                 Contestant.name,
-                Contestant.points,
-                func.rank().over(order_by=Contestant.points.desc()).label("rank")
+                points.label("points"),
             )
             .join(User, Contestant.user_id == User.id)
             .join(Contest, User.domain_number == Contest.id)
             .where(Contest.id == contest_id)
-            .order_by(Contestant.points.desc())
+            .subquery()
+        )
+        res = await self.async_session.execute(
+            select(
+                standings.c.contestant_id,
+                standings.c.name,
+                standings.c.points,
+                func.rank().over(order_by=standings.c.points.desc()).label("rank")
+            )
+            .order_by(standings.c.points.desc())
         )
 
         rows = res.all()
@@ -111,6 +154,78 @@ class ContestCRUDRepository(BaseCRUDRepository):
             for row in rows
         ]
 
+    @log_calls
+    async def get_downsampled_points_history(
+            self,
+            contest_id: int,
+            contestant_ids: Sequence[int],
+            since: datetime,
+            until: datetime,
+            max_points: int,
+    ) -> Sequence[Tuple[int, datetime, int]]:
+        """
+        Возвращает историю очков участников, прореженную до `max_points` точек на участника.
+
+        Отрезок [since, until] делится на `max_points` равных интервалов, и от каждого берётся последнее
+        значение - для ступенчатого графика очков этого достаточно. Всё, что было до `since`,
+        схлопывается в одну начальную точку.
+
+        Returns:
+            Строки (contestant_id, created_at, points), упорядоченные по участнику и времени.
+        """
+        if not contestant_ids:
+            return []
+
+        h = ContestantPointsHistory
+        bucket_width_s = max((until - since).total_seconds() / max_points, 1.0)
+        bucket = func.greatest(
+            func.floor(func.extract("epoch", h.created_at - since) / bucket_width_s),
+            -1,
+        )
+
+        res = await self.async_session.execute(
+            select(h.contestant_id, h.created_at, h.points)
+            .where(h.contest_id == contest_id)
+            .where(h.contestant_id.in_(contestant_ids))
+            .where(h.created_at <= until)
+            .distinct(h.contestant_id, bucket)
+            .order_by(h.contestant_id, bucket, h.created_at.desc(), h.id.desc())
+        )
+        return [(row.contestant_id, row.created_at, row.points) for row in res.all()]
+
+    async def get_standings_snapshot(
+            self,
+            contest_id: int,
+    ) -> ContestStandingsSnapshot | None:
+        res = await self.async_session.execute(
+            select(ContestStandingsSnapshot)
+            .where(ContestStandingsSnapshot.contest_id == contest_id)
+        )
+        return res.scalar_one_or_none()
+
+    @log_calls
+    async def create_standings_snapshot(
+            self,
+            contest_id: int,
+            frozen_at: datetime,
+            body: str,
+    ) -> ContestStandingsSnapshot:
+        # Снимок могут одновременно попытаться сделать несколько запросов - сохраняется первый
+        await self.async_session.execute(
+            postgresql_insert(ContestStandingsSnapshot)
+            .values(
+                contest_id=contest_id,
+                frozen_at=frozen_at,
+                body=body,
+            )
+            .on_conflict_do_nothing(index_elements=[ContestStandingsSnapshot.contest_id])
+        )
+        res = await self.async_session.execute(
+            select(ContestStandingsSnapshot)
+            .where(ContestStandingsSnapshot.contest_id == contest_id)
+        )
+        return res.scalar_one()
+
     async def delete_contest(
             self,
             contest_id: int,
@@ -119,6 +234,12 @@ class ContestCRUDRepository(BaseCRUDRepository):
             delete(Contest)
             .where(Contest.id == contest_id)
         )
+        self._forget_policy_context()
+        self._call_after_commit(
+            functools.partial(get_standings_engine().drop_contest, contest_id=contest_id, )
+        )
+        self._bump_contest_version_after_commit(contest_id)
+        self._invalidate_cache_tags_after_commit(contest_tag(contest_id))
 
     async def get_contest_by_user_id(
             self,
@@ -149,6 +270,8 @@ class ContestCRUDRepository(BaseCRUDRepository):
             closed_at: datetime,
             start_points: int,
             number_of_slots_for_problems: int,
+            freeze_at: datetime | None = None,
+            unfreeze_at: datetime | None = None,
     ) -> Contest:
         contest = Contest(
             name=name,
@@ -156,6 +279,8 @@ class ContestCRUDRepository(BaseCRUDRepository):
             closed_at=closed_at,
             start_points=start_points,
             number_of_slots_for_problems=number_of_slots_for_problems,
+            freeze_at=freeze_at,
+            unfreeze_at=unfreeze_at,
         )
         self.async_session.add(instance=contest)
         await self.async_session.flush()
@@ -185,6 +310,8 @@ class ContestCRUDRepository(BaseCRUDRepository):
         )
         self.async_session.add(instance=problem_card)
         await self.async_session.flush()
+        # Сбрасывает закешированные "не найдено" для этого контеста и его поля
+        self._invalidate_cache_tags_after_commit(contest_tag(contest.id))
 
         return contest
 
@@ -196,6 +323,8 @@ class ContestCRUDRepository(BaseCRUDRepository):
             closed_at: datetime,
             start_points: int,
             number_of_slots_for_problems: int,
+            freeze_at: datetime | None = None,
+            unfreeze_at: datetime | None = None,
     ) -> Contest:
         new_contest: Contest = (
             Contest(
@@ -204,10 +333,14 @@ class ContestCRUDRepository(BaseCRUDRepository):
                 closed_at=closed_at,
                 start_points=start_points,
                 number_of_slots_for_problems=number_of_slots_for_problems,
+                freeze_at=freeze_at,
+                unfreeze_at=unfreeze_at,
             )
         )
         self.async_session.add(instance=new_contest)
         await self.async_session.flush()
+        # Сбрасывает закешированные "не найдено" для этого контеста
+        self._invalidate_cache_tags_after_commit(contest_tag(new_contest.id))
 
         return new_contest
 
@@ -222,6 +355,8 @@ class ContestCRUDRepository(BaseCRUDRepository):
             number_of_slots_for_problems: int,
             rule_type: str,
             flag_user_can_have_negative_points: bool,
+            freeze_at: datetime | None = None,
+            unfreeze_at: datetime | None = None,
     ) -> Contest | None:
         await self.async_session.execute(
             update(Contest)
@@ -234,10 +369,21 @@ class ContestCRUDRepository(BaseCRUDRepository):
                 number_of_slots_for_problems=number_of_slots_for_problems,
                 rule_type=rule_type,
                 flag_user_can_have_negative_points=flag_user_can_have_negative_points,
+                freeze_at=freeze_at,
+                unfreeze_at=unfreeze_at,
             )
             .execution_options(synchronize_session="fetch")
         )
+        # Снимок, сделанный для другого момента заморозки, больше не действителен
+        stmt = delete(ContestStandingsSnapshot).where(ContestStandingsSnapshot.contest_id == contest_id)
+        if freeze_at is not None:
+            stmt = stmt.where(ContestStandingsSnapshot.frozen_at != freeze_at)
+        await self.async_session.execute(stmt)
+
         await self.async_session.flush()
+        self._forget_policy_context()
+        self._bump_contest_version_after_commit(contest_id)
+        self._invalidate_cache_tags_after_commit(contest_tag(contest_id))
 
         result = await self.async_session.execute(
             select(Contest)
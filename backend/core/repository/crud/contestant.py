@@ -1,22 +1,50 @@
 from typing import Sequence
 
 from sqlalchemy import (
+    func,
     select,
     update,
 )
 
+from sqlalchemy.ext.asyncio import AsyncSession as SQLAlchemyAsyncSession
+
 from backend.core.models import (
     Contestant,
+    ContestantPointsHistory,
     User,
 )
+from backend.core.optimazers.cache.tags import contest_tag
 from backend.core.repository.crud.base import BaseCRUDRepository
 from backend.core.utilities.loggers.log_decorator import log_calls
 from cryptography.fernet import Fernet
 from backend.configuration.settings import settings
+from backend.handlers.standings.impl.redis_zset.provider import get_standings_engine
 
 fernet = Fernet(settings.FERNET_KEY)
 
 
+def record_points_history(
+        async_session: SQLAlchemyAsyncSession,
+        contest_id: int,
+        contestant_id: int,
+        points: int,
+) -> ContestantPointsHistory:
+    """
+    Добавляет в историю очков новое значение очков участника. Запишется вместе с текущей транзакцией.
+
+    Вызывается после UPDATE строки участника: блокировка строки упорядочивает `id` записей истории
+    одного участника так же, как коммиты их транзакций, - он служит версией обновления таблицы.
+    """
+
+    entry = ContestantPointsHistory(
+        contest_id=contest_id,
+        contestant_id=contestant_id,
+        points=points,
+    )
+    async_session.add(entry)
+    return entry
+
+
 class ContestantCRUDRepository(BaseCRUDRepository):
 
     @log_calls
@@ -27,6 +55,18 @@ class ContestantCRUDRepository(BaseCRUDRepository):
             password: str,
             points: int,
     ) -> Contestant | None:
+        # Очки до изменения и версия их последней записи в истории. Строка блокируется до конца транзакции
+        h = ContestantPointsHistory
+        res = await self.async_session.execute(
+            select(
+                Contestant.points,
+                select(func.max(h.id)).where(h.contestant_id == Contestant.id).scalar_subquery(),
+            )
+            .where(Contestant.id == contestant_id)
+            .with_for_update(of=Contestant)
+        )
+        before = res.one_or_none()
+
         await self.async_session.execute(
             update(Contestant)
             .where(Contestant.id == contestant_id)
@@ -40,10 +80,25 @@ class ContestantCRUDRepository(BaseCRUDRepository):
         await self.async_session.flush()
 
         result = await self.async_session.execute(
-            select(Contestant)
+            select(Contestant, User.domain_number)
+            .join(User, User.id == Contestant.user_id)
             .where(Contestant.id == contestant_id)
         )
-        return result.scalar_one_or_none()
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        contestant, contest_id = row
+        history: ContestantPointsHistory | None = None
+        if before is None or before[0] != contestant.points:
+            history = record_points_history(self.async_session, contest_id, contestant.id, contestant.points, )
+        # Без новой записи в таблицу уходит только имя - с версией последней записи очков
+        self._update_standings_after_commit(
+            contest_id, contestant, history, last_version=before[1] if before is not None else None,
+        )
+        self._bump_contest_version_after_commit(contest_id)
+        self._invalidate_cache_tags_after_commit(contest_tag(contest_id))
+        return contestant
 
     @log_calls
     async def get_contestant_by_id(
@@ -70,6 +125,21 @@ class ContestantCRUDRepository(BaseCRUDRepository):
         res = res.scalar_one_or_none()
         return res
 
+    @log_calls
+    async def get_contestant_in_contest_by_user_id(
+            self,
+            user_id: int,
+            contest_id: int,
+    ) -> Contestant | None:
+        res = await self.async_session.execute(
+            select(Contestant)
+            .join(User, User.id == Contestant.user_id)
+            .where(User.id == user_id)
+            .where(User.domain_number == contest_id)
+        )
+        res = res.scalar_one_or_none()
+        return res
+
     @log_calls
     async def create_contestant(
             self,
@@ -90,6 +160,14 @@ class ContestantCRUDRepository(BaseCRUDRepository):
         await self.async_session.flush()
         # await self.async_session.commit()
 
+        # Пользователь обычно создан в этой же сессии - берётся из identity map без запроса
+        user: User | None = await self.async_session.get(User, user_id)
+        if user is not None:
+            history = record_points_history(self.async_session, user.domain_number, contestant.id, contestant.points, )
+            self._update_standings_after_commit(user.domain_number, contestant, history, )
+            self._bump_contest_version_after_commit(user.domain_number)
+            self._invalidate_cache_tags_after_commit(contest_tag(user.domain_number))
+
         return contestant
 
     @log_calls
@@ -105,6 +183,27 @@ class ContestantCRUDRepository(BaseCRUDRepository):
         result = rows.scalars().all()
         return result
 
+    def _update_standings_after_commit(
+            self,
+            contest_id: int,
+            contestant: Contestant,
+            history: ContestantPointsHistory | None,
+            last_version: int | None = None,
+    ) -> None:
+        contestant_id, name, points = contestant.id, contestant.name, contestant.points
+
+        async def update_standings() -> None:
+            # `id` записи истории присваивается при flush - к коммиту он уже известен
+            await get_standings_engine().update_contestant(
+                contest_id=contest_id,
+                contestant_id=contestant_id,
+                name=name,
+                points=points,
+                version=history.id if history is not None else last_version or 0,
+            )
+
+        self._call_after_commit(update_standings)
+
 
 """
 Пример вызова
@@ -57,6 +57,7 @@ class PermissionCRUDRepository(BaseCRUDRepository):
         )
         self.async_session.add(instance=permission)
         await self.async_session.flush()
+        self._forget_policy_context()
         # await self.async_session.commit()
         # await self.async_session.refresh(instance=permission)
         return permission
@@ -10,6 +10,7 @@ from backend.core.models import (
     Problem,
     ProblemCard,
 )
+from backend.core.optimazers.cache.tags import contest_tag
 from backend.core.repository.crud.base import BaseCRUDRepository
 from backend.core.utilities.loggers.log_decorator import log_calls
 
@@ -26,6 +27,7 @@ class ProblemCardCRUDRepository(BaseCRUDRepository):
             category_price: int,
             statement: str,
             answer: str,
+            contest_id: int,
     ) -> Tuple[ProblemCard, Problem]:
         problem: Problem = (
             Problem(
@@ -50,6 +52,7 @@ class ProblemCardCRUDRepository(BaseCRUDRepository):
         await self.async_session.flush()
         # await self.async_session.commit()
         # await self.async_session.refresh(instance=problem_card)
+        self._invalidate_contest_after_commit(contest_id)
         return problem_card, problem
 
     @log_calls
@@ -61,6 +64,7 @@ class ProblemCardCRUDRepository(BaseCRUDRepository):
             category_price: int,
             statement: str,
             answer: str,
+            contest_id: int,
     ) -> ProblemCard:
         await self.async_session.execute(
             update(ProblemCard)
@@ -82,12 +86,16 @@ class ProblemCardCRUDRepository(BaseCRUDRepository):
         )
         await self.async_session.flush()
         # await self.async_session.commit()
+        self._forget_policy_context()
 
         result = await self.async_session.execute(
             select(ProblemCard)
             .where(ProblemCard.id == problem_card_id)
         )
-        return result.scalar_one_or_none()
+        problem_card = result.scalar_one_or_none()
+        if problem_card is not None:
+            self._invalidate_contest_after_commit(contest_id)
+        return problem_card
 
     @log_calls
     async def get_tuple_problem_card_with_problem_by_problem_card_id(
@@ -172,6 +180,7 @@ class ProblemCardCRUDRepository(BaseCRUDRepository):
             quiz_field_id: int,
             row: int,
             column: int,
+            contest_id: int,
     ) -> ProblemCard:
         problem_card: ProblemCard = (
             ProblemCard(
@@ -187,6 +196,7 @@ class ProblemCardCRUDRepository(BaseCRUDRepository):
         await self.async_session.flush()
         # await self.async_session.commit()
         # await self.async_session.refresh(instance=problem_card)
+        self._invalidate_contest_after_commit(contest_id)
         return problem_card
 
     @log_calls
@@ -195,6 +205,7 @@ class ProblemCardCRUDRepository(BaseCRUDRepository):
             problem_card_id: int,
             category_name: str,
             category_price: int,
+            contest_id: int,
     ) -> ProblemCard | None:
         await self.async_session.execute(
             update(ProblemCard)
@@ -207,12 +218,28 @@ class ProblemCardCRUDRepository(BaseCRUDRepository):
         )
         await self.async_session.flush()
         # await self.async_session.commit()
+        self._forget_policy_context()
 
         result = await self.async_session.execute(
             select(ProblemCard)
             .where(ProblemCard.id == problem_card_id)
         )
-        return result.scalar_one_or_none()
+        problem_card = result.scalar_one_or_none()
+        if problem_card is not None:
+            self._invalidate_contest_after_commit(contest_id)
+        return problem_card
+
+    def _invalidate_contest_after_commit(
+            self,
+            contest_id: int,
+    ) -> None:
+        """
+        После коммита сбрасывает ETag'и контеста и закешированные значения его данных.
+
+        `contest_id` передаёт сервис: он уже прочитал поле квиза при проверке доступа.
+        """
+        self._bump_contest_version_after_commit(contest_id)
+        self._invalidate_cache_tags_after_commit(contest_tag(contest_id))
 
 
 """
@@ -4,6 +4,7 @@ from sqlalchemy import (
 )
 
 from backend.core.models import QuizField
+from backend.core.optimazers.cache.tags import contest_tag
 from backend.core.repository.crud.base import BaseCRUDRepository
 
 
@@ -26,12 +27,17 @@ class QuizFieldCRUDRepository(BaseCRUDRepository):
         )
         await self.async_session.flush()
         # await self.async_session.commit()
+        self._forget_policy_context()
 
         result = await self.async_session.execute(
             select(QuizField)
             .where(QuizField.id == quiz_field_id)
         )
-        return result.scalar_one_or_none()
+        quiz_field = result.scalar_one_or_none()
+        if quiz_field is not None:
+            self._bump_contest_version_after_commit(quiz_field.contest_id)
+            self._invalidate_cache_tags_after_commit(contest_tag(quiz_field.contest_id))
+        return quiz_field
 
     async def get_quiz_field_by_id(
             self,
@@ -70,6 +76,8 @@ class QuizFieldCRUDRepository(BaseCRUDRepository):
         await self.async_session.flush()
         # await self.async_session.commit()
         # await self.async_session.refresh(instance=quiz_field)
+        # Сбрасывает закешированное "не найдено" для поля этого контеста
+        self._invalidate_cache_tags_after_commit(contest_tag(contest_id))
         return quiz_field
 
 
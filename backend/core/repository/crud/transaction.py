@@ -8,15 +8,19 @@ from backend.core.models import (
     Contestant,
     ProblemCard,
     Contest,
+    ContestantPointsHistory,
     User,
 )
 from backend.core.models.selected_problem import SelectedProblemStatusType
+from backend.core.optimazers.cache.tags import contest_tag
 from backend.core.models.submission import (
     Submission,
     SubmissionVerdict,
 )
 from backend.core.repository.crud.base import BaseCRUDRepository
+from backend.core.repository.crud.contestant import record_points_history
 from backend.core.utilities.loggers.log_decorator import log_calls
+from backend.handlers.standings.impl.redis_zset.provider import get_standings_engine
 
 
 class TransactionCRUDRepository(BaseCRUDRepository):
@@ -39,17 +43,24 @@ class TransactionCRUDRepository(BaseCRUDRepository):
                 .execution_options(synchronize_session="fetch")
             )
             res = await self.async_session.execute(
-                select(Contestant)
+                select(Contestant, User.domain_number)
+                .join(User, User.id == Contestant.user_id)
                 .where(Contestant.id == contestant_id)
             )
-            contestant = res.scalar_one_or_none()
+            contestant, contest_id = res.one()
+            new_points = contestant.points + points_delta
 
             await self.async_session.execute(
                 update(Contestant)
                 .where(Contestant.id == contestant_id)
-                .values(points=contestant.points + points_delta)
+                .values(points=new_points)
                 .execution_options(synchronize_session="fetch")
             )
+            if points_delta:
+                history = record_points_history(self.async_session, contest_id, contestant_id, new_points, )
+                self._update_standings_after_commit(contest_id, contestant_id, contestant.name, new_points, history, )
+            self._bump_contest_version_after_commit(contest_id)
+            self._invalidate_cache_tags_after_commit(contest_tag(contest_id))
 
             submission = Submission(
                 selected_problem_id=selected_problem_id,
@@ -100,12 +111,17 @@ class TransactionCRUDRepository(BaseCRUDRepository):
                 not contest.flag_user_can_have_negative_points):
             raise ValueError("Not enough points")
 
+        new_points = contestant.points - problem_card.category_price
         await self.async_session.execute(
             update(Contestant)
             .where(Contestant.id == contestant_id)
-            .values(points=contestant.points - problem_card.category_price)
+            .values(points=new_points)
             .execution_options(synchronize_session="fetch")
         )
+        history = record_points_history(self.async_session, contest.id, contestant_id, new_points, )
+        self._update_standings_after_commit(contest.id, contestant_id, contestant.name, new_points, history, )
+        self._bump_contest_version_after_commit(contest.id)
+        self._invalidate_cache_tags_after_commit(contest_tag(contest.id))
 
         selected_problem = SelectedProblem(
             problem_card_id=problem_card_id,
@@ -118,6 +134,26 @@ class TransactionCRUDRepository(BaseCRUDRepository):
         # await self.async_session.refresh(selected_problem)
         return selected_problem
 
+    def _update_standings_after_commit(
+            self,
+            contest_id: int,
+            contestant_id: int,
+            name: str,
+            points: int,
+            history: ContestantPointsHistory,
+    ) -> None:
+        async def update_standings() -> None:
+            # `id` записи истории присваивается при flush - к коммиту он уже известен
+            await get_standings_engine().update_contestant(
+                contest_id=contest_id,
+                contestant_id=contestant_id,
+                name=name,
+                points=points,
+                version=history.id,
+            )
+
+        self._call_after_commit(update_standings)
+
 
 """
 Пример вызова
@@ -1,9 +1,14 @@
 from fastapi import Depends
 
 from backend.core.dependencies.session import get_async_session
-from backend.core.repository.crud.base import BaseCRUDRepository
+from backend.core.repository.crud.base import (
+    BaseCRUDRepository,
+    AFTER_COMMIT_HOOKS_KEY,
+    POLICY_CONTEXT_KEY,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.repository.crud.access import AccessCRUDRepository
 from backend.core.repository.crud.contest import ContestCRUDRepository
 from backend.core.repository.crud.contestant import ContestantCRUDRepository
 from backend.core.repository.crud.contestant_log import ContestantLogCRUDRepository
@@ -17,6 +22,7 @@ from backend.core.repository.crud.submission import SubmissionCRUDRepository
 from backend.core.repository.crud.transaction import TransactionCRUDRepository
 from backend.core.repository.crud.user import UserCRUDRepository
 from backend.core.utilities.loggers.log_decorator import log_calls
+from backend.core.utilities.loggers.logger import logger
 
 
 class UnitOfWork(BaseCRUDRepository):
@@ -95,6 +101,10 @@ class UnitOfWork(BaseCRUDRepository):
     def domain_repo(self) -> DomainCRUDRepository:
         return self._get_repo(DomainCRUDRepository)
 
+    @property
+    def access_repo(self) -> AccessCRUDRepository:
+        return self._get_repo(AccessCRUDRepository)
+
     async def __aenter__(self) -> "UnitOfWork":
         """
         Вход в контекстный менеджер. Начинается область действия транзакции.
@@ -104,13 +114,32 @@ class UnitOfWork(BaseCRUDRepository):
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """
         Выход из контекста:
-        - если была ошибка — выполняется rollback;
-        - если всё прошло успешно — выполняется commit.
+        - если была ошибка — выполняется rollback, отложенные хуки и контекст проверок доступа отбрасываются;
+        - если всё прошло успешно — выполняется commit, затем вызываются отложенные хуки
+          (см. `BaseCRUDRepository._call_after_commit`).
         """
         if exc_type:
             await self._session.rollback()
+            self._session.info.pop(AFTER_COMMIT_HOOKS_KEY, None)
+            # Запомненные сущности могли быть прочитаны внутри отменённой транзакции
+            self._session.info.pop(POLICY_CONTEXT_KEY, None)
         else:
             await self._session.commit()
+            await self._run_after_commit_hooks()
+
+    async def _run_after_commit_hooks(self) -> None:
+        """
+        Выполняет хуки, накопленные репозиториями до коммита.
+
+        Данные в БД к этому моменту уже зафиксированы, поэтому ошибка хука не должна превращаться
+        в ошибку запроса — она только логируется.
+        """
+        hooks = self._session.info.pop(AFTER_COMMIT_HOOKS_KEY, None) or []
+        for hook in hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.exception(f"After-commit hook {hook} failed: {e}")
 
     @property
     def session(self) -> AsyncSession:
@@ -6,16 +6,33 @@ from sqlalchemy import (
 )
 
 from backend.core.models.user import User
+from backend.core.optimazers.cache.principal import (
+    Principal,
+    get_principal_cache,
+)
+from backend.core.optimazers.cache.tags import user_tag
 from backend.core.repository.crud.base import BaseCRUDRepository
 from backend.core.services.security import (
-    hash_password,
-    verify_password,
-    create_access_token,
+    hash_password_async,
+    verify_password_async,
 )
 from backend.core.utilities.exceptions.auth import TokenException
 from backend.core.utilities.exceptions.database import EntityAlreadyExists
 from backend.core.utilities.loggers.log_decorator import log_calls
 
+# Ключ в `AsyncSession.info`: id пользователей, изменённых в текущей транзакции, - их нельзя брать из кеша
+UPDATED_USER_IDS_KEY = "updated_user_ids"
+
+
+def _to_principal(user: User) -> Principal:
+    return Principal(
+        id=user.id,
+        uuid=user.uuid,
+        domain_number=user.domain_number,
+        username=user.username,
+        created_at=user.created_at,
+    )
+
 
 class UserCRUDRepository(BaseCRUDRepository):
 
@@ -31,11 +48,14 @@ class UserCRUDRepository(BaseCRUDRepository):
             .where(User.id == user_id)
             .values(
                 username=username,
-                hashed_password=hash_password(password),
+                hashed_password=await hash_password_async(password),
             )
             .execution_options(synchronize_session="fetch")
         )
         await self.async_session.flush()
+        self.async_session.info.setdefault(UPDATED_USER_IDS_KEY, set()).add(user_id)
+        self._forget_policy_context()
+        self._invalidate_cache_tags_after_commit(user_tag(user_id))
 
         result = await self.async_session.execute(
             select(User)
@@ -62,7 +82,7 @@ class UserCRUDRepository(BaseCRUDRepository):
         user = User(
             domain_number=0,
             username=username,
-            hashed_password=hash_password(password),
+            hashed_password=await hash_password_async(password),
             uuid=str(uuid.uuid4())
         )
         self.async_session.add(instance=user)
@@ -92,7 +112,7 @@ class UserCRUDRepository(BaseCRUDRepository):
         user = User(
             domain_number=domain_number,
             username=username,
-            hashed_password=hash_password(password),
+            hashed_password=await hash_password_async(password),
             uuid=str(uuid.uuid4())
         )
         self.async_session.add(instance=user)
@@ -108,7 +128,7 @@ class UserCRUDRepository(BaseCRUDRepository):
             domain_number: int,
             username: str,
             password: str,
-    ):
+    ) -> User:
         user: User = await self.async_session.scalar(
             select(User)
             .where(
@@ -116,11 +136,10 @@ class UserCRUDRepository(BaseCRUDRepository):
                 User.domain_number == domain_number
             )
         )
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(password, user.hashed_password):
             raise TokenException("Invalid credentials")
 
-        # todo: что это делает тут? переместить позже
-        return create_access_token({"sub": user.uuid})
+        return user
 
     @log_calls
     async def get_user_by_username_and_domain(
@@ -143,11 +162,13 @@ class UserCRUDRepository(BaseCRUDRepository):
             self,
             user_uuid: str,
     ) -> User | None:
+        epoch = get_principal_cache().epoch
         res = await self.async_session.execute(
             select(User)
             .where(User.uuid == user_uuid)
         )
         user = res.scalar_one_or_none()
+        self._remember_user(user, epoch)
         return user
 
     @log_calls
@@ -160,11 +181,62 @@ class UserCRUDRepository(BaseCRUDRepository):
         :param user_id: id объекта User
         :return: объект User c указанным user_id или None
         """
+        epoch = get_principal_cache().epoch
         res = await self.async_session.execute(
             select(User)
             .where(User.id == user_id)
         )
-        return res.scalars().one_or_none()
+        user = res.scalars().one_or_none()
+        self._remember_user(user, epoch)
+        return user
+
+    @log_calls
+    async def get_principal_by_uuid(
+            self,
+            user_uuid: str,
+    ) -> Principal | None:
+        """
+        Возвращает снимок пользователя с указанным UUID - из `PrincipalCache`, если он там есть
+        :param user_uuid: UUID пользователя
+        :return: Principal пользователя или None
+        """
+        principal: Principal | None = get_principal_cache().get_by_uuid(user_uuid)
+        if principal is not None and not self._is_user_updated(principal.id):
+            return principal
+
+        user = await self.get_user_by_uuid(user_uuid=user_uuid)
+        return _to_principal(user) if user is not None else None
+
+    @log_calls
+    async def get_principal_by_id(
+            self,
+            user_id: int,
+    ) -> Principal | None:
+        """
+        Возвращает снимок пользователя с указанным id - из `PrincipalCache`, если он там есть
+        :param user_id: id пользователя
+        :return: Principal пользователя или None
+        """
+        principal: Principal | None = get_principal_cache().get_by_id(user_id)
+        if principal is not None and not self._is_user_updated(user_id):
+            return principal
+
+        user = await self.get_user_by_id(user_id=user_id)
+        return _to_principal(user) if user is not None else None
+
+    def _is_user_updated(
+            self,
+            user_id: int,
+    ) -> bool:
+        return user_id in self.async_session.info.get(UPDATED_USER_IDS_KEY, ())
+
+    def _remember_user(
+            self,
+            user: User | None,
+            epoch: int,
+    ) -> None:
+        if user is not None and not self._is_user_updated(user.id):
+            get_principal_cache().put(_to_principal(user), epoch)
 
 
 """
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import Sequence
 
 from pydantic import (
@@ -25,10 +26,25 @@ class ContestCreateRequest(BaseSchemaModel):
         description="Сколько задач разрешено держать одновременно (1–5)",
     )
 
+    freeze_at: datetime | None = Field(
+        default=None,
+        description="С какого момента участники видят замороженную таблицу результатов",
+    )
+    unfreeze_at: datetime | None = Field(
+        default=None,
+        description="Когда таблица размораживается. Если не задан - остаётся замороженной",
+    )
+
     @model_validator(mode='after')
     def check_dates(self) -> 'ContestCreateRequest':
         if self.started_at and self.closed_at and self.closed_at < self.started_at:
             raise ValueError("closed_at не может быть раньше started_at")
+        if self.freeze_at and not self.started_at <= self.freeze_at <= self.closed_at:
+            raise ValueError("freeze_at должен быть между started_at и closed_at")
+        if self.freeze_at and self.unfreeze_at and self.unfreeze_at < self.freeze_at:
+            raise ValueError("unfreeze_at не может быть раньше freeze_at")
+        if self.unfreeze_at and not self.freeze_at:
+            raise ValueError("unfreeze_at задаётся только вместе с freeze_at")
         return self
 
 
@@ -48,10 +64,25 @@ class ContestUpdateRequest(BaseSchemaModel):
     rule_type: ContestRuleType
     flag_user_can_have_negative_points: bool
 
+    freeze_at: datetime | None = Field(
+        default=None,
+        description="С какого момента участники видят замороженную таблицу результатов",
+    )
+    unfreeze_at: datetime | None = Field(
+        default=None,
+        description="Когда таблица размораживается. Если не задан - остаётся замороженной",
+    )
+
     @model_validator(mode='after')
     def check_dates(self) -> 'ContestUpdateRequest':
         if self.started_at and self.closed_at and self.closed_at < self.started_at:
             raise ValueError("closed_at не может быть раньше started_at")
+        if self.freeze_at and not self.started_at <= self.freeze_at <= self.closed_at:
+            raise ValueError("freeze_at должен быть между started_at и closed_at")
+        if self.freeze_at and self.unfreeze_at and self.unfreeze_at < self.freeze_at:
+            raise ValueError("unfreeze_at не может быть раньше freeze_at")
+        if self.unfreeze_at and not self.freeze_at:
+            raise ValueError("unfreeze_at задаётся только вместе с freeze_at")
         return self
 
 
@@ -79,6 +110,8 @@ class ContestInfoForEditor(BaseSchemaModel):
     closed_at: datetime
     rule_type: ContestRuleType = Field(default=ContestRuleType.DEFAULT)
     flag_user_can_have_negative_points: bool = Field(default=False)
+    freeze_at: datetime | None = Field(default=None)
+    unfreeze_at: datetime | None = Field(default=None)
     server_time: datetime = Field(
         default_factory=lambda: get_server_time(with_server_timezone=False)
     )
@@ -112,6 +145,50 @@ class ContestStandings(BaseSchemaModel):
     closed_at: datetime
     standings: ArrayContestantInStandings
     use_cache: bool = Field(default=False)
+    # Окно таблицы: `standings` начинается с позиции `offset` (с нуля) из `total` участников
+    offset: int = Field(default=0)
+    total: int | None = Field(default=None)
+    # Момент заморозки таблицы. Если `is_frozen` - `standings` содержит снимок на этот момент
+    freeze_at: datetime | None = Field(default=None)
+    is_frozen: bool = Field(default=False)
+
+
+class ContestantPointsAt(BaseSchemaModel):
+    at: datetime
+    points: int
+
+
+class ContestantPointsHistory(BaseSchemaModel):
+    contestant_id: int
+    name: str
+    rank: int
+    history: Sequence[ContestantPointsAt]
+
+
+class ContestStandingsHistory(BaseSchemaModel):
+    contest_id: int
+    started_at: datetime
+    closed_at: datetime
+    # История обрезана моментом заморозки таблицы
+    is_frozen: bool = Field(default=False)
+    series: Sequence[ContestantPointsHistory]
+
+
+class ContestStandingsEventType(str, Enum):
+    SNAPSHOT = "SNAPSHOT"  # Таблица целиком
+    DELTA = "DELTA"  # Только участники, у которых изменились очки или место
+    RESET = "RESET"  # Таблица пересобрана или события могли потеряться - нужно перечитать её целиком
+    HEARTBEAT = "HEARTBEAT"  # Изменений нет, соединение живо
+
+
+class ContestStandingsEvent(BaseSchemaModel):
+    event_type: ContestStandingsEventType
+    contest_id: int
+    # Порядковый номер изменения таблицы контеста. Пропуск номера означает потерянное событие
+    seq: int | None = Field(default=None)
+    standings: ArrayContestantInStandings = Field(
+        default_factory=lambda: ArrayContestantInStandings(body=[])
+    )
 
 
 class ProblemCardForSubmissionInfo(BaseSchemaModel):
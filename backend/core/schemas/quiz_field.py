@@ -42,6 +42,7 @@ class QuizFieldInfoForEditor(BaseSchemaModel):
     number_of_rows: int
     number_of_columns: int
     problem_cards: Sequence[ProblemCardInfo]
+    use_cache: bool = Field(default=False)
 
 
 class QuizFieldInfoForContestant(BaseSchemaModel):
@@ -6,9 +6,10 @@ from typing import (
 
 from backend.core.models import (
     Contest,
-    User,
 )
+from backend.core.optimazers.cache.principal import Principal
 from backend.core.repository.crud.uow import UnitOfWork
+from backend.core.services.access_policies.context import get_policy_context
 from backend.core.utilities.exceptions.database import EntityDoesNotExist
 from backend.core.utilities.exceptions.permission import PermissionDenied
 
@@ -38,14 +39,15 @@ class AccessPolicy(Protocol):
             user_id: int,
             contest_id: Optional[int] = None,
             raise_if_none: bool = True,
-    ) -> Tuple[User, Contest] | None:
+    ) -> Tuple[Principal, Contest] | None:
+        context = get_policy_context(uow)
         async with uow:
-            user: User | None = await uow.user_repo.get_user_by_id(user_id=user_id)
+            user: Principal | None = await context.get_user(user_id=user_id)
             if user is None:  # Пользователь не аутентифицирован
                 return self._raise_if(raise_if_none, f"User is not authenticated.")
 
             contest_id = contest_id or user.domain_number
-            contest: Contest | None = (await uow.contest_repo.get_contest_by_id(contest_id=contest_id))
+            contest: Contest | None = (await context.get_contest(contest_id=contest_id))
             if contest is None:  # Контест не существует
                 return self._raise_if(raise_if_none, f"Contest does not exists.", EntityDoesNotExist)
 
@@ -6,16 +6,15 @@ from typing import Tuple
 
 from backend.core.models import (
     Contest,
-    User,
-)
-from backend.core.models.permission import (
-    PermissionActionType,
-    PermissionResourceType,
-    Permission,
 )
+from backend.core.models.permission import PermissionActionType
+from backend.core.repository.crud.access import ContestAccess
+from backend.core.optimazers.cache.principal import Principal
 from backend.core.repository.crud.uow import UnitOfWork
 from backend.core.schemas.permission import PermissionPromise
 from backend.core.services.access_policies.base import AccessPolicy
+from backend.core.services.access_policies.context import get_policy_context
+from backend.core.utilities.exceptions.database import EntityDoesNotExist
 
 
 class ContestAccessPolicy(AccessPolicy):
@@ -26,23 +25,22 @@ class ContestAccessPolicy(AccessPolicy):
             user_id: int,
             contest_id: int,
             raise_if_none: bool = True,
-    ) -> Tuple[User, Contest] | None:
+    ) -> Tuple[Principal, Contest] | None:
         async with uow:
-            user_and_contest: Tuple[User, Contest] = await self._get_user_and_contest(uow, user_id, contest_id)
-            user, contest = user_and_contest
+            context = get_policy_context(uow)
+            user: Principal | None = await context.get_user(user_id=user_id)
+            if user is None:  # Пользователь не аутентифицирован
+                return self._raise_if(raise_if_none, f"User is not authenticated.")
+
+            # Контест и права пользователя на него - одним запросом
+            access: ContestAccess | None = await context.get_contest_access(user_id=user_id, contest_id=contest_id)
+            if access is None:  # Контест не существует
+                return self._raise_if(raise_if_none, f"Contest does not exists.", EntityDoesNotExist)
 
             if user.domain_number == 0:
                 # Пользователь принадлежит к домену сайта - может быть менеджером,
                 # должен видеть только свои контесты (там, где он имеет права менеджера)
-                permission: Permission | None = (
-                    await uow.permission_repo.check_permission(
-                        user_id=user_id,
-                        resource_type=PermissionResourceType.CONTEST.value,
-                        permission_type=PermissionActionType.EDIT.value,
-                        resource_id=contest_id,
-                    )
-                )
-                if permission is None:
+                if PermissionActionType.EDIT.value not in access.granted:
                     return self._raise_if(
                         raise_if_none, "Permission denied: user is not the manager of this contest.")
 
@@ -52,7 +50,7 @@ class ContestAccessPolicy(AccessPolicy):
                 if user.domain_number != contest_id:
                     return self._raise_if(raise_if_none, f"User is not participating in this contest.")
 
-            return user, contest
+            return user, access.contest
 
     async def can_user_view_contest(
             self,
@@ -63,7 +61,7 @@ class ContestAccessPolicy(AccessPolicy):
     ) -> PermissionPromise | None:
 
         async with uow:
-            user_and_contest: Tuple[User, Contest] = await self.base_check(uow, user_id, contest_id, raise_if_none)
+            user_and_contest: Tuple[Principal, Contest] = await self.base_check(uow, user_id, contest_id, raise_if_none)
             user, contest = user_and_contest
 
             # Запрещаем доступ, если контест уже закончился
@@ -96,13 +94,28 @@ class ContestAccessPolicy(AccessPolicy):
         res = await self.can_user_view_contest(uow, user_id, contest_id, raise_if_none)
         return res
 
+    async def can_user_view_live_standings(
+            self,
+            uow: UnitOfWork,
+            user_id: int,
+            contest_id: int,
+            raise_if_none: bool = True,
+    ) -> PermissionPromise | None:
+        # Во время заморозки живую таблицу видят только менеджеры контеста, участники - снимок
+        user: Principal | None = await get_policy_context(uow).get_user(user_id=user_id)
+        if user is None or user.domain_number != 0:
+            return self._raise_if(raise_if_none, "Permission denied: standings are frozen.")
+
+        res = await self.can_user_manage_contest(uow, user_id, contest_id, raise_if_none)
+        return res
+
     async def can_user_create_contests(
             self,
             uow: UnitOfWork,
             user_id: int,
             raise_if_none: bool = True,
     ) -> PermissionPromise | None:
-        user: User | None = await uow.user_repo.get_user_by_id(user_id=user_id)
+        user: Principal | None = await get_policy_context(uow).get_user(user_id=user_id)
         if user is None:  # Пользователь не аутентифицирован
             return self._raise_if(raise_if_none, f"User is not authenticated.")
 
@@ -118,17 +131,13 @@ class ContestAccessPolicy(AccessPolicy):
             contest_id: int,
             raise_if_none: bool = True,
     ) -> PermissionPromise | None:
-        await self.base_check(uow, user_id, contest_id, raise_if_none)
-
-        permission: Permission | None = (
-            await uow.permission_repo.check_permission(
-                user_id=user_id,
-                resource_type=PermissionResourceType.CONTEST.value,
-                permission_type=PermissionActionType.ADMIN.value,
-                resource_id=contest_id,
-            )
-        )
-        if permission is None:
+        if await self.base_check(uow, user_id, contest_id, raise_if_none) is None:
+            return None
+
+        # Права уже прочитаны `base_check` вместе с контестом
+        access: ContestAccess = await get_policy_context(uow).get_contest_access(
+            user_id=user_id, contest_id=contest_id)
+        if PermissionActionType.ADMIN.value not in access.granted:
             return self._raise_if(raise_if_none, "Permission denied: user is not the admin of this contest.")
 
         return PermissionPromise()
@@ -140,17 +149,13 @@ class ContestAccessPolicy(AccessPolicy):
             contest_id: int,
             raise_if_none: bool = True,
     ) -> PermissionPromise | None:
-        await self.base_check(uow, user_id, contest_id, raise_if_none)
-
-        permission: Permission | None = (
-            await uow.permission_repo.check_permission(
-                user_id=user_id,
-                resource_type=PermissionResourceType.CONTEST.value,
-                permission_type=PermissionActionType.EDIT.value,
-                resource_id=contest_id,
-            )
-        )
-        if permission is None:
+        if await self.base_check(uow, user_id, contest_id, raise_if_none) is None:
+            return None
+
+        # Права уже прочитаны `base_check` вместе с контестом
+        access: ContestAccess = await get_policy_context(uow).get_contest_access(
+            user_id=user_id, contest_id=contest_id)
+        if PermissionActionType.EDIT.value not in access.granted:
             return self._raise_if(raise_if_none, "Permission denied: user is not the manager of this contest.")
 
         return PermissionPromise()
@@ -0,0 +1,215 @@
+from collections import Counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Tuple,
+)
+
+from backend.core.models import (
+    Contest,
+    ProblemCard,
+    QuizField,
+)
+from backend.core.models.permission import Permission
+from backend.core.optimazers.cache.principal import Principal
+from backend.core.repository.crud.access import ContestAccess
+from backend.core.repository.crud.base import POLICY_CONTEXT_KEY
+from backend.core.repository.crud.uow import UnitOfWork
+from backend.metrics.access_policy import ACCESS_POLICY_LOOKUPS
+
+
+class PolicyContext:
+    """
+    Контекст проверок доступа одного запроса: запоминает прочитанных пользователей, контесты, поля квиза,
+    карточки задач и права, чтобы цепочка политик (`base_check` -> `can_user_manage_contest` -> ...) читала
+    каждую сущность из БД не больше одного раза.
+
+    Проверки доступа к полю квиза и карточке задачи читают сущность, её контест и права пользователя на контест
+    одним запросом (`AccessCRUDRepository`) и запоминают все звенья цепочки: следующие политики
+    (`can_user_manage_contest`, `can_user_view_contest`) находят их в контексте без обращения к БД.
+
+    Запоминаются только найденные сущности: отсутствующую запрос может создать сам, и повторная проверка
+    должна её увидеть. `db_fetches` считает чтения из БД по (сущность, ключ).
+
+    Контекст сбрасывается, когда репозиторий меняет запоминаемые сущности или права
+    (`BaseCRUDRepository._forget_policy_context`), и при откате транзакции. Коммит его не сбрасывает:
+    политики сами коммитят через `async with uow` посреди цепочки проверок.
+
+    Args:
+        uow (UnitOfWork): Unit of Work запроса.
+    """
+
+    def __init__(
+            self,
+            uow: UnitOfWork,
+    ) -> None:
+        self._uow = uow
+        self._memo: Dict[Tuple[str, Hashable], Any] = {}
+        self.db_fetches: Counter[Tuple[str, Hashable]] = Counter()
+
+    async def get_user(
+            self,
+            user_id: int,
+    ) -> Principal | None:
+        return await self._get(
+            "user", user_id, lambda: self._uow.user_repo.get_principal_by_id(user_id=user_id))
+
+    async def get_contest(
+            self,
+            contest_id: int,
+    ) -> Contest | None:
+        return await self._get(
+            "contest", contest_id, lambda: self._uow.contest_repo.get_contest_by_id(contest_id=contest_id))
+
+    async def get_quiz_field(
+            self,
+            quiz_field_id: int,
+    ) -> QuizField | None:
+        return await self._get(
+            "quiz_field", quiz_field_id,
+            lambda: self._uow.quiz_field_repo.get_quiz_field_by_id(quiz_field_id=quiz_field_id))
+
+    async def get_problem_card(
+            self,
+            problem_card_id: int,
+    ) -> ProblemCard | None:
+        return await self._get(
+            "problem_card", problem_card_id,
+            lambda: self._uow.problem_card_repo.get_problem_card_by_id(problem_card_id=problem_card_id))
+
+    async def get_contest_access(
+            self,
+            user_id: int,
+            contest_id: int,
+    ) -> ContestAccess | None:
+        return await self._get(
+            "contest_access", (user_id, contest_id), lambda: self._fetch_contest_access(user_id, contest_id))
+
+    async def get_quiz_field_access(
+            self,
+            user_id: int,
+            quiz_field_id: int,
+    ) -> QuizField | None:
+        """
+        Поле квиза; его контест и права пользователя на контест попадают в контекст тем же запросом.
+        """
+        return await self._get(
+            "quiz_field_access", (user_id, quiz_field_id),
+            lambda: self._fetch_quiz_field_access(user_id, quiz_field_id))
+
+    async def get_problem_card_access(
+            self,
+            user_id: int,
+            problem_card_id: int,
+    ) -> ProblemCard | None:
+        """
+        Карточка задачи; её поле квиза, контест и права пользователя на контест попадают в контекст тем же запросом.
+        """
+        return await self._get(
+            "problem_card_access", (user_id, problem_card_id),
+            lambda: self._fetch_problem_card_access(user_id, problem_card_id))
+
+    async def check_permission(
+            self,
+            user_id: int,
+            resource_type: str,
+            permission_type: str,
+            resource_id: int,
+    ) -> Permission | None:
+        return await self._get(
+            "permission", (user_id, resource_type, permission_type, resource_id),
+            lambda: self._uow.permission_repo.check_permission(
+                user_id=user_id,
+                resource_type=resource_type,
+                permission_type=permission_type,
+                resource_id=resource_id,
+            ))
+
+    async def _fetch_contest_access(
+            self,
+            user_id: int,
+            contest_id: int,
+    ) -> ContestAccess | None:
+        access = await self._uow.access_repo.get_contest_access(user_id=user_id, contest_id=contest_id)
+        if access is not None:
+            self._remember("contest", contest_id, access.contest)
+        return access
+
+    async def _fetch_quiz_field_access(
+            self,
+            user_id: int,
+            quiz_field_id: int,
+    ) -> QuizField | None:
+        row = await self._uow.access_repo.get_quiz_field_access(user_id=user_id, quiz_field_id=quiz_field_id)
+        if row is None:
+            return None
+
+        quiz_field, access = row
+        self._remember("quiz_field", quiz_field.id, quiz_field)
+        self._remember_contest_access(user_id, access)
+        return quiz_field
+
+    async def _fetch_problem_card_access(
+            self,
+            user_id: int,
+            problem_card_id: int,
+    ) -> ProblemCard | None:
+        row = await self._uow.access_repo.get_problem_card_access(user_id=user_id, problem_card_id=problem_card_id)
+        if row is None:
+            return None
+
+        problem_card, quiz_field, access = row
+        self._remember("problem_card", problem_card.id, problem_card)
+        if quiz_field is not None:
+            self._remember("quiz_field", quiz_field.id, quiz_field)
+            self._remember("quiz_field_access", (user_id, quiz_field.id), quiz_field)
+        self._remember_contest_access(user_id, access)
+        return problem_card
+
+    def _remember_contest_access(
+            self,
+            user_id: int,
+            access: ContestAccess | None,
+    ) -> None:
+        if access is not None:
+            self._remember("contest", access.contest.id, access.contest)
+            self._remember("contest_access", (user_id, access.contest.id), access)
+
+    def _remember(
+            self,
+            entity: str,
+            key: Hashable,
+            value: Any,
+    ) -> None:
+        if value is not None:
+            self._memo[(entity, key)] = value
+
+    async def _get(
+            self,
+            entity: str,
+            key: Hashable,
+            fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        value = self._memo.get((entity, key))
+        if value is not None:
+            ACCESS_POLICY_LOOKUPS.labels(entity=entity, source="memo").inc()
+            return value
+
+        value = await fetch()
+        self.db_fetches[(entity, key)] += 1
+        ACCESS_POLICY_LOOKUPS.labels(entity=entity, source="db").inc()
+        self._remember(entity, key, value)
+        return value
+
+
+def get_policy_context(uow: UnitOfWork) -> PolicyContext:
+    """
+    Контекст политик запроса, которому принадлежит `uow` (хранится в его сессии).
+    """
+    info = uow.session.info
+    if POLICY_CONTEXT_KEY not in info:
+        info[POLICY_CONTEXT_KEY] = PolicyContext(uow)
+    return info[POLICY_CONTEXT_KEY]
@@ -1,6 +1,7 @@
 from backend.core.models import ProblemCard
 from backend.core.repository.crud.uow import UnitOfWork
 from backend.core.schemas.permission import PermissionPromise
+from backend.core.services.access_policies.context import get_policy_context
 from backend.core.services.access_policies.quiz_field import QuizFieldAccessPolicy
 from backend.core.utilities.exceptions.database import EntityDoesNotExist
 
@@ -15,7 +16,7 @@ class ProblemCardAccessPolicy(QuizFieldAccessPolicy):
             raise_if_none: bool = True,
     ) -> PermissionPromise | None:
         problem_card: ProblemCard | None = (
-            await uow.problem_card_repo.get_problem_card_by_id(problem_card_id=problem_card_id)
+            await get_policy_context(uow).get_problem_card_access(user_id=user_id, problem_card_id=problem_card_id)
         )
         if problem_card is None:
             return self._raise_if(
@@ -35,7 +36,7 @@ class ProblemCardAccessPolicy(QuizFieldAccessPolicy):
             raise_if_none: bool = True,
     ) -> PermissionPromise | None:
         problem_card: ProblemCard | None = (
-            await uow.problem_card_repo.get_problem_card_by_id(problem_card_id=problem_card_id)
+            await get_policy_context(uow).get_problem_card_access(user_id=user_id, problem_card_id=problem_card_id)
         )
         if problem_card is None:
             return self._raise_if(
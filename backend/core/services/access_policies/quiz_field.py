@@ -2,6 +2,7 @@ from backend.core.models import QuizField
 from backend.core.repository.crud.uow import UnitOfWork
 from backend.core.schemas.permission import PermissionPromise
 from backend.core.services.access_policies.contest import ContestAccessPolicy
+from backend.core.services.access_policies.context import get_policy_context
 from backend.core.utilities.exceptions.database import EntityDoesNotExist
 
 
@@ -15,14 +16,12 @@ class QuizFieldAccessPolicy(ContestAccessPolicy):
             raise_if_none: bool = True,
     ) -> PermissionPromise | None:
         quiz_field: QuizField | None = (
-            await uow.quiz_field_repo.get_quiz_field_by_id(quiz_field_id=quiz_field_id, ))
+            await get_policy_context(uow).get_quiz_field_access(user_id=user_id, quiz_field_id=quiz_field_id))
         if quiz_field is None:
             return self._raise_if(
                 raise_if_none, f"QuizField with id={quiz_field_id} does not exists", EntityDoesNotExist)
 
         contest_id = quiz_field.contest_id
-        await self.base_check(uow=uow, user_id=user_id, contest_id=contest_id, raise_if_none=raise_if_none)
-
         permission: PermissionPromise = (
             await self.can_user_manage_contest(
                 uow=uow, user_id=user_id, contest_id=contest_id, raise_if_none=raise_if_none)
@@ -37,7 +36,7 @@ class QuizFieldAccessPolicy(ContestAccessPolicy):
             raise_if_none: bool = True,
     ) -> PermissionPromise | None:
         quiz_field: QuizField | None = (
-            await uow.quiz_field_repo.get_quiz_field_by_id(quiz_field_id=quiz_field_id, ))
+            await get_policy_context(uow).get_quiz_field_access(user_id=user_id, quiz_field_id=quiz_field_id))
         if quiz_field is None:
             return self._raise_if(
                 raise_if_none, f"QuizField with id={quiz_field_id} does not exists", EntityDoesNotExist)
@@ -1,4 +1,5 @@
 from backend.core.models.user import User
+from backend.core.optimazers.cache.principal import Principal
 from backend.core.repository.crud.user import UserCRUDRepository
 from backend.core.schemas.user import SiteUserCreate
 from backend.core.services.security import decode_token
@@ -64,15 +65,15 @@ async def authenticate_user(
         username: str,
         password: str,
         user_repo: UserCRUDRepository,
-) -> str:
-    token: str = (
+) -> User:
+    user: User = (
         await user_repo.authenticate_user(
             domain_number=domain_number,
             username=username,
             password=password,
         )
     )
-    return token
+    return user
 
 
 @log_calls
@@ -89,3 +90,19 @@ async def get_user_by_uuid(
         raise EntityDoesNotExist
 
     return user
+
+
+@log_calls
+async def get_principal_by_uuid(
+        user_uuid: str,
+        user_repo: UserCRUDRepository,
+) -> Principal:
+    principal: Principal | None = (
+        await user_repo.get_principal_by_uuid(
+            user_uuid=user_uuid,
+        )
+    )
+    if not principal:
+        raise EntityDoesNotExist
+
+    return principal
@@ -1,17 +1,32 @@
+import asyncio
+import time
+from datetime import (
+    datetime,
+    timezone,
+)
 from typing import (
+    AsyncIterator,
+    Dict,
     Sequence,
     Optional,
+    Tuple,
 )
 
+from backend.configuration.settings import settings
 from backend.core.models import (
     Contest,
     Contestant,
-    User,
 )
 from backend.core.models.permission import (
     PermissionResourceType,
     PermissionActionType,
 )
+from backend.core.optimazers.cache.lazy_cache import (
+    DEFAULT_NEGATIVE_CACHE_TTLS,
+    get_lazy_cache,
+)
+from backend.core.optimazers.cache.principal import Principal
+from backend.core.optimazers.cache.tags import contest_tag
 from backend.core.repository.crud.uow import UnitOfWork
 from backend.core.schemas.contest import (
     ContestId,
@@ -27,14 +42,32 @@ from backend.core.schemas.contest import (
     ContestantInStandings,
     ContestCreateRequest,
     ContestUpdateRequest,
+    ContestStandingsEvent,
+    ContestStandingsEventType,
+    ContestStandingsHistory,
+    ContestantPointsHistory,
+    ContestantPointsAt,
 )
 from backend.core.schemas.contestant import ContestantId, ContestantInCreate
 from backend.core.services.access_policies.contest import ContestAccessPolicy
 from backend.core.services.interfaces.contest import IContestService
 from backend.core.utilities.exceptions.database import (
     EntityAlreadyExists,
+    EntityDoesNotExist,
 )
+from backend.core.utilities.exceptions.logic import FeatureUnavailable
 from backend.core.utilities.loggers.log_decorator import log_calls
+from backend.handlers.standings.interface import (
+    IStandingsEngine,
+    IStandingsEventBus,
+)
+
+# Сколько ждать таблицу, которую пересобирает другой процесс, и как часто проверять её готовность
+_STANDINGS_REBUILD_WAIT_S = 2.0
+_STANDINGS_REBUILD_POLL_S = 0.05
+
+# Пересборки таблиц, идущие в этом процессе: contest_id -> завершение пересборки
+_standings_rebuilds: Dict[int, asyncio.Future] = {}
 
 
 class ContestService(IContestService):
@@ -42,9 +75,15 @@ class ContestService(IContestService):
             self,
             uow: UnitOfWork,
             access_policy: Optional[ContestAccessPolicy] = None,
+            standings_engine: Optional[IStandingsEngine] = None,
+            standings_event_bus: Optional[IStandingsEventBus] = None,
     ):
         self.uow = uow
         self.access_policy: ContestAccessPolicy = access_policy or ContestAccessPolicy()
+        # Если движок не передан - таблица считается запросом к БД на каждый вызов
+        self.standings_engine: IStandingsEngine | None = standings_engine
+        # Без шины поток таблицы недоступен
+        self.standings_event_bus: IStandingsEventBus | None = standings_event_bus
 
     @log_calls
     async def contest_submissions(
@@ -58,13 +97,18 @@ class ContestService(IContestService):
             await self.access_policy.can_user_view_contest_submissions(
                 uow=self.uow, user_id=user_id, contest_id=contest_id, raise_if_none=True, )
 
+            if not show_user_only:
+                # Общая лента одинакова для всех, кому она доступна
+                return await self._load_contest_submissions(
+                    contest_id=contest_id, show_last_n_submissions=show_last_n_submissions, )
+
             contest: Contest = (
                 await self.uow.contest_repo.get_contest_by_id(contest_id=contest_id, )
             )
             submissions_in_contest: Sequence[ContestSubmission] = (
                 await self.uow.contest_repo.get_contest_submissions(
                     contest_id=contest_id,
-                    filter_by_user=(user_id,) if show_user_only else None,
+                    filter_by_user=(user_id,),
                     show_last_n_submissions=show_last_n_submissions, )
             )
             res: ContestSubmissions = self._map_contest_submissions(
@@ -72,6 +116,36 @@ class ContestService(IContestService):
             )
             return res
 
+    @get_lazy_cache().decorator_fabric(
+        model_class=ContestSubmissions,
+        get_from_cache_not_later_than_s=2,
+        result_cached_time_s=10 * 60,
+        tags=lambda contest_id, **_: [contest_tag(contest_id)],
+        negative_cache_ttls=DEFAULT_NEGATIVE_CACHE_TTLS,
+    )
+    async def _load_contest_submissions(
+            self,
+            contest_id: int,
+            show_last_n_submissions: int,
+    ) -> ContestSubmissions:
+        """
+        Последние посылки контеста, без проверки прав. Кешируется до первого изменения данных контеста
+        (новая посылка, правка участника, карточки или самого контеста).
+        """
+        contest: Contest | None = await self.uow.contest_repo.get_contest_by_id(contest_id=contest_id, )
+        if contest is None:
+            raise EntityDoesNotExist(f"Contest {contest_id} does not exist")
+
+        submissions_in_contest: Sequence[ContestSubmission] = (
+            await self.uow.contest_repo.get_contest_submissions(
+                contest_id=contest_id,
+                show_last_n_submissions=show_last_n_submissions, )
+        )
+        res: ContestSubmissions = self._map_contest_submissions(
+            contest, submissions_in_contest, show_last_n_submissions,
+        )
+        return res
+
     '''@lazy_cache_optimizer.decorator_fabric(
         get_from_cache_not_later_than_s=5,
         result_cached_time_s=10,
@@ -83,6 +157,9 @@ class ContestService(IContestService):
             self,
             user_id: int,
             contest_id: int,
+            offset: int = 0,
+            limit: int | None = None,
+            around_me: int | None = None,
     ) -> ContestStandings:
         async with self.uow:
             await self.access_policy.can_user_view_contest_standing(
@@ -91,15 +168,294 @@ class ContestService(IContestService):
             contest: Contest = (
                 await self.uow.contest_repo.get_contest_by_id(contest_id=contest_id)
             )
-            contestant_in_standings: Sequence[ContestantInStandings] = (
-                await self.uow.contest_repo.get_contestant_in_standings(
-                    contest_id=contest_id, )
-            )
+
+            around_contestant_id: int | None = None
+            if around_me is not None:
+                contestant: Contestant | None = (
+                    await self.uow.contestant_repo.get_contestant_in_contest_by_user_id(
+                        user_id=user_id, contest_id=contest_id, )
+                )
+                # Не участник (например, менеджер) - окно остаётся заданным offset/limit
+                around_contestant_id = contestant.id if contestant else None
+
+            is_frozen: bool = await self._should_serve_frozen_standings(user_id=user_id, contest=contest, )
+            if is_frozen:
+                contestant_in_standings, offset, total = self._slice_standings(
+                    await self._get_frozen_standings(contest),
+                    offset, limit, around_contestant_id, around_me,
+                )
+            else:
+                contestant_in_standings, offset, total = await self._get_contestant_in_standings(
+                    contest_id=contest_id,
+                    offset=offset,
+                    limit=limit,
+                    around_contestant_id=around_contestant_id,
+                    around=around_me,
+                )
             res: ContestStandings = self._map_contest_standings(
-                contest, contestant_in_standings,
+                contest, contestant_in_standings, offset, total, is_frozen,
             )
             return res
 
+    @log_calls
+    async def contest_standings_history(
+            self,
+            user_id: int,
+            contest_id: int,
+            top_k: int,
+            max_points: int,
+    ) -> ContestStandingsHistory:
+        async with self.uow:
+            await self.access_policy.can_user_view_contest_standing(
+                uow=self.uow, user_id=user_id, contest_id=contest_id, raise_if_none=True, )
+
+            contest: Contest = (
+                await self.uow.contest_repo.get_contest_by_id(contest_id=contest_id)
+            )
+
+            is_frozen: bool = await self._should_serve_frozen_standings(user_id=user_id, contest=contest, )
+            if is_frozen:
+                # Замороженным зрителям - лидеры и история на момент заморозки
+                top, _, _ = self._slice_standings(await self._get_frozen_standings(contest), limit=top_k, )
+                until = contest.freeze_at
+            else:
+                top, _, _ = await self._get_contestant_in_standings(contest_id=contest_id, limit=top_k, )
+                until = min(datetime.now(timezone.utc), contest.closed_at)
+
+            rows: Sequence[Tuple[int, datetime, int]] = (
+                await self.uow.contest_repo.get_downsampled_points_history(
+                    contest_id=contest_id,
+                    contestant_ids=[c.contestant_id for c in top],
+                    since=contest.started_at,
+                    until=until,
+                    max_points=max_points, )
+            )
+
+            res: ContestStandingsHistory = self._map_contest_standings_history(contest, top, rows, is_frozen, )
+            return res
+
+    async def _should_serve_frozen_standings(
+            self,
+            user_id: int,
+            contest: Contest,
+    ) -> bool:
+        # async with self.uow: -> Вызывается из методов, читающих таблицу
+        if not self._is_standings_frozen(contest):
+            return False
+
+        can_view_live = await self.access_policy.can_user_view_live_standings(
+            uow=self.uow, user_id=user_id, contest_id=contest.id, raise_if_none=False, )
+        return can_view_live is None
+
+    @staticmethod
+    def _is_standings_frozen(
+            contest: Contest,
+    ) -> bool:
+        current_time = datetime.now(timezone.utc)
+        return (
+                contest.freeze_at is not None
+                and contest.freeze_at <= current_time
+                and (contest.unfreeze_at is None or current_time < contest.unfreeze_at)
+        )
+
+    async def _get_frozen_standings(
+            self,
+            contest: Contest,
+    ) -> Sequence[ContestantInStandings]:
+        # async with self.uow: -> Вызывается из contest_standings(...)
+
+        snapshot = await self.uow.contest_repo.get_standings_snapshot(contest_id=contest.id, )
+        if snapshot is not None:
+            return ArrayContestantInStandings.model_validate_json(snapshot.body).body
+
+        # Таблица на момент заморозки по истории очков - сколько бы времени ни прошло до первого чтения
+        contestant_in_standings: Sequence[ContestantInStandings] = (
+            await self.uow.contest_repo.get_contestant_in_standings(contest_id=contest.id, as_of=contest.freeze_at, )
+        )
+        # Время строки истории - начало её транзакции: транзакция, начатая до заморозки, может закоммититься
+        # позже. Пока такие ещё возможны, таблица считается на каждое чтение и не сохраняется
+        frozen_for_s = (datetime.now(timezone.utc) - contest.freeze_at).total_seconds()
+        if frozen_for_s >= settings.STANDINGS_FROZEN_SNAPSHOT_GRACE_S:
+            await self.uow.contest_repo.create_standings_snapshot(
+                contest_id=contest.id,
+                frozen_at=contest.freeze_at,
+                body=ArrayContestantInStandings(body=list(contestant_in_standings)).model_dump_json(),
+            )
+        return contestant_in_standings
+
+    @log_calls
+    async def contest_standings_events(
+            self,
+            user_id: int,
+            contest_id: int,
+            heartbeat_interval_s: float,
+            max_lifetime_s: float,
+    ) -> AsyncIterator[ContestStandingsEvent]:
+        if self.standings_engine is None or self.standings_event_bus is None:
+            raise FeatureUnavailable("Standings stream requires standings engine and event bus")
+
+        # Здесь же проверяются права - до того, как клиенту уйдёт первый байт потока
+        snapshot: ContestStandings = await self.contest_standings(user_id=user_id, contest_id=contest_id, )
+
+        # Подписка - уже в генераторе: поток, который так и не начали читать, не оставит подписки
+        return self._iterate_standings_events(
+            snapshot, heartbeat_interval_s, max_lifetime_s,
+        )
+
+    async def _iterate_standings_events(
+            self,
+            snapshot: ContestStandings,
+            heartbeat_interval_s: float,
+            max_lifetime_s: float,
+    ) -> AsyncIterator[ContestStandingsEvent]:
+        # Без обращений к БД: поток живёт долго и не должен держать соединение из пула
+        contest_id = snapshot.contest_id
+        if snapshot.freeze_at is not None and not snapshot.is_frozen:
+            # Поток завершается в момент заморозки: после переподключения клиент получит замороженную таблицу
+            until_freeze_s = (snapshot.freeze_at - datetime.now(timezone.utc)).total_seconds()
+            if until_freeze_s > 0:
+                max_lifetime_s = min(max_lifetime_s, until_freeze_s)
+        deadline = time.monotonic() + max_lifetime_s
+
+        queue = await self.standings_event_bus.subscribe(contest_id=contest_id, )
+        try:
+            standings = snapshot.standings
+            if not snapshot.is_frozen and await self.standings_engine.is_ready(contest_id=contest_id, ):
+                # Таблица, прочитанная после подписки: изменения между проверкой прав и подпиской не теряются.
+                # Повторно применённая дельта безвредна: в ней абсолютные очки и места
+                standings = ArrayContestantInStandings(
+                    body=list(await self.standings_engine.get_standings(contest_id=contest_id, )),
+                )
+            yield ContestStandingsEvent(
+                event_type=ContestStandingsEventType.SNAPSHOT,
+                contest_id=contest_id,
+                standings=standings,
+            )
+
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=min(heartbeat_interval_s, remaining))
+                except asyncio.TimeoutError:
+                    yield ContestStandingsEvent(
+                        event_type=ContestStandingsEventType.HEARTBEAT,
+                        contest_id=contest_id,
+                    )
+                    continue
+
+                if snapshot.is_frozen:  # Изменения после заморозки клиенту не показываются
+                    continue
+
+                if event.event_type == ContestStandingsEventType.RESET:
+                    event = ContestStandingsEvent(
+                        event_type=ContestStandingsEventType.SNAPSHOT,
+                        contest_id=contest_id,
+                        seq=event.seq,
+                        standings=ArrayContestantInStandings(
+                            body=list(await self.standings_engine.get_standings(contest_id=contest_id, )),
+                        ),
+                    )
+                yield event
+        finally:
+            self.standings_event_bus.unsubscribe(contest_id=contest_id, queue=queue, )
+
+    async def _get_contestant_in_standings(
+            self,
+            contest_id: int,
+            offset: int = 0,
+            limit: int | None = None,
+            around_contestant_id: int | None = None,
+            around: int | None = None,
+    ) -> Tuple[Sequence[ContestantInStandings], int, int]:
+        """
+        Возвращает окно таблицы, его фактическое смещение и общее число участников.
+
+        Если задан `around_contestant_id`, окно - `around` позиций выше и ниже этого участника.
+        """
+        # async with self.uow: -> Вызывается из contest_standings(...)
+
+        is_ready = (
+                self.standings_engine is not None
+                and await self.standings_engine.is_ready(contest_id=contest_id, )
+        )
+        if self.standings_engine is not None and not is_ready:
+            # Холодный старт (или истёк срок жизни таблицы) - пересобираем таблицу из БД
+            await self._rebuild_standings_once(contest_id=contest_id, )
+            is_ready = await self.standings_engine.is_ready(contest_id=contest_id, )
+
+        if is_ready:
+            if around_contestant_id is not None:
+                position: int | None = await self.standings_engine.get_position(
+                    contest_id=contest_id, contestant_id=around_contestant_id, )
+                if position is not None:
+                    offset, limit = max(position - around, 0), 2 * around + 1
+
+            contestant_in_standings: Sequence[ContestantInStandings] = (
+                await self.standings_engine.get_standings(contest_id=contest_id, offset=offset, limit=limit, )
+            )
+            total: int = await self.standings_engine.count(contest_id=contest_id, )
+            return contestant_in_standings, offset, total
+
+        # Движка нет или таблица не собралась вовремя - отвечаем из БД
+        contestant_in_standings: Sequence[ContestantInStandings] = (
+            await self.uow.contest_repo.get_contestant_in_standings(contest_id=contest_id, )
+        )
+        return self._slice_standings(contestant_in_standings, offset, limit, around_contestant_id, around)
+
+    async def _rebuild_standings_once(
+            self,
+            contest_id: int,
+    ) -> None:
+        """
+        Пересобирает таблицу контеста в движке, не дублируя пересборку: в процессе её выполняет один запрос,
+        остальные ждут его; между процессами - тот, кто занял `claim_rebuild`, остальные ждут готовности
+        таблицы не дольше `_STANDINGS_REBUILD_WAIT_S`. Не дождавшийся запрос ответит из БД.
+        """
+        # async with self.uow: -> Вызывается из _get_contestant_in_standings(...)
+
+        pending = _standings_rebuilds.get(contest_id)
+        if pending is not None:
+            await asyncio.shield(pending)
+            return
+
+        pending = asyncio.get_running_loop().create_future()
+        _standings_rebuilds[contest_id] = pending
+        try:
+            if await self.standings_engine.claim_rebuild(contest_id=contest_id, ):
+                contestant_in_standings: Sequence[ContestantInStandings] = (
+                    await self.uow.contest_repo.get_contestant_in_standings(contest_id=contest_id, )
+                )
+                await self.standings_engine.rebuild(contest_id=contest_id, contestants=contestant_in_standings, )
+                return
+
+            # Таблицу пересобирает другой процесс
+            deadline = time.monotonic() + _STANDINGS_REBUILD_WAIT_S
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_STANDINGS_REBUILD_POLL_S)
+                if await self.standings_engine.is_ready(contest_id=contest_id, ):
+                    return
+        finally:
+            del _standings_rebuilds[contest_id]
+            # Ожидающие проверят готовность таблицы сами, даже если пересборка не удалась
+            pending.set_result(None)
+
+    @staticmethod
+    def _slice_standings(
+            contestant_in_standings: Sequence[ContestantInStandings],
+            offset: int = 0,
+            limit: int | None = None,
+            around_contestant_id: int | None = None,
+            around: int | None = None,
+    ) -> Tuple[Sequence[ContestantInStandings], int, int]:
+        if around_contestant_id is not None:
+            position = next(
+                (i for i, c in enumerate(contestant_in_standings) if c.contestant_id == around_contestant_id), None,
+            )
+            if position is not None:
+                offset, limit = max(position - around, 0), 2 * around + 1
+
+        end = None if limit is None else offset + limit
+        return contestant_in_standings[offset:end], offset, len(contestant_in_standings)
+
     @log_calls
     async def create_full_contest(
             self,
@@ -132,7 +488,7 @@ class ContestService(IContestService):
             # todo: а почему не  async with self.uow as session ?
             #       и далее: await session.user_repo.get_user_by_id(user_id=user_id)
 
-            user: User = await self.uow.user_repo.get_user_by_id(user_id=user_id)
+            user: Principal = await self.uow.user_repo.get_principal_by_id(user_id=user_id)
             contest_id = user.domain_number
 
             await self.access_policy.can_user_view_contest(
@@ -260,6 +616,9 @@ class ContestService(IContestService):
     def _map_contest_standings(
             contest: Contest,
             contestant_in_standings: Sequence[ContestantInStandings],
+            offset: int = 0,
+            total: int | None = None,
+            is_frozen: bool = False,
     ) -> ContestStandings:
         res = ContestStandings(
             contest_id=contest.id,
@@ -269,6 +628,37 @@ class ContestService(IContestService):
             standings=ArrayContestantInStandings(
                 body=[i for i in contestant_in_standings],
             ),
+            offset=offset,
+            total=total,
+            freeze_at=contest.freeze_at,
+            is_frozen=is_frozen,
+        )
+        return res
+
+    @staticmethod
+    def _map_contest_standings_history(
+            contest: Contest,
+            top: Sequence[ContestantInStandings],
+            rows: Sequence[Tuple[int, datetime, int]],
+            is_frozen: bool,
+    ) -> ContestStandingsHistory:
+        history_by_contestant: dict[int, list[ContestantPointsAt]] = {}
+        for contestant_id, at, points in rows:
+            history_by_contestant.setdefault(contestant_id, []).append(ContestantPointsAt(at=at, points=points, ))
+
+        res = ContestStandingsHistory(
+            contest_id=contest.id,
+            started_at=contest.started_at,
+            closed_at=contest.closed_at,
+            is_frozen=is_frozen,
+            series=[
+                ContestantPointsHistory(
+                    contestant_id=c.contestant_id,
+                    name=c.name,
+                    rank=c.rank,
+                    history=history_by_contestant.get(c.contestant_id, []),
+                ) for c in top
+            ],
         )
         return res
 
@@ -297,6 +687,8 @@ class ContestService(IContestService):
             closed_at=contest.closed_at,
             rule_type=contest.rule_type,
             flag_user_can_have_negative_points=contest.flag_user_can_have_negative_points,
+            freeze_at=contest.freeze_at,
+            unfreeze_at=contest.unfreeze_at,
         )
         return res
 
@@ -15,6 +15,7 @@ from backend.core.schemas.problem_card import (
     ProblemCardWithProblemCreateRequest,
     ProblemCardWithProblemUpdateRequest,
 )
+from backend.core.services.access_policies.context import get_policy_context
 from backend.core.services.access_policies.problem_card import ProblemCardAccessPolicy
 from backend.core.services.interfaces.problem_card import IProblemCardService
 from backend.core.utilities.loggers.log_decorator import log_calls
@@ -39,11 +40,12 @@ class ProblemCardService(IProblemCardService):
             await self.access_policy.can_user_edit_quiz_field(
                 uow=self.uow, user_id=user_id, quiz_field_id=data.quiz_field_id, raise_if_none=True, )
 
-            quiz_field: QuizField = await self.uow.quiz_field_repo.get_quiz_field_by_id(
+            # Поле уже прочитано проверкой доступа - берём его из контекста без запроса к БД
+            quiz_field: QuizField = await get_policy_context(self.uow).get_quiz_field(
                 quiz_field_id=data.quiz_field_id, )
 
             problem_card, _ = await self.uow.problem_card_repo.create_problem_card_with_problem(
-                **data.model_dump(),
+                **data.model_dump(), contest_id=quiz_field.contest_id,
             )
             res = ProblemCardId(problem_card_id=problem_card.id, )
             return res
@@ -58,8 +60,15 @@ class ProblemCardService(IProblemCardService):
             await self.access_policy.can_user_edit_problem_card(
                 uow=self.uow, user_id=user_id, problem_card_id=data.problem_card_id, raise_if_none=True, )
 
-            problem_card: ProblemCard = await self.uow.problem_card_repo.update_problem_card_with_problem(
-                **data.model_dump(),
+            # Карточка и её поле уже прочитаны проверкой доступа - берём их из контекста без запросов к БД
+            policy_context = get_policy_context(self.uow)
+            problem_card: ProblemCard = await policy_context.get_problem_card(
+                problem_card_id=data.problem_card_id, )
+            quiz_field: QuizField = await policy_context.get_quiz_field(
+                quiz_field_id=problem_card.quiz_field_id, )
+
+            problem_card = await self.uow.problem_card_repo.update_problem_card_with_problem(
+                **data.model_dump(), contest_id=quiz_field.contest_id,
             )
             res = ProblemCardId(problem_card_id=problem_card.id, )
             return res
@@ -13,6 +13,11 @@ from backend.core.models import (
     SelectedProblem,
 )
 from backend.core.models.selected_problem import SelectedProblemStatusType
+from backend.core.optimazers.cache.lazy_cache import (
+    DEFAULT_NEGATIVE_CACHE_TTLS,
+    get_lazy_cache,
+)
+from backend.core.optimazers.cache.tags import contest_tag
 from backend.core.repository.crud.uow import UnitOfWork
 from backend.core.schemas.problem import ProblemId
 from backend.core.schemas.problem_card import (
@@ -27,6 +32,7 @@ from backend.core.schemas.quiz_field import (
 )
 from backend.core.services.access_policies.quiz_field import QuizFieldAccessPolicy
 from backend.core.services.interfaces.quiz_field import IQuizFieldService
+from backend.core.utilities.exceptions.database import EntityDoesNotExist
 from backend.core.utilities.loggers.log_decorator import log_calls
 
 MAPPING_SP2PC = {
@@ -102,16 +108,35 @@ class QuizFieldService(IQuizFieldService):
             await self.access_policy.can_user_manage_contest(
                 uow=self.uow, user_id=user_id, contest_id=contest_id, raise_if_none=True, )
 
-            quiz_field: QuizField = await self.uow.quiz_field_repo.get_quiz_field_by_contest_id(
-                contest_id=contest_id, )
+            res = await self._load_quiz_field_info_for_editor(contest_id=contest_id, )
+            return res
 
-            problem_cards_with_problem: Sequence[Row[Tuple[ProblemCard, Problem]]] = (
-                await self.uow.problem_card_repo.get_tuple_problem_cards_with_problem_by_quiz_field_id(
-                    quiz_field_id=quiz_field.id, )
-            )
+    @get_lazy_cache().decorator_fabric(
+        model_class=QuizFieldInfoForEditor,
+        get_from_cache_not_later_than_s=5,
+        result_cached_time_s=10 * 60,
+        tags=lambda contest_id: [contest_tag(contest_id)],
+        negative_cache_ttls=DEFAULT_NEGATIVE_CACHE_TTLS,
+    )
+    async def _load_quiz_field_info_for_editor(
+            self,
+            contest_id: int,
+    ) -> QuizFieldInfoForEditor:
+        """
+        Поле контеста с карточками, без проверки прав. Кешируется до первого изменения данных контеста.
+        """
+        quiz_field: QuizField | None = await self.uow.quiz_field_repo.get_quiz_field_by_contest_id(
+            contest_id=contest_id, )
+        if quiz_field is None:
+            raise EntityDoesNotExist(f"Quiz field of contest {contest_id} does not exist")
+
+        problem_cards_with_problem: Sequence[Row[Tuple[ProblemCard, Problem]]] = (
+            await self.uow.problem_card_repo.get_tuple_problem_cards_with_problem_by_quiz_field_id(
+                quiz_field_id=quiz_field.id, )
+        )
 
-            res = self._map_quiz_field_info_editor(quiz_field, problem_cards_with_problem, )
-            return res
+        res = self._map_quiz_field_info_editor(quiz_field, problem_cards_with_problem, )
+        return res
 
     @log_calls
     async def update_quiz_field(
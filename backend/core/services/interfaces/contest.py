@@ -6,7 +6,10 @@
 """
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Protocol
+from typing import (
+    AsyncIterator,
+    Protocol,
+)
 
 from backend.core.schemas.contest import (
     ContestId,
@@ -15,6 +18,8 @@ from backend.core.schemas.contest import (
     ArrayContestShortInfo,
     ContestStandings,
     ContestSubmissions, ContestCreateRequest, ContestUpdateRequest,
+    ContestStandingsEvent,
+    ContestStandingsHistory,
 )
 from backend.core.schemas.contestant import ContestantId, ContestantInCreate
 
@@ -45,16 +50,63 @@ class IContestService(Protocol):
             self,
             user_id: int,
             contest_id: int,
+            offset: int = 0,
+            limit: int | None = None,
+            around_me: int | None = None,
     ) -> ContestStandings:
         """
-        Получить турнирную таблицу (статистику) по контесту.
+        Получить турнирную таблицу (статистику) по контесту или её окно.
 
         :param user_id: Идентификатор пользователя, совершающего операцию.
         :param contest_id: Идентификатор контеста.
+        :param offset: С какой позиции (с нуля) отдавать таблицу.
+        :param limit: Сколько участников отдать (по умолчанию - до конца таблицы).
+        :param around_me: Если задан и пользователь - участник контеста, отдаются `around_me` позиций
+            выше и ниже него (offset и limit игнорируются).
         :return: Объект с турнирной таблицей контеста.
         """
         ...
 
+    async def contest_standings_events(
+            self,
+            user_id: int,
+            contest_id: int,
+            heartbeat_interval_s: float,
+            max_lifetime_s: float,
+    ) -> AsyncIterator[ContestStandingsEvent]:
+        """
+        Подписаться на изменения турнирной таблицы контеста.
+
+        Права проверяются при вызове. Поток начинается с SNAPSHOT (таблица целиком), затем идут DELTA
+        (изменившиеся участники) и повторные SNAPSHOT, если таблица была пересобрана.
+        При отсутствии изменений раз в `heartbeat_interval_s` отдаётся HEARTBEAT.
+
+        :param user_id: Идентификатор пользователя, совершающего операцию.
+        :param contest_id: Идентификатор контеста.
+        :param heartbeat_interval_s: Интервал keep-alive событий.
+        :param max_lifetime_s: Через сколько секунд поток завершается (клиент должен переподключиться).
+        :return: Асинхронный итератор событий таблицы.
+        """
+        ...
+
+    async def contest_standings_history(
+            self,
+            user_id: int,
+            contest_id: int,
+            top_k: int,
+            max_points: int,
+    ) -> ContestStandingsHistory:
+        """
+        Получить историю очков лидеров контеста для графика.
+
+        :param user_id: Идентификатор пользователя, совершающего операцию.
+        :param contest_id: Идентификатор контеста.
+        :param top_k: Для скольких лидеров таблицы отдать историю.
+        :param max_points: Максимум точек в истории одного участника.
+        :return: Объект с историей очков лидеров.
+        """
+        ...
+
     async def create_full_contest(
             self,
             user_id: int,
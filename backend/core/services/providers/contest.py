@@ -6,6 +6,10 @@ from backend.core.repository.crud.uow import (
 )
 from backend.core.services.domain.contest import ContestService
 from backend.core.services.interfaces.contest import IContestService
+from backend.handlers.standings.impl.redis_zset.provider import (
+    get_standings_engine,
+    get_standings_event_bus,
+)
 
 
 def get_contest_service(
@@ -13,4 +17,6 @@ def get_contest_service(
 ) -> IContestService:
     return ContestService(
         uow=uow,
+        standings_engine=get_standings_engine(),
+        standings_event_bus=get_standings_event_bus(),
     )
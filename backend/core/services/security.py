@@ -1,12 +1,22 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from datetime import (
     datetime,
     timedelta,
 )
+from typing import Optional
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from backend.configuration.settings import settings
+from backend.core.optimazers.cache.memory_lru import MemoryLRUCache
 from backend.core.utilities.loggers.log_decorator import log_calls
 
 SECRET_KEY = settings.SECRET_KEY
@@ -16,6 +26,9 @@ REFRESH_TOKEN_EXPIRE_MINUTES = settings.REFRESH_TOKEN_EXPIRE_MINUTES
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Проверенные токены -> их claims. Запись живёт до `exp` токена, но не дольше VERIFIED_TOKEN_CACHE_TTL_S
+_verified_tokens = MemoryLRUCache(max_entries=settings.VERIFIED_TOKEN_CACHE_MAX_ENTRIES)
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -25,6 +38,44 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+# bcrypt занимает десятки миллисекунд CPU - в event loop'е это останавливает все остальные запросы воркера
+_password_hashing_executor: Optional[Executor] = None
+
+
+def _get_password_hashing_executor() -> Executor:
+    global _password_hashing_executor
+
+    if _password_hashing_executor is None:
+        if settings.PASSWORD_HASHING_EXECUTOR == "process":
+            # spawn, а не fork: к моменту первого входа у процесса уже есть потоки event loop'а и драйверов
+            _password_hashing_executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:  # bcrypt отпускает GIL на время хеширования, поэтому потоки работают параллельно
+            _password_hashing_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                thread_name_prefix="password-hashing",
+            )
+    return _password_hashing_executor
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    `hash_password` в пуле `PASSWORD_HASHING_EXECUTOR` - не блокирует event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_hashing_executor(), hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """
+    `verify_password` в пуле `PASSWORD_HASHING_EXECUTOR` - не блокирует event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_hashing_executor(), verify_password, plain, hashed)
+
+
 @log_calls
 def create_access_token(data: dict) -> str:
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -39,6 +90,29 @@ def create_refresh_token(data: dict) -> str:
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-@log_calls
 def decode_token(token: str):
-    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    """
+    Проверяет подпись и срок токена и возвращает его claims.
+
+    Результат проверки кешируется в процессе до `exp` токена: повторные запросы с тем же токеном
+    не проверяют подпись и не разбирают JSON заново. Вызывается на каждом запросе, поэтому без `log_calls`.
+    Отзыв токена кеш не отменяет - чёрный список проверяется до `decode_token` (см. `get_user`).
+    """
+    claims = _verified_tokens.get(token)
+    if claims is not None:
+        return dict(claims)
+
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+    expires_at = claims.get("exp")
+    if isinstance(expires_at, (int, float)):
+        ttl_s = min(expires_at - time.time(), settings.VERIFIED_TOKEN_CACHE_TTL_S)
+        _verified_tokens.set(token, dict(claims), ttl_s=ttl_s)
+    return claims
+
+
+def forget_verified_token(token: str) -> None:
+    """
+    Удаляет токен из кеша проверенных токенов этого процесса - вызывается при отзыве токена.
+    """
+    _verified_tokens.delete(token)
@@ -36,6 +36,10 @@ def async_http_exception_mapper(
                 # Выполнение оборачиваемой асинхронной функции
                 return await func(*args, **kwargs)
 
+            except HTTPException:
+                # Ответ уже сформирован маршрутом (например, с заголовком Retry-After) - не превращаем его в 520
+                raise
+
             except Exception as e:
                 # Проверка типа исключения на соответствие ожидаемым
                 for exc_type, (status, message) in mapping.items():
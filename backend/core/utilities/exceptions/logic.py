@@ -8,3 +8,9 @@ class PossibleLimitOverflow(LogicException):
     """
 
     """
+
+
+class FeatureUnavailable(LogicException):
+    """
+    Возможность недоступна в текущей конфигурации (например, не настроена шина событий турнирной таблицы)
+    """
@@ -0,0 +1,134 @@
+import asyncio
+import json
+from abc import (
+    ABC,
+    abstractmethod,
+)
+import time
+import uuid
+from typing import (
+    Callable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from backend.core.utilities.loggers.logger import logger
+from backend.handlers.cache_invalidation.interface import ICacheInvalidationBus
+
+
+class BaseCacheInvalidationBus(ICacheInvalidationBus, ABC):
+    """
+    Общая часть шин инвалидации: подписчики, формат сообщений, переподключение и контроль свежести.
+
+    Гарантия ограниченной устаревшести: шина считается свежей, только пока слушатель подписан
+    и получал что-либо (сообщение или ответ на heartbeat) не позже `max_staleness_s` назад.
+    Если ответа нет дольше - соединение считается мёртвым и переоткрывается. После каждого подключения
+    подписчики получают `on_flush`, так как сообщения за время без подписки потеряны.
+
+    Наследник реализует транспорт: `_listen` (держит подписку, вызывает `_on_connected`, `_touch`
+    и `_on_message`, падает при обрыве) и `_send`. Шину без них нельзя создать.
+
+    Args:
+        max_staleness_s (float): Допустимое время без вестей от транспорта.
+        reconnect_delay_s (float): Пауза перед переподключением.
+        clock (Callable[[], float]): Источник монотонного времени в секундах.
+    """
+
+    def __init__(
+            self,
+            max_staleness_s: float,
+            reconnect_delay_s: float = 1.0,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_staleness_s = max_staleness_s
+        self._heartbeat_interval_s = max_staleness_s / 3
+        self._reconnect_delay_s = reconnect_delay_s
+        self._clock = clock
+
+        # Свои сообщения процесс не обрабатывает: локальные кеши он уже сбросил сам
+        self._origin = uuid.uuid4().hex
+        self._subscribers: List[Tuple[Callable[[Tuple[str, ...]], None], Callable[[], None]]] = []
+        self._listener_task: Optional[asyncio.Task] = None
+        self._connected = False
+        self._last_seen_at = float("-inf")
+
+    def subscribe(
+            self,
+            on_invalidate: Callable[[Tuple[str, ...]], None],
+            on_flush: Callable[[], None],
+    ) -> None:
+        self._subscribers.append((on_invalidate, on_flush))
+
+    async def publish(
+            self,
+            tags: Tuple[str, ...],
+    ) -> None:
+        if not tags:
+            return
+        await self._send(json.dumps({"origin": self._origin, "tags": list(tags)}))
+
+    def is_fresh(self) -> bool:
+        self._ensure_listening()
+        return self._connected and self._clock() - self._last_seen_at <= self._max_staleness_s
+
+    @abstractmethod
+    async def _listen(self) -> None:
+        ...
+
+    @abstractmethod
+    async def _send(
+            self,
+            payload: str,
+    ) -> None:
+        ...
+
+    def _ensure_listening(self) -> None:
+        if self._listener_task is not None and not self._listener_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # Вне event loop слушать некому - кеши пока работают без L1
+            return
+        self._listener_task = loop.create_task(self._listen_forever())
+
+    async def _listen_forever(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                self._connected = False
+                raise
+            except Exception as e:
+                logger.exception(f"Cache invalidation listener failed, reconnecting: {e}")
+            self._connected = False
+            await asyncio.sleep(self._reconnect_delay_s)
+
+    def _on_connected(self) -> None:
+        for _, on_flush in self._subscribers:
+            on_flush()
+        self._connected = True
+        self._touch()
+
+    def _touch(self) -> None:
+        self._last_seen_at = self._clock()
+
+    def _is_silent_too_long(self) -> bool:
+        return self._clock() - self._last_seen_at > self._max_staleness_s
+
+    def _on_message(
+            self,
+            payload: str | bytes,
+    ) -> None:
+        self._touch()
+        try:
+            message = json.loads(payload)
+            origin, tags = message["origin"], tuple(message["tags"])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Skip malformed cache invalidation message: {e}")
+            return
+
+        if origin == self._origin:
+            return
+        for on_invalidate, _ in self._subscribers:
+            on_invalidate(tags)
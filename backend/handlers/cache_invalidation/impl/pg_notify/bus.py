@@ -0,0 +1,54 @@
+import asyncio
+from typing import Optional
+
+import asyncpg
+
+from backend.handlers.cache_invalidation.impl.base import BaseCacheInvalidationBus
+
+
+class PostgresCacheInvalidationBus(BaseCacheInvalidationBus):
+    """
+    Шина инвалидации на Postgres LISTEN/NOTIFY - для развёртываний без общего Redis.
+
+    Слушает на отдельном соединении; heartbeat - `SELECT 1` на нём же. Публикует через второе соединение,
+    чтобы не мешать слушателю. Полезная нагрузка NOTIFY ограничена 8000 байтами - для тегов этого достаточно.
+    """
+
+    def __init__(
+            self,
+            dsn: str,
+            max_staleness_s: float,
+            channel: str = 'cache_invalidation',
+            reconnect_delay_s: float = 1.0,
+    ) -> None:
+        super().__init__(max_staleness_s=max_staleness_s, reconnect_delay_s=reconnect_delay_s, )
+        self._dsn = dsn
+        self._channel = channel
+
+        self._publish_connection: Optional[asyncpg.Connection] = None
+        self._publish_lock = asyncio.Lock()
+
+    async def _send(
+            self,
+            payload: str,
+    ) -> None:
+        async with self._publish_lock:
+            if self._publish_connection is None or self._publish_connection.is_closed():
+                self._publish_connection = await asyncpg.connect(self._dsn)
+            await self._publish_connection.execute("SELECT pg_notify($1, $2)", self._channel, payload)
+
+    async def _listen(self) -> None:
+        connection: asyncpg.Connection = await asyncpg.connect(self._dsn)
+        try:
+            await connection.add_listener(
+                self._channel,
+                lambda _connection, _pid, _channel, payload: self._on_message(payload),
+            )
+            self._on_connected()
+
+            while True:
+                await asyncio.sleep(self._heartbeat_interval_s)
+                await asyncio.wait_for(connection.execute("SELECT 1"), timeout=self._max_staleness_s)
+                self._touch()
+        finally:
+            connection.terminate()
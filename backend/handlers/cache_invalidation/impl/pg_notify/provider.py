@@ -0,0 +1,24 @@
+from typing import Dict
+
+from backend.configuration.settings import settings
+from backend.handlers.cache_invalidation.impl.pg_notify.bus import PostgresCacheInvalidationBus
+from backend.handlers.cache_invalidation.interface import ICacheInvalidationBus
+
+BASE_DSN = settings.MAIN_SYNC_DATABASE_URI
+
+# Хранилище инстансов по DSN
+_cache_invalidation_bus_instances: Dict[str, PostgresCacheInvalidationBus] = {}
+
+
+def get_postgres_cache_invalidation_bus(
+        dsn: str = BASE_DSN,
+) -> ICacheInvalidationBus:
+    if dsn in _cache_invalidation_bus_instances:
+        return _cache_invalidation_bus_instances[dsn]
+
+    instance = PostgresCacheInvalidationBus(
+        dsn=dsn,
+        max_staleness_s=settings.CACHE_INVALIDATION_MAX_STALENESS_S,
+    )
+    _cache_invalidation_bus_instances[dsn] = instance
+    return instance
@@ -0,0 +1,48 @@
+from redis.asyncio import Redis
+
+from backend.handlers.cache_invalidation.impl.base import BaseCacheInvalidationBus
+
+
+class RedisCacheInvalidationBus(BaseCacheInvalidationBus):
+    """
+    Шина инвалидации на Redis Pub/Sub. Heartbeat - PING в режиме подписки, ответ приходит сообщением `pong`.
+    """
+
+    def __init__(
+            self,
+            redis_client: Redis,
+            max_staleness_s: float,
+            channel: str = 'cache_invalidation',
+            reconnect_delay_s: float = 1.0,
+    ) -> None:
+        super().__init__(max_staleness_s=max_staleness_s, reconnect_delay_s=reconnect_delay_s, )
+        self._redis = redis_client
+        self._channel = channel
+
+    async def _send(
+            self,
+            payload: str,
+    ) -> None:
+        await self._redis.publish(self._channel, payload)
+
+    async def _listen(self) -> None:
+        async with self._redis.pubsub() as pubsub:
+            await pubsub.subscribe(self._channel)
+            self._on_connected()
+
+            next_ping_at = self._clock()
+            while True:
+                if self._clock() >= next_ping_at:
+                    await pubsub.ping()
+                    next_ping_at = self._clock() + self._heartbeat_interval_s
+
+                message = await pubsub.get_message(timeout=self._heartbeat_interval_s)
+                if message is None:
+                    if self._is_silent_too_long():
+                        raise ConnectionError("No pong from Redis within the staleness bound")
+                    continue
+
+                if message["type"] == "message":
+                    self._on_message(message["data"])
+                else:  # pong, подтверждение подписки
+                    self._touch()
@@ -0,0 +1,39 @@
+from typing import Dict, Tuple
+
+import redis.asyncio as redis
+
+from backend.configuration.settings import settings
+from backend.handlers.cache_invalidation.impl.redis_pubsub.bus import RedisCacheInvalidationBus
+from backend.handlers.cache_invalidation.interface import ICacheInvalidationBus
+
+BASE_HOST = settings.REDIS_KV_SIMPLE_CACHE_HOST
+BASE_PORT = settings.REDIS_KV_SIMPLE_CACHE_PORT
+BASE_DB = settings.REDIS_KV_SIMPLE_CACHE_DB
+
+# Хранилище инстансов по (host, port, db)
+_cache_invalidation_bus_instances: Dict[Tuple[str, int, int], RedisCacheInvalidationBus] = {}
+
+
+def get_redis_cache_invalidation_bus(
+        host: str = BASE_HOST,
+        port: int = BASE_PORT,
+        db: int = BASE_DB,
+) -> ICacheInvalidationBus:
+    key = (host, port, db)
+
+    if key in _cache_invalidation_bus_instances:
+        return _cache_invalidation_bus_instances[key]
+
+    redis_client = redis.Redis(
+        host=host,
+        port=port,
+        db=db,
+        decode_responses=True,
+    )
+
+    instance = RedisCacheInvalidationBus(
+        redis_client=redis_client,
+        max_staleness_s=settings.CACHE_INVALIDATION_MAX_STALENESS_S,
+    )
+    _cache_invalidation_bus_instances[key] = instance
+    return instance
@@ -0,0 +1,41 @@
+from typing import (
+    Callable,
+    Protocol,
+    runtime_checkable,
+    Tuple,
+)
+
+
+@runtime_checkable
+class ICacheInvalidationBus(Protocol):
+    """
+    Шина инвалидации in-process кешей между процессами (воркерами и узлами).
+
+    Процесс, закоммитивший изменение, публикует теги затронутых сущностей; остальные процессы
+    передают их своим подписчикам. Доставка не гарантирована, поэтому шина сообщает, можно ли ей сейчас
+    доверять (`is_fresh`), а после переподключения просит подписчиков сбросить всё (`on_flush`).
+    """
+
+    def subscribe(
+            self,
+            on_invalidate: Callable[[Tuple[str, ...]], None],
+            on_flush: Callable[[], None],
+    ) -> None:
+        """
+        Регистрирует обработчики: `on_invalidate` - теги, инвалидированные другим процессом;
+        `on_flush` - события могли быть потеряны, нужно сбросить все записи.
+        """
+        ...
+
+    async def publish(
+            self,
+            tags: Tuple[str, ...],
+    ) -> None:
+        ...
+
+    def is_fresh(self) -> bool:
+        """
+        True, если процесс подписан на шину и слышал от неё не позже допустимой задержки.
+        Пока это не так, in-process кеши не должны отдавать записи. При первом вызове запускает слушателя.
+        """
+        ...
@@ -0,0 +1,18 @@
+from backend.configuration.settings import settings
+from backend.handlers.cache_invalidation.impl.pg_notify.provider import get_postgres_cache_invalidation_bus
+from backend.handlers.cache_invalidation.impl.redis_pubsub.provider import get_redis_cache_invalidation_bus
+from backend.handlers.cache_invalidation.interface import ICacheInvalidationBus
+
+
+def get_cache_invalidation_bus() -> ICacheInvalidationBus | None:
+    """
+    Шина инвалидации с транспортом из `settings.CACHE_INVALIDATION_TRANSPORT` ("redis" или "postgres").
+
+    С `KV_SIMPLE_CACHE_BACKEND=memory` приложение работает в один процесс - рассылать инвалидации некому,
+    и шины нет.
+    """
+    if settings.KV_SIMPLE_CACHE_BACKEND == "memory":
+        return None
+    if settings.CACHE_INVALIDATION_TRANSPORT == "postgres":
+        return get_postgres_cache_invalidation_bus()
+    return get_redis_cache_invalidation_bus()
@@ -0,0 +1,61 @@
+import time
+
+from redis.asyncio import Redis
+
+from backend.core.utilities.loggers.log_decorator import log_calls
+from backend.handlers.contest_version.interface import IContestVersionHandler
+
+
+class RedisContestVersionHandler(IContestVersionHandler):
+    """
+    Счётчик версий контеста на Redis (`INCR` по ключу `<prefix>:<contest_id>`).
+
+    Отсутствующий ключ (первое обращение, перезапуск Redis без персистентности) инициализируется текущим
+    временем в микросекундах, а не нулём: так новая версия гарантированно больше любой выданной ранее,
+    и клиент с сохранённым ETag не получит ложный 304.
+    """
+
+    def __init__(
+            self,
+            redis_client: Redis,
+            key_prefix: str = 'contest_version',
+    ) -> None:
+        self._redis = redis_client
+        self._key_prefix = key_prefix
+
+    def _key(self, contest_id: int) -> str:
+        return f"{self._key_prefix}:{contest_id}"
+
+    @staticmethod
+    def _initial_version() -> int:
+        return time.time_ns() // 1000
+
+    @log_calls
+    async def get_version(
+            self,
+            contest_id: int,
+    ) -> int:
+        key = self._key(contest_id)
+
+        version = await self._redis.get(key)
+        if version is not None:
+            return int(version)
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, self._initial_version(), nx=True)
+            pipe.get(key)
+            _, version = await pipe.execute()
+        return int(version)
+
+    @log_calls
+    async def bump_version(
+            self,
+            contest_id: int,
+    ) -> int:
+        key = self._key(contest_id)
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, self._initial_version(), nx=True)
+            pipe.incr(key)
+            _, version = await pipe.execute()
+        return int(version)
@@ -0,0 +1,38 @@
+from typing import Dict, Tuple
+
+import redis.asyncio as redis
+
+from backend.configuration.settings import settings
+from backend.handlers.contest_version.impl.redis_counter.counter import RedisContestVersionHandler
+from backend.handlers.contest_version.interface import IContestVersionHandler
+
+BASE_HOST = settings.REDIS_KV_SIMPLE_CACHE_HOST
+BASE_PORT = settings.REDIS_KV_SIMPLE_CACHE_PORT
+BASE_DB = settings.REDIS_KV_SIMPLE_CACHE_DB
+
+# Хранилище инстансов по (host, port, db)
+_contest_version_handler_instances: Dict[Tuple[str, int, int], RedisContestVersionHandler] = {}
+
+
+def get_contest_version_handler(
+        host: str = BASE_HOST,
+        port: int = BASE_PORT,
+        db: int = BASE_DB,
+) -> IContestVersionHandler:
+    key = (host, port, db)
+
+    if key in _contest_version_handler_instances:
+        return _contest_version_handler_instances[key]
+
+    redis_client = redis.Redis(
+        host=host,
+        port=port,
+        db=db,
+        decode_responses=True,
+    )
+
+    instance = RedisContestVersionHandler(
+        redis_client=redis_client,
+    )
+    _contest_version_handler_instances[key] = instance
+    return instance
@@ -0,0 +1,29 @@
+from typing import Protocol
+
+
+class IContestVersionHandler(Protocol):
+    """
+    Протокол счётчика версий контеста.
+
+    Версия монотонно растёт при каждом зафиксированном изменении данных контеста (посылки, покупки задач,
+    правки поля и участников) и используется для условных GET-запросов: пока версия не изменилась,
+    ответы по контесту совпадают с уже отданными клиенту.
+    """
+
+    async def get_version(
+            self,
+            contest_id: int,
+    ) -> int:
+        """
+        Возвращает текущую версию контеста.
+        """
+        ...
+
+    async def bump_version(
+            self,
+            contest_id: int,
+    ) -> int:
+        """
+        Увеличивает версию контеста и возвращает новое значение.
+        """
+        ...
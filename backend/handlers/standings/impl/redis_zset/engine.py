@@ -0,0 +1,262 @@
+from typing import (
+    Sequence,
+    List,
+    Tuple,
+)
+
+from redis.asyncio import Redis
+
+from backend.core.schemas.contest import (
+    ContestantInStandings,
+    ArrayContestantInStandings,
+    ContestStandingsEvent,
+    ContestStandingsEventType,
+)
+from backend.core.utilities.loggers.log_decorator import log_calls
+from backend.handlers.standings.interface import IStandingsEngine
+
+# Обновление участника, только если его версия не старее записанной. Та же версия - те же очки
+# (меняется разве что имя), поэтому повторное применение безопасно.
+# KEYS: points, names, versions, seq; ARGV: участник, очки, имя, версия.
+# Возвращает {прежние очки или nil, seq} или nil, если обновление устарело
+_UPDATE_CONTESTANT_SCRIPT = """
+local current = redis.call('HGET', KEYS[3], ARGV[1])
+if current and tonumber(current) > tonumber(ARGV[4]) then
+    return false
+end
+local old_points = redis.call('ZSCORE', KEYS[1], ARGV[1])
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[3])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[4])
+local seq = redis.call('INCR', KEYS[4])
+return {old_points, seq}
+"""
+
+
+class RedisStandingsEngine(IStandingsEngine):
+    """
+    Движок турнирной таблицы на Redis sorted set.
+
+    Для каждого контеста хранятся:
+        - `<prefix>:<contest_id>:points` — sorted set: contestant_id -> очки;
+        - `<prefix>:<contest_id>:names` — hash: contestant_id -> имя участника;
+        - `<prefix>:<contest_id>:ready` — флаг собранной таблицы. Живёт `ready_ttl_s` секунд, после чего
+          таблица пересобирается из БД. Так исправляются возможные расхождения (например, обновление,
+          пришедшее во время пересборки);
+        - `<prefix>:<contest_id>:seq` — счётчик изменений таблицы;
+        - `<prefix>:<contest_id>:versions` — hash: contestant_id -> версия последнего применённого обновления.
+          Хуки после коммита двух транзакций одного участника могут выполниться не в порядке коммитов:
+          обновление с версией старее записанной отбрасывается. Пересборка версии не сбрасывает;
+        - `<prefix>:<contest_id>:rebuilding` — метка процесса, который сейчас пересобирает таблицу
+          (см. `claim_rebuild`). Живёт не дольше `rebuild_claim_ttl_s` и снимается пересборкой.
+
+    Каждое изменение публикуется в канал `<prefix>:<contest_id>:events` (см. `ContestStandingsEvent`):
+    обновление участника — как DELTA со всеми участниками, чьё место могло сдвинуться, пересборка — как RESET.
+
+    Место считается как в `rank() OVER (ORDER BY points DESC)`: 1 + число участников со строго большими очками.
+    """
+
+    def __init__(
+            self,
+            redis_client: Redis,
+            ready_ttl_s: int,
+            rebuild_claim_ttl_s: int = 10,
+            key_prefix: str = 'standings',
+    ) -> None:
+        self._redis = redis_client
+        self._ready_ttl_s = ready_ttl_s
+        self._rebuild_claim_ttl_s = rebuild_claim_ttl_s
+        self._key_prefix = key_prefix
+        self._update_contestant_script = redis_client.register_script(_UPDATE_CONTESTANT_SCRIPT)
+
+    def _points_key(self, contest_id: int) -> str:
+        return f"{self._key_prefix}:{contest_id}:points"
+
+    def _names_key(self, contest_id: int) -> str:
+        return f"{self._key_prefix}:{contest_id}:names"
+
+    def _ready_key(self, contest_id: int) -> str:
+        return f"{self._key_prefix}:{contest_id}:ready"
+
+    def _seq_key(self, contest_id: int) -> str:
+        return f"{self._key_prefix}:{contest_id}:seq"
+
+    def _versions_key(self, contest_id: int) -> str:
+        return f"{self._key_prefix}:{contest_id}:versions"
+
+    def _rebuilding_key(self, contest_id: int) -> str:
+        return f"{self._key_prefix}:{contest_id}:rebuilding"
+
+    def _events_channel(self, contest_id: int) -> str:
+        return f"{self._key_prefix}:{contest_id}:events"
+
+    @log_calls
+    async def is_ready(
+            self,
+            contest_id: int,
+    ) -> bool:
+        return bool(await self._redis.exists(self._ready_key(contest_id)))
+
+    @log_calls
+    async def claim_rebuild(
+            self,
+            contest_id: int,
+    ) -> bool:
+        return bool(
+            await self._redis.set(self._rebuilding_key(contest_id), 1, ex=self._rebuild_claim_ttl_s, nx=True)
+        )
+
+    @log_calls
+    async def rebuild(
+            self,
+            contest_id: int,
+            contestants: Sequence[ContestantInStandings],
+    ) -> None:
+        points_key = self._points_key(contest_id)
+        names_key = self._names_key(contest_id)
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(points_key, names_key)
+            if contestants:
+                pipe.zadd(points_key, {str(c.contestant_id): c.points for c in contestants})
+                pipe.hset(names_key, mapping={str(c.contestant_id): c.name for c in contestants})
+            pipe.set(self._ready_key(contest_id), 1, ex=self._ready_ttl_s)
+            pipe.delete(self._rebuilding_key(contest_id))
+            pipe.incr(self._seq_key(contest_id))
+            *_, seq = await pipe.execute()
+
+        await self._publish(
+            ContestStandingsEvent(
+                event_type=ContestStandingsEventType.RESET,
+                contest_id=contest_id,
+                seq=seq,
+            )
+        )
+
+    @log_calls
+    async def update_contestant(
+            self,
+            contest_id: int,
+            contestant_id: int,
+            name: str,
+            points: int,
+            version: int,
+    ) -> None:
+        points_key = self._points_key(contest_id)
+        member = str(contestant_id)
+
+        res = await self._update_contestant_script(
+            keys=[points_key, self._names_key(contest_id), self._versions_key(contest_id), self._seq_key(contest_id)],
+            args=[member, points, name, version],
+        )
+        if res is None:  # Уже применено более новое обновление участника
+            return
+        old_points, seq = res
+
+        # Место могло сдвинуться только у участников с очками между старым и новым значением
+        low, high = points, points
+        if old_points is not None:
+            low, high = min(points, int(old_points)), max(points, int(old_points))
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zcount(points_key, f"({high}", "+inf")
+            pipe.zrevrangebyscore(points_key, high, low, withscores=True)
+            number_of_greater, members = await pipe.execute()
+
+        if not members:  # Таблицу успели удалить
+            return
+
+        await self._publish(
+            ContestStandingsEvent(
+                event_type=ContestStandingsEventType.DELTA,
+                contest_id=contest_id,
+                seq=seq,
+                standings=ArrayContestantInStandings(
+                    body=await self._map_members_to_standings(contest_id, members, number_of_greater),
+                ),
+            )
+        )
+
+    @log_calls
+    async def drop_contest(
+            self,
+            contest_id: int,
+    ) -> None:
+        await self._redis.delete(
+            self._points_key(contest_id),
+            self._names_key(contest_id),
+            self._ready_key(contest_id),
+            self._seq_key(contest_id),
+            self._versions_key(contest_id),
+            self._rebuilding_key(contest_id),
+        )
+
+    @log_calls
+    async def get_standings(
+            self,
+            contest_id: int,
+            offset: int = 0,
+            limit: int | None = None,
+    ) -> Sequence[ContestantInStandings]:
+        end = -1 if limit is None else offset + limit - 1
+        members: List[Tuple[str, float]] = await self._redis.zrevrange(
+            self._points_key(contest_id), offset, end, withscores=True,
+        )
+        if not members:
+            return []
+
+        return await self._map_members_to_standings(contest_id, members, offset)
+
+    @log_calls
+    async def get_position(
+            self,
+            contest_id: int,
+            contestant_id: int,
+    ) -> int | None:
+        return await self._redis.zrevrank(self._points_key(contest_id), str(contestant_id))
+
+    @log_calls
+    async def count(
+            self,
+            contest_id: int,
+    ) -> int:
+        return await self._redis.zcard(self._points_key(contest_id))
+
+    async def _publish(
+            self,
+            event: ContestStandingsEvent,
+    ) -> None:
+        await self._redis.publish(self._events_channel(event.contest_id), event.model_dump_json())
+
+    async def _map_members_to_standings(
+            self,
+            contest_id: int,
+            members: List[Tuple[str, float]],
+            offset: int,
+    ) -> List[ContestantInStandings]:
+        first_points = members[0][1]
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hmget(self._names_key(contest_id), [member for member, _ in members])
+            # Число участников со строго большими очками, чем у первого в срезе
+            pipe.zcount(self._points_key(contest_id), f"({first_points}", "+inf")
+            names, number_of_greater = await pipe.execute()
+
+        res = []
+        rank = number_of_greater + 1
+        previous_points = first_points
+        for position, ((member, points), name) in enumerate(zip(members, names), start=offset):
+            if points < previous_points:
+                # Все участники выше по списку имеют строго большие очки
+                rank = position + 1
+                previous_points = points
+
+            res.append(
+                ContestantInStandings(
+                    contestant_id=int(member),
+                    name=name or "",
+                    points=int(points),
+                    rank=rank,
+                )
+            )
+        return res
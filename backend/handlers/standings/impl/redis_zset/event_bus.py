@@ -0,0 +1,114 @@
+import asyncio
+from typing import (
+    Dict,
+    Optional,
+    Set,
+)
+
+from redis.asyncio import Redis
+
+from backend.core.schemas.contest import (
+    ContestStandingsEvent,
+    ContestStandingsEventType,
+)
+from backend.core.utilities.loggers.logger import logger
+from backend.handlers.standings.interface import IStandingsEventBus
+
+
+class RedisStandingsEventBus(IStandingsEventBus):
+    """
+    Шина событий турнирной таблицы на Redis Pub/Sub.
+
+    Процесс держит одну подписку на шаблон `<prefix>:*:events` и раскладывает события по очередям
+    локальных подписчиков. Слушатель запускается при первой подписке и переподключается при обрыве;
+    после переподключения все подписчики получают RESET, так как события за время обрыва потеряны.
+    """
+
+    def __init__(
+            self,
+            redis_client: Redis,
+            key_prefix: str = 'standings',
+            queue_max_size: int = 64,
+            reconnect_delay_s: float = 1.0,
+    ) -> None:
+        self._redis = redis_client
+        self._key_prefix = key_prefix
+        self._queue_max_size = queue_max_size
+        self._reconnect_delay_s = reconnect_delay_s
+
+        self._subscribers: Dict[int, Set[asyncio.Queue[ContestStandingsEvent]]] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+
+    async def subscribe(
+            self,
+            contest_id: int,
+    ) -> asyncio.Queue[ContestStandingsEvent]:
+        queue: asyncio.Queue[ContestStandingsEvent] = asyncio.Queue(maxsize=self._queue_max_size)
+        self._subscribers.setdefault(contest_id, set()).add(queue)
+
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_forever())
+        return queue
+
+    def unsubscribe(
+            self,
+            contest_id: int,
+            queue: asyncio.Queue[ContestStandingsEvent],
+    ) -> None:
+        queues = self._subscribers.get(contest_id)
+        if queues is None:
+            return
+
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[contest_id]
+
+    async def _listen_forever(self) -> None:
+        is_reconnect = False
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{self._key_prefix}:*:events")
+                    if is_reconnect:
+                        for contest_id in list(self._subscribers):
+                            self._dispatch(
+                                ContestStandingsEvent(
+                                    event_type=ContestStandingsEventType.RESET,
+                                    contest_id=contest_id,
+                                )
+                            )
+                    is_reconnect = True
+
+                    async for message in pubsub.listen():
+                        if message["type"] != "pmessage":
+                            continue
+                        try:
+                            event = ContestStandingsEvent.model_validate_json(message["data"])
+                        except ValueError as e:
+                            logger.warning(f"Skip malformed standings event from {message['channel']}: {e}")
+                            continue
+                        self._dispatch(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Standings event listener failed, reconnecting: {e}")
+                await asyncio.sleep(self._reconnect_delay_s)
+
+    def _dispatch(
+            self,
+            event: ContestStandingsEvent,
+    ) -> None:
+        for queue in self._subscribers.get(event.contest_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Подписчик отстал: вместо накопленных дельт ему достаточно перечитать таблицу целиком
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(
+                    ContestStandingsEvent(
+                        event_type=ContestStandingsEventType.RESET,
+                        contest_id=event.contest_id,
+                        seq=event.seq,
+                    )
+                )
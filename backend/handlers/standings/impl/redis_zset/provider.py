@@ -0,0 +1,67 @@
+from typing import Dict, Tuple
+
+import redis.asyncio as redis
+
+from backend.configuration.settings import settings
+from backend.handlers.standings.impl.redis_zset.engine import RedisStandingsEngine
+from backend.handlers.standings.impl.redis_zset.event_bus import RedisStandingsEventBus
+from backend.handlers.standings.interface import (
+    IStandingsEngine,
+    IStandingsEventBus,
+)
+
+BASE_HOST = settings.REDIS_KV_SIMPLE_CACHE_HOST
+BASE_PORT = settings.REDIS_KV_SIMPLE_CACHE_PORT
+BASE_DB = settings.REDIS_STANDINGS_DB
+
+# Хранилища инстансов по (host, port, db)
+_redis_clients: Dict[Tuple[str, int, int], redis.Redis] = {}
+_standings_engine_instances: Dict[Tuple[str, int, int], RedisStandingsEngine] = {}
+_standings_event_bus_instances: Dict[Tuple[str, int, int], RedisStandingsEventBus] = {}
+
+
+def _get_redis_client(key: Tuple[str, int, int]) -> redis.Redis:
+    if key not in _redis_clients:
+        host, port, db = key
+        _redis_clients[key] = redis.Redis(
+            host=host,
+            port=port,
+            db=db,
+            decode_responses=True,
+        )
+    return _redis_clients[key]
+
+
+def get_standings_engine(
+        host: str = BASE_HOST,
+        port: int = BASE_PORT,
+        db: int = BASE_DB,
+) -> IStandingsEngine:
+    key = (host, port, db)
+
+    if key in _standings_engine_instances:
+        return _standings_engine_instances[key]
+
+    instance = RedisStandingsEngine(
+        redis_client=_get_redis_client(key),
+        ready_ttl_s=settings.STANDINGS_REBUILD_INTERVAL_S,
+    )
+    _standings_engine_instances[key] = instance
+    return instance
+
+
+def get_standings_event_bus(
+        host: str = BASE_HOST,
+        port: int = BASE_PORT,
+        db: int = BASE_DB,
+) -> IStandingsEventBus:
+    key = (host, port, db)
+
+    if key in _standings_event_bus_instances:
+        return _standings_event_bus_instances[key]
+
+    instance = RedisStandingsEventBus(
+        redis_client=_get_redis_client(key),
+    )
+    _standings_event_bus_instances[key] = instance
+    return instance
@@ -0,0 +1,136 @@
+import asyncio
+from typing import (
+    Protocol,
+    Sequence,
+)
+
+from backend.core.schemas.contest import (
+    ContestantInStandings,
+    ContestStandingsEvent,
+)
+
+
+class IStandingsEngine(Protocol):
+    """
+    Протокол движка турнирной таблицы.
+
+    Движок хранит очки участников каждого контеста в упорядоченной структуре и отдаёт готовые места,
+    не пересчитывая всю таблицу на каждый запрос. Источником истины остаётся БД: движок обновляется
+    после коммита транзакций, меняющих очки, и может быть пересобран из БД (`rebuild`).
+    """
+
+    async def is_ready(
+            self,
+            contest_id: int,
+    ) -> bool:
+        """
+        Проверяет, собрана ли таблица контеста. Если нет — её нужно пересобрать из БД.
+        """
+        ...
+
+    async def claim_rebuild(
+            self,
+            contest_id: int,
+    ) -> bool:
+        """
+        Занимает пересборку таблицы контеста. True - пересобирать этому вызывающему; False - таблицу уже
+        пересобирает другой процесс, и она скоро будет готова. Метка снимается `rebuild` или истекает сама.
+        """
+        ...
+
+    async def rebuild(
+            self,
+            contest_id: int,
+            contestants: Sequence[ContestantInStandings],
+    ) -> None:
+        """
+        Полностью заменяет таблицу контеста переданными данными (холодный старт).
+        """
+        ...
+
+    async def update_contestant(
+            self,
+            contest_id: int,
+            contestant_id: int,
+            name: str,
+            points: int,
+            version: int,
+    ) -> None:
+        """
+        Устанавливает актуальные очки (и имя) участника и оповещает подписчиков об изменении мест.
+
+        `version` растёт в порядке коммитов изменений участника: обновление с версией старее уже применённой
+        игнорируется. Та же версия означает те же очки, поэтому её повторное применение безопасно.
+        """
+        ...
+
+    async def drop_contest(
+            self,
+            contest_id: int,
+    ) -> None:
+        """
+        Удаляет таблицу контеста.
+        """
+        ...
+
+    async def get_standings(
+            self,
+            contest_id: int,
+            offset: int = 0,
+            limit: int | None = None,
+    ) -> Sequence[ContestantInStandings]:
+        """
+        Возвращает участников в порядке убывания очков, начиная с позиции `offset`.
+
+        Если `limit` не указан — до конца таблицы.
+        """
+        ...
+
+    async def get_position(
+            self,
+            contest_id: int,
+            contestant_id: int,
+    ) -> int | None:
+        """
+        Возвращает позицию участника в таблице (с нуля, в порядке `get_standings`) или None, если его там нет.
+        """
+        ...
+
+    async def count(
+            self,
+            contest_id: int,
+    ) -> int:
+        """
+        Возвращает число участников в таблице.
+        """
+        ...
+
+
+class IStandingsEventBus(Protocol):
+    """
+    Протокол шины событий турнирной таблицы.
+
+    Доставляет события, опубликованные движком (`IStandingsEngine`), подписчикам текущего процесса.
+    Одно подключение к брокеру обслуживает всех подписчиков процесса.
+    """
+
+    async def subscribe(
+            self,
+            contest_id: int,
+    ) -> asyncio.Queue[ContestStandingsEvent]:
+        """
+        Подписывается на события контеста. Возвращает очередь, в которую будут складываться события.
+
+        Если подписчик не успевает разбирать очередь, она очищается и в неё кладётся событие RESET.
+        """
+        ...
+
+    def unsubscribe(
+            self,
+            contest_id: int,
+            queue: asyncio.Queue[ContestStandingsEvent],
+    ) -> None:
+        """
+        Отменяет подписку, выданную `subscribe`.
+        """
+        ...
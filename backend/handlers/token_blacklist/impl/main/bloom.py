@@ -0,0 +1,188 @@
+import asyncio
+import time
+from typing import (
+    Callable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from redis.asyncio import Redis
+
+from backend.core.utilities.loggers.log_decorator import log_calls
+from backend.core.utilities.loggers.logger import logger
+from backend.handlers.cache_invalidation.interface import ICacheInvalidationBus
+from backend.handlers.token_blacklist.impl.main.bloom_filter import ExpiringBloomFilter
+from backend.handlers.token_blacklist.impl.main.main import (
+    TokenBlacklistHandler,
+    get_token_id,
+)
+from backend.storages.kv.simple_cache.interface import IKeyValueSimpleCache
+
+# Сообщение шины об отзыве токена: "<префикс>:<id токена>:<unix-время истечения записи>"
+_REVOKED_TOKEN_TAG_PREFIX = "revoked_token"
+
+
+class BloomTokenBlacklistHandler(TokenBlacklistHandler):
+    """
+    `TokenBlacklistHandler` с фильтром Блума отозванных токенов в памяти процесса: почти все проверки
+    отвечают "не в чёрном списке" без обращения к хранилищу, в хранилище сверяются только вероятные попадания.
+
+    Источник истины для фильтра - sorted set `<key_prefix>:index` в Redis (id токена -> время истечения записи).
+    Процесс заполняет фильтр из него при подключении к шине инвалидации и перестраивает не реже
+    `resync_interval_s`; между перестроениями отзывы других процессов приходят сообщениями шины.
+    Пока шина не свежа или фильтр не построен, каждая проверка идёт в хранилище.
+
+    Args:
+        kv_storage (IKeyValueSimpleCache): Хранилище записей чёрного списка.
+        redis_client (Redis): Клиент Redis для индекса отозванных токенов (`decode_responses=True`).
+        invalidation_bus (ICacheInvalidationBus): Шина, по которой процессы сообщают друг другу об отзывах.
+        bucket_s (float): Ширина корзины фильтра по времени истечения записи.
+        bucket_capacity (int): Число токенов, на которое рассчитана одна корзина.
+        error_rate (float): Доля ложноположительных ответов заполненной корзины.
+        resync_interval_s (float): Как часто фильтр перестраивается из индекса.
+    """
+
+    def __init__(
+            self,
+            kv_storage: IKeyValueSimpleCache,
+            redis_client: Redis,
+            invalidation_bus: ICacheInvalidationBus,
+            bucket_s: float = 3600,
+            bucket_capacity: int = 100_000,
+            error_rate: float = 0.001,
+            resync_interval_s: float = 60,
+            legacy_cutoff_at: float = 0.0,
+            token_lifetimes_s: Optional[Mapping[str, int]] = None,
+            key_prefix: str = "token_blacklist",
+            clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(
+            kv_storage=kv_storage,
+            legacy_cutoff_at=legacy_cutoff_at,
+            token_lifetimes_s=token_lifetimes_s,
+            key_prefix=key_prefix,
+        )
+        self._redis = redis_client
+        self._bus = invalidation_bus
+        self._bucket_s = bucket_s
+        self._bucket_capacity = bucket_capacity
+        self._error_rate = error_rate
+        self._resync_interval_s = resync_interval_s
+        self._index_key = f"{key_prefix}:index"
+        self._clock = clock
+
+        self._filter: Optional[ExpiringBloomFilter] = None
+        self._filter_built_at = float("-inf")
+        # Растёт при сбросе фильтра: построение, начатое до сброса, не устанавливается
+        self._generation = 0
+        self._seed_task: Optional[asyncio.Task] = None
+        # Отзывы, пришедшие во время построения фильтра, - добавляются в него перед установкой
+        self._seeding_revocations: Optional[List[Tuple[bytes, float]]] = None
+
+        invalidation_bus.subscribe(self._on_invalidate, self._on_flush)
+
+    @log_calls
+    async def move_token_to_blacklist(
+            self,
+            token: str,
+            expires_in_seconds: int,
+    ) -> None:
+        token_id = get_token_id(token)
+        expires_at = self._clock() + expires_in_seconds
+        # Сначала индекс: запись, которой нет в индексе, фильтры других процессов не увидят никогда,
+        # а лишняя запись в индексе лишь отправит проверку в хранилище
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self._index_key, {token_id: expires_at})
+            pipe.zremrangebyscore(self._index_key, "-inf", self._clock())
+            await pipe.execute()
+
+        await super().move_token_to_blacklist(token, expires_in_seconds)
+
+        self._remember(bytes.fromhex(token_id), expires_at)
+        # Если сообщение потеряется, другие процессы узнают об отзыве при перестроении фильтра
+        await self._bus.publish((f"{_REVOKED_TOKEN_TAG_PREFIX}:{token_id}:{int(expires_at) + 1}",))
+
+    @log_calls
+    async def check_token_in_blacklist(
+            self,
+            token: str,
+    ) -> bool:
+        bloom = self._get_fresh_filter()
+        if (
+                bloom is not None
+                and bytes.fromhex(get_token_id(token)) not in bloom
+                and not self._may_have_legacy_entry(token)
+        ):
+            return False
+        return await super().check_token_in_blacklist(token)
+
+    def _get_fresh_filter(self) -> Optional[ExpiringBloomFilter]:
+        if not self._bus.is_fresh():
+            return None
+        if self._clock() - self._filter_built_at > self._resync_interval_s:
+            self._ensure_seeding()
+        return self._filter
+
+    def _ensure_seeding(self) -> None:
+        if self._seed_task is not None and not self._seed_task.done():
+            return
+        self._seed_task = asyncio.get_running_loop().create_task(self._seed())
+
+    async def _seed(self) -> None:
+        generation = self._generation
+        self._seeding_revocations = []
+        try:
+            built_at = self._clock()
+            bloom = ExpiringBloomFilter(
+                bucket_s=self._bucket_s,
+                bucket_capacity=self._bucket_capacity,
+                error_rate=self._error_rate,
+                clock=self._clock,
+            )
+            for token_id, expires_at in await self._redis.zrangebyscore(
+                    self._index_key, built_at, "+inf", withscores=True,
+            ):
+                bloom.add(bytes.fromhex(token_id), expires_at)
+            for digest, expires_at in self._seeding_revocations:
+                bloom.add(digest, expires_at)
+        except Exception as e:
+            logger.exception(f"Failed to build token blacklist filter: {e}")
+            return
+        finally:
+            self._seeding_revocations = None
+
+        if generation == self._generation:
+            self._filter = bloom
+            self._filter_built_at = built_at
+
+    def _remember(
+            self,
+            digest: bytes,
+            expires_at: float,
+    ) -> None:
+        if self._filter is not None:
+            self._filter.add(digest, expires_at)
+        if self._seeding_revocations is not None:
+            self._seeding_revocations.append((digest, expires_at))
+
+    def _on_invalidate(
+            self,
+            tags: Tuple[str, ...],
+    ) -> None:
+        for tag in tags:
+            prefix, _, rest = tag.partition(":")
+            if prefix != _REVOKED_TOKEN_TAG_PREFIX:
+                continue
+            token_id, _, expires_at = rest.partition(":")
+            try:
+                self._remember(bytes.fromhex(token_id), float(expires_at))
+            except ValueError:
+                logger.warning(f"Skip malformed revoked token message: {tag}")
+
+    def _on_flush(self) -> None:
+        # Отзывы могли быть пропущены - до перестроения проверки идут в хранилище
+        self._generation += 1
+        self._filter = None
+        self._filter_built_at = float("-inf")
@@ -0,0 +1,103 @@
+import math
+import time
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+)
+
+
+class BloomFilter:
+    """
+    Фильтр Блума фиксированного размера. Ключ - не менее 16 байт равномерного хеша (например, SHA-256):
+    позиции битов получаются двойным хешированием из его первых 16 байт.
+
+    Args:
+        capacity (int): Число ключей, на которое рассчитан размер.
+        error_rate (float): Доля ложноположительных ответов при заполнении до `capacity`.
+    """
+
+    def __init__(
+            self,
+            capacity: int,
+            error_rate: float,
+    ) -> None:
+        self._size_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hash_count = max(1, round(self._size_bits / capacity * math.log(2)))
+        self._bits = bytearray((self._size_bits + 7) // 8)
+
+    def add(
+            self,
+            digest: bytes,
+    ) -> None:
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(
+            self,
+            digest: bytes,
+    ) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def _positions(
+            self,
+            digest: bytes,
+    ) -> Iterator[int]:
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self._hash_count):
+            yield (h1 + i * h2) % self._size_bits
+
+
+class ExpiringBloomFilter:
+    """
+    Фильтр Блума с истечением ключей: ключи раскладываются по фильтрам-корзинам по времени истечения
+    (`bucket_s` секунд на корзину), корзины целиком выбрасываются, когда их время прошло.
+    Ключ может отвечать положительно до `bucket_s` секунд после своего срока - это лишь ложноположительный ответ.
+
+    Args:
+        bucket_s (float): Ширина корзины по времени истечения.
+        bucket_capacity (int): Число ключей, на которое рассчитана одна корзина.
+        error_rate (float): Доля ложноположительных ответов одной заполненной корзины.
+        clock (Callable[[], float]): Источник unix-времени - сроки истечения общие для всех процессов.
+    """
+
+    def __init__(
+            self,
+            bucket_s: float,
+            bucket_capacity: int,
+            error_rate: float,
+            clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._bucket_s = bucket_s
+        self._bucket_capacity = bucket_capacity
+        self._error_rate = error_rate
+        self._clock = clock
+
+        self._buckets: Dict[int, BloomFilter] = {}
+
+    def add(
+            self,
+            digest: bytes,
+            expires_at: float,
+    ) -> None:
+        if expires_at <= self._clock():
+            return
+
+        index = math.floor(expires_at / self._bucket_s)
+        bucket = self._buckets.get(index)
+        if bucket is None:
+            bucket = self._buckets[index] = BloomFilter(self._bucket_capacity, self._error_rate)
+        bucket.add(digest)
+
+    def __contains__(
+            self,
+            digest: bytes,
+    ) -> bool:
+        self._drop_expired()
+        return any(digest in bucket for bucket in self._buckets.values())
+
+    def _drop_expired(self) -> None:
+        current = math.floor(self._clock() / self._bucket_s)
+        for index in [index for index in self._buckets if index < current]:
+            del self._buckets[index]
@@ -1,14 +1,60 @@
+import hashlib
+import time
+from typing import (
+    Mapping,
+    Optional,
+)
+
+from jose import (
+    JWTError,
+    jwt,
+)
+
+from backend.core.services.security import forget_verified_token
 from backend.core.utilities.loggers.log_decorator import log_calls
 from backend.handlers.token_blacklist.interface import ITokenBlacklistHandler
 from backend.storages.kv.simple_cache.interface import IKeyValueSimpleCache
 
 
+def get_token_id(token: str) -> str:
+    """
+    Идентификатор токена для чёрного списка - SHA-256 от строки JWT. Сам токен в хранилище не попадает.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 class TokenBlacklistHandler(ITokenBlacklistHandler):
+    """
+    Чёрный список токенов в `IKeyValueSimpleCache` по ключу `<key_prefix>:<id токена>`.
+
+    Прежняя версия хранила токен целиком как ключ. Такие записи проверяются только для токенов, выпущенных
+    до `legacy_cutoff_at` (время выпуска - `exp` минус время жизни токена его типа из `token_lifetimes_s`):
+    позже процессы пишут только новый формат. Когда с `legacy_cutoff_at` проходит время жизни самого
+    долгоживущего токена, записей прежнего формата не остаётся и проверка перестаёт выполняться; после этого
+    её можно удалить вместе с настройкой `TOKEN_BLACKLIST_LEGACY_CUTOFF_AT`.
+
+    Args:
+        kv_storage (IKeyValueSimpleCache): Хранилище чёрного списка.
+        legacy_cutoff_at (float): Unix-время, с которого записи прежнего формата не создаются.
+        token_lifetimes_s (Mapping[str, int]): Время жизни токена по его `token_type`.
+    """
+
     def __init__(
             self,
             kv_storage: IKeyValueSimpleCache,
+            legacy_cutoff_at: float = 0.0,
+            token_lifetimes_s: Optional[Mapping[str, int]] = None,
+            key_prefix: str = "token_blacklist",
     ):
         self._kv_storage = kv_storage
+        self._legacy_cutoff_at = legacy_cutoff_at
+        self._token_lifetimes_s = token_lifetimes_s or {}
+        # Позже этого момента все токены, выпущенные до `legacy_cutoff_at`, уже истекли
+        self._legacy_entries_expire_at = legacy_cutoff_at + max(self._token_lifetimes_s.values(), default=0)
+        self._key_prefix = key_prefix
+
+    def _key(self, token_id: str) -> str:
+        return f"{self._key_prefix}:{token_id}"
 
     @log_calls
     async def move_token_to_blacklist(
@@ -17,10 +63,11 @@ class TokenBlacklistHandler(ITokenBlacklistHandler):
             expires_in_seconds: int,
     ) -> None:
         await self._kv_storage.set_str_value_by_str_key(
-            key=token,
-            value=token,
+            key=self._key(get_token_id(token)),
+            value="1",
             expires_in_seconds=expires_in_seconds,
         )
+        forget_verified_token(token)
 
     @log_calls
     async def check_token_in_blacklist(
@@ -29,9 +76,29 @@ class TokenBlacklistHandler(ITokenBlacklistHandler):
     ) -> bool:
         res: str | None = (
             await self._kv_storage.get_str_value_by_str_key(
-                key=token,
+                key=self._key(get_token_id(token)),
             )
         )
         if res:
             return True
+
+        if self._may_have_legacy_entry(token):
+            return bool(await self._kv_storage.get_str_value_by_str_key(key=token))
         return False
+
+    def _may_have_legacy_entry(
+            self,
+            token: str,
+    ) -> bool:
+        if time.time() >= self._legacy_entries_expire_at:
+            return False
+        try:
+            claims = jwt.get_unverified_claims(token)
+        except JWTError:
+            return True
+
+        lifetime_s = self._token_lifetimes_s.get(claims.get("token_type"))
+        expires_at = claims.get("exp")
+        if lifetime_s is None or not isinstance(expires_at, (int, float)):
+            return True
+        return expires_at - lifetime_s < self._legacy_cutoff_at
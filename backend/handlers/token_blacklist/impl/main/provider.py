@@ -1,14 +1,58 @@
+from typing import Optional
+
+import redis.asyncio as redis
 from fastapi import Depends
 
+from backend.configuration.settings import settings
+from backend.handlers.cache_invalidation.provider import get_cache_invalidation_bus
+from backend.handlers.token_blacklist.impl.main.bloom import BloomTokenBlacklistHandler
 from backend.handlers.token_blacklist.impl.main.main import TokenBlacklistHandler
 from backend.handlers.token_blacklist.interface import ITokenBlacklistHandler
-from backend.storages.kv.simple_cache.impl.redis_kv.provider import get_redis_kv_simple_cache
-from backend.storages.kv.simple_cache.impl.redis_kv.redis_kv import RedisKeyValueSimpleCache
+from backend.storages.kv.simple_cache.interface import IKeyValueSimpleCache
+from backend.storages.kv.simple_cache.provider import get_read_mostly_kv_simple_cache
+
+_TOKEN_LIFETIMES_S = {
+    "access": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    "refresh": settings.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
+}
+
+_bloom_token_blacklist_handler: Optional[BloomTokenBlacklistHandler] = None
+
+
+def _get_bloom_token_blacklist_handler(
+        kv_storage: IKeyValueSimpleCache,
+) -> BloomTokenBlacklistHandler:
+    global _bloom_token_blacklist_handler
+
+    if _bloom_token_blacklist_handler is None:
+        _bloom_token_blacklist_handler = BloomTokenBlacklistHandler(
+            kv_storage=kv_storage,
+            redis_client=redis.Redis(
+                host=settings.REDIS_KV_SIMPLE_CACHE_HOST,
+                port=settings.REDIS_KV_SIMPLE_CACHE_PORT,
+                db=settings.REDIS_KV_SIMPLE_CACHE_DB,
+                decode_responses=True,
+            ),
+            invalidation_bus=get_cache_invalidation_bus(),
+            bucket_s=settings.TOKEN_BLACKLIST_BLOOM_BUCKET_S,
+            bucket_capacity=settings.TOKEN_BLACKLIST_BLOOM_BUCKET_CAPACITY,
+            error_rate=settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE,
+            resync_interval_s=settings.TOKEN_BLACKLIST_BLOOM_RESYNC_S,
+            legacy_cutoff_at=settings.TOKEN_BLACKLIST_LEGACY_CUTOFF_AT,
+            token_lifetimes_s=_TOKEN_LIFETIMES_S,
+        )
+    return _bloom_token_blacklist_handler
 
 
 async def get_token_blacklist_handler(
-        kv_storage: RedisKeyValueSimpleCache = Depends(get_redis_kv_simple_cache),
+        kv_storage: IKeyValueSimpleCache = Depends(get_read_mostly_kv_simple_cache),
 ) -> ITokenBlacklistHandler:
+    # Хранилище в памяти процесса отвечает без сети, а индексу фильтра и шине нужен Redis
+    if settings.TOKEN_BLACKLIST_BLOOM_FILTER and settings.KV_SIMPLE_CACHE_BACKEND != "memory":
+        return _get_bloom_token_blacklist_handler(kv_storage)
+
     return TokenBlacklistHandler(
         kv_storage=kv_storage,
+        legacy_cutoff_at=settings.TOKEN_BLACKLIST_LEGACY_CUTOFF_AT,
+        token_lifetimes_s=_TOKEN_LIFETIMES_S,
     )
@@ -0,0 +1,10 @@
+from prometheus_client import Counter
+
+# Обращения политик доступа к сущностям: `db` - чтение из БД, `memo` - из контекста запроса.
+# В рамках одного запроса каждая сущность читается из БД не больше одного раза
+
+ACCESS_POLICY_LOOKUPS = Counter(
+    "access_policy_lookups_total",
+    "Access policy entity lookups by source (db, memo)",
+    ["entity", "source"]
+)
@@ -0,0 +1,40 @@
+from prometheus_client import Counter, Histogram
+
+# Метрики `LazyCache`. Метка `function` - `<класс>.<метод>` обёрнутой функции
+
+LAZY_CACHE_HITS = Counter(
+    "lazy_cache_hits_total",
+    "LazyCache hits by tier (l1, l2, negative)",
+    ["function", "tier"]
+)
+
+LAZY_CACHE_MISSES = Counter(
+    "lazy_cache_misses_total",
+    "LazyCache misses that led to a recompute",
+    ["function"]
+)
+
+LAZY_CACHE_STALE_SERVES = Counter(
+    "lazy_cache_stale_serves_total",
+    "LazyCache L2 hits older than get_from_cache_not_later_than_s",
+    ["function"]
+)
+
+LAZY_CACHE_REFRESHES = Counter(
+    "lazy_cache_refreshes_total",
+    "LazyCache refreshes by mode (mq, background, xfetch)",
+    ["function", "mode"]
+)
+
+LAZY_CACHE_RECOMPUTE_DURATION = Histogram(
+    "lazy_cache_recompute_duration_seconds",
+    "Duration of the wrapped function call on a LazyCache recompute",
+    ["function"]
+)
+
+LAZY_CACHE_PAYLOAD_SIZE = Histogram(
+    "lazy_cache_payload_bytes",
+    "Size of the serialized value written by LazyCache",
+    ["function"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, float("inf")),
+)
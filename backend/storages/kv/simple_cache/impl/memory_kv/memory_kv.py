@@ -0,0 +1,199 @@
+import datetime
+import time
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from backend.storages.kv.simple_cache.impl.memory_kv.timing_wheel import HierarchicalTimingWheel
+from backend.storages.kv.simple_cache.interface import IKeyValueSimpleCache
+
+# Примерные накладные расходы на запись (объекты словарей, колеса и кортежа) сверх длины ключа и значения
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+class _Entry(NamedTuple):
+    value: str
+    set_at: datetime.datetime
+    expires_at: float
+    size: int
+
+
+class MemoryKeyValueSimpleCache(IKeyValueSimpleCache):
+    """
+    `IKeyValueSimpleCache` в памяти процесса - без сети, для развёртываний в один процесс, тестов и бенчмарков.
+
+    Сроки жизни отслеживает иерархическое колесо таймеров: истёкшие записи удаляются при каждом обращении
+    к хранилищу, без фоновой задачи и без перебора всех ключей. Объём ограничен `max_bytes` (оценка по длине
+    ключа и значения); при превышении вытесняются давно не читанные записи.
+
+    Методы не уступают управление event loop'у, поэтому каждый из них атомарен относительно других корутин.
+
+    Args:
+        max_bytes (int): Ограничение суммарного размера записей.
+        tick_s (float): Точность истечения сроков.
+        clock (Callable[[], float]): Источник монотонного времени в секундах.
+    """
+
+    def __init__(
+            self,
+            max_bytes: int = 64 * 1024 * 1024,
+            tick_s: float = 0.1,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._clock = clock
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._wheel = HierarchicalTimingWheel(tick_s=tick_s, start_at=clock())
+
+    async def get_str_value_by_str_key(
+            self,
+            key: str,
+    ) -> str | None:
+        entry = self._get_entry(key)
+        return entry.value if entry is not None else None
+
+    async def get_str_value_by_str_key_with_time_when_set(
+            self,
+            key: str,
+    ) -> Tuple[Optional[str], Optional[datetime.datetime]]:
+        entry = self._get_entry(key)
+        if entry is None:
+            return None, None
+        return entry.value, entry.set_at
+
+    async def get_time_when_set_str_key(
+            self,
+            key: str,
+    ) -> datetime.datetime | None:
+        entry = self._get_entry(key)
+        return entry.set_at if entry is not None else None
+
+    async def set_str_value_by_str_key(
+            self,
+            key: str,
+            value: str,
+            expires_in_seconds: int,
+    ) -> None:
+        self._expire()
+        self._set_entry(key, value, expires_in_seconds)
+
+    async def set_str_value_by_str_key_if_not_exists(
+            self,
+            key: str,
+            value: str,
+            expires_in_seconds: int,
+    ) -> bool:
+        if self._get_entry(key) is not None:
+            return False
+        self._set_entry(key, value, expires_in_seconds)
+        return True
+
+    async def delete_str_key(
+            self,
+            key: str,
+    ) -> None:
+        self._remove(key)
+
+    async def delete_str_key_if_value_equals(
+            self,
+            key: str,
+            value: str,
+    ) -> bool:
+        entry = self._get_entry(key)
+        if entry is None or entry.value != value:
+            return False
+        self._remove(key)
+        return True
+
+    async def get_many(
+            self,
+            keys: Sequence[str],
+    ) -> List[str | None]:
+        self._expire()
+        result: List[str | None] = []
+        for key in keys:
+            entry = self._get_entry(key, expire=False)
+            result.append(entry.value if entry is not None else None)
+        return result
+
+    async def set_many(
+            self,
+            items: Mapping[str, str],
+            expires_in_seconds: int,
+    ) -> None:
+        self._expire()
+        for key, value in items.items():
+            self._set_entry(key, value, expires_in_seconds)
+
+    async def delete_many(
+            self,
+            keys: Iterable[str],
+    ) -> None:
+        for key in keys:
+            self._remove(key)
+
+    def _get_entry(
+            self,
+            key: str,
+            expire: bool = True,
+    ) -> Optional[_Entry]:
+        if expire:
+            self._expire()
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        # Колесо срабатывает с точностью до тика - точный срок проверяем сами
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def _set_entry(
+            self,
+            key: str,
+            value: str,
+            expires_in_seconds: int,
+    ) -> None:
+        self._remove(key)
+        if expires_in_seconds <= 0:
+            return
+
+        size = len(key) + len(value) + _ENTRY_OVERHEAD_BYTES
+        if size > self._max_bytes:  # Запись больше всего хранилища вытеснила бы всё остальное
+            return
+
+        expires_at = self._clock() + expires_in_seconds
+        self._entries[key] = _Entry(value, datetime.datetime.now(), expires_at, size)
+        self._bytes += size
+        self._wheel.schedule(key, expires_at)
+
+        while self._bytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _expire(self) -> None:
+        for key in self._wheel.advance(self._clock()):
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+
+    def _remove(
+            self,
+            key: str,
+    ) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            self._wheel.cancel(key)
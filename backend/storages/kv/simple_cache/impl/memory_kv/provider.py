@@ -0,0 +1,22 @@
+from typing import Dict
+
+from backend.configuration.settings import settings
+from backend.storages.kv.simple_cache.impl.memory_kv.memory_kv import MemoryKeyValueSimpleCache
+from backend.storages.kv.simple_cache.interface import IKeyValueSimpleCache
+
+BASE_MAX_BYTES = settings.MEMORY_KV_SIMPLE_CACHE_MAX_BYTES
+
+# Хранилище инстансов по имени: одинаковое имя - общее хранилище в пределах процесса
+_memory_kv_instances: Dict[str, MemoryKeyValueSimpleCache] = {}
+
+
+def get_memory_kv_simple_cache(
+        name: str = "default",
+        max_bytes: int = BASE_MAX_BYTES,
+) -> IKeyValueSimpleCache:
+    if name in _memory_kv_instances:
+        return _memory_kv_instances[name]
+
+    instance = MemoryKeyValueSimpleCache(max_bytes=max_bytes)
+    _memory_kv_instances[name] = instance
+    return instance
@@ -0,0 +1,136 @@
+import math
+from typing import (
+    Dict,
+    Hashable,
+    List,
+    Set,
+    Tuple,
+)
+
+
+class HierarchicalTimingWheel:
+    """
+    Иерархическое колесо таймеров: планирование и отмена за O(1), продвижение времени - за O(числа тиков)
+    плюс истёкшие ключи.
+
+    Уровень 0 держит ближайшие `slots_per_level` тиков по одному на слот, каждый следующий уровень -
+    в `slots_per_level` раз более крупные интервалы. Когда младший уровень проходит полный оборот,
+    слот старшего уровня раскладывается (cascade) по младшим. Сроки дальше горизонта колеса
+    откладываются в последний уровень и переносятся ближе при каскаде.
+
+    Args:
+        tick_s (float): Длительность тика - точность срабатывания.
+        slots_per_level (int): Число слотов на уровне, степень двойки.
+        levels (int): Число уровней. Горизонт - `tick_s * slots_per_level ** levels`.
+    """
+
+    def __init__(
+            self,
+            tick_s: float = 0.1,
+            slots_per_level: int = 64,
+            levels: int = 4,
+            start_at: float = 0.0,
+    ) -> None:
+        if slots_per_level & (slots_per_level - 1):
+            raise ValueError("slots_per_level must be a power of two")
+
+        self._tick_s = tick_s
+        self._bits = slots_per_level.bit_length() - 1
+        self._mask = slots_per_level - 1
+        self._levels = levels
+
+        self._current_tick = self._to_tick(start_at)
+        self._wheels: List[List[Set[Hashable]]] = [
+            [set() for _ in range(slots_per_level)] for _ in range(levels)
+        ]
+        # Ключ -> (тик срабатывания, уровень, слот)
+        self._positions: Dict[Hashable, Tuple[int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def schedule(
+            self,
+            key: Hashable,
+            expires_at: float,
+    ) -> None:
+        self.cancel(key)
+        # Округляем вверх: ключ не должен истечь раньше срока
+        self._place(key, max(math.ceil(expires_at / self._tick_s), self._current_tick + 1))
+
+    def cancel(
+            self,
+            key: Hashable,
+    ) -> None:
+        position = self._positions.pop(key, None)
+        if position is not None:
+            _, level, slot = position
+            self._wheels[level][slot].discard(key)
+
+    def advance(
+            self,
+            now: float,
+    ) -> List[Hashable]:
+        """
+        Продвигает колесо до момента `now` и возвращает ключи, срок которых наступил.
+        """
+        target_tick = self._to_tick(now)
+        expired: List[Hashable] = []
+
+        if not self._positions:  # Пустое колесо можно сдвинуть сразу
+            self._current_tick = max(self._current_tick, target_tick)
+            return expired
+
+        while self._current_tick < target_tick and self._positions:
+            self._current_tick += 1
+            self._cascade()
+
+            slot = self._wheels[0][self._current_tick & self._mask]
+            for key in slot:
+                del self._positions[key]
+            expired.extend(slot)
+            slot.clear()
+
+        self._current_tick = max(self._current_tick, target_tick)
+        return expired
+
+    def clear(self) -> None:
+        for wheel in self._wheels:
+            for slot in wheel:
+                slot.clear()
+        self._positions.clear()
+
+    def _to_tick(
+            self,
+            moment: float,
+    ) -> int:
+        return math.floor(moment / self._tick_s)
+
+    def _cascade(self) -> None:
+        # На каждом полном обороте младшего уровня раскладываем очередной слот старшего
+        for level in range(1, self._levels):
+            if (self._current_tick >> (self._bits * level)) << (self._bits * level) != self._current_tick:
+                return
+            slot = self._wheels[level][(self._current_tick >> (self._bits * level)) & self._mask]
+            keys = list(slot)
+            slot.clear()
+            for key in keys:
+                expires_tick, _, _ = self._positions.pop(key)
+                self._place(key, expires_tick)
+
+    def _place(
+            self,
+            key: Hashable,
+            expires_tick: int,
+    ) -> None:
+        delta = expires_tick - self._current_tick
+        for level in range(self._levels):
+            if delta < 1 << (self._bits * (level + 1)):
+                slot = (expires_tick >> (self._bits * level)) & self._mask
+                break
+        else:  # За горизонтом - в самый дальний слот, при каскаде ключ переложится ближе
+            level = self._levels - 1
+            slot = ((self._current_tick >> (self._bits * level)) - 1) & self._mask
+
+        self._wheels[level][slot].add(key)
+        self._positions[key] = (expires_tick, level, slot)
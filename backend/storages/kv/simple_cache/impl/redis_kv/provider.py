@@ -1,25 +1,32 @@
+import uuid
 from typing import Dict, Tuple
 
 import redis.asyncio as redis
 
 from backend.configuration.settings import settings
 from backend.storages.kv.simple_cache.impl.redis_kv.redis_kv import RedisKeyValueSimpleCache
+from backend.storages.kv.simple_cache.impl.redis_kv.tracking import TrackingRedisKeyValueSimpleCache
 from backend.storages.kv.simple_cache.interface import IKeyValueSimpleCache
 
 BASE_HOST = settings.REDIS_KV_SIMPLE_CACHE_HOST
 BASE_PORT = settings.REDIS_KV_SIMPLE_CACHE_PORT
 BASE_DB = settings.REDIS_KV_SIMPLE_CACHE_DB
 
-# Хранилище инстансов по (host, port, db)
-_redis_kv_instances: Dict[Tuple[str, int, int], RedisKeyValueSimpleCache] = {}
+# Хранилище инстансов по (host, port, db, tracking)
+_redis_kv_instances: Dict[Tuple[str, int, int, bool], RedisKeyValueSimpleCache] = {}
 
 
 def get_redis_kv_simple_cache(
         host: str = BASE_HOST,
         port: int = BASE_PORT,
         db: int = BASE_DB,
+        tracking: bool = False,
 ) -> IKeyValueSimpleCache:
-    key = (host, port, db)
+    """
+    При `tracking=True` чтения кешируются в процессе и инвалидируются сообщениями Redis client tracking -
+    только для редко меняющихся ключей: каждое отслеживаемое чтение занимает место в таблице отслеживания Redis.
+    """
+    key = (host, port, db, tracking)
 
     if key in _redis_kv_instances:
         return _redis_kv_instances[key]
@@ -31,6 +38,31 @@ def get_redis_kv_simple_cache(
         decode_responses=False,
     )
 
-    instance = RedisKeyValueSimpleCache(redis_client)
+    if tracking:
+        listener_name = f"kv-tracking-{uuid.uuid4().hex}"
+        instance = TrackingRedisKeyValueSimpleCache(
+            redis_client=redis_client,
+            tracking_client=redis.Redis(
+                host=host,
+                port=port,
+                db=db,
+                decode_responses=False,
+                single_connection_client=True,
+            ),
+            listener_client=redis.Redis(
+                host=host,
+                port=port,
+                db=db,
+                decode_responses=False,
+                client_name=listener_name,
+            ),
+            listener_name=listener_name,
+            local_ttl_s=settings.REDIS_KV_CLIENT_TRACKING_LOCAL_TTL_S,
+            max_entries=settings.REDIS_KV_CLIENT_TRACKING_MAX_ENTRIES,
+            max_staleness_s=settings.CACHE_INVALIDATION_MAX_STALENESS_S,
+        )
+    else:
+        instance = RedisKeyValueSimpleCache(redis_client)
+
     _redis_kv_instances[key] = instance
     return instance
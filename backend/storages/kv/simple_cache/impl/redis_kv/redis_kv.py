@@ -1,45 +1,79 @@
 import datetime
-from typing import Tuple, Optional
+import time
+from typing import (
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from redis import Redis
 
 from backend.storages.kv.simple_cache.interface import IKeyValueSimpleCache
 
+# Значение хранится вместе со временем записи в одном ключе: "<метка><unix-время><метка><значение>".
+# Значения без метки записаны прежней версией (время лежало в отдельном ключе) - читаются без времени записи
+_ENVELOPE_MARK = "\x1e"
+
+# Удаление ключа, только если его значение (с меткой времени записи или без неё) совпадает с ARGV[1]
+_DELETE_IF_VALUE_EQUALS_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return 0
+end
+local value = string.match(raw, '^\\30[^\\30]*\\30(.*)$') or raw
+if value == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _pack(value: str) -> str:
+    return f"{_ENVELOPE_MARK}{time.time():.6f}{_ENVELOPE_MARK}{value}"
+
+
+def _unpack(raw: bytes | None) -> Tuple[Optional[str], Optional[datetime.datetime]]:
+    if raw is None:
+        return None, None
+
+    text = raw.decode('utf-8')
+    if not text.startswith(_ENVELOPE_MARK):
+        return text, None
+
+    set_at, _, value = text[len(_ENVELOPE_MARK):].partition(_ENVELOPE_MARK)
+    return value, datetime.datetime.fromtimestamp(float(set_at))
+
 
 class RedisKeyValueSimpleCache(IKeyValueSimpleCache):
     def __init__(
             self,
             redis_client: Redis,
-            time_prefix: str = 'time_when_set',
     ) -> None:
         self._redis = redis_client
-        self._time_prefix = time_prefix
+        self._delete_if_value_equals = redis_client.register_script(_DELETE_IF_VALUE_EQUALS_SCRIPT)
 
     async def get_str_value_by_str_key(
             self,
             key: str,
     ) -> str | None:
-        value = await self._redis.get(key)
-        if value is None:
-            return None
-        return value.decode('utf-8')
+        value, _ = _unpack(await self._get_raw(key))
+        return value
 
     async def get_str_value_by_str_key_with_time_when_set(
             self,
             key: str,
     ) -> Tuple[Optional[str], Optional[datetime.datetime]]:
-        value = await self.get_str_value_by_str_key(key=key)
-        time_when_set = await self.get_time_when_set_str_key(key=key)
-        return value, time_when_set
+        return _unpack(await self._get_raw(key))
 
     async def get_time_when_set_str_key(
             self,
             key: str,
     ) -> datetime.datetime | None:
-        value = await self._redis.get(self._time_prefix + key)
-        if value is None:
-            return None
-        return datetime.datetime.fromisoformat(value.decode('utf-8'))
+        _, time_when_set = _unpack(await self._get_raw(key))
+        return time_when_set
 
     async def set_str_value_by_str_key(
             self,
@@ -47,5 +81,59 @@ class RedisKeyValueSimpleCache(IKeyValueSimpleCache):
             value: str,
             expires_in_seconds: int,
     ) -> None:
-        await self._redis.set(key, value, ex=expires_in_seconds)
-        await self._redis.set(self._time_prefix + key, datetime.datetime.now().isoformat(), ex=expires_in_seconds)
+        await self._redis.set(key, _pack(value), ex=expires_in_seconds)
+
+    async def set_str_value_by_str_key_if_not_exists(
+            self,
+            key: str,
+            value: str,
+            expires_in_seconds: int,
+    ) -> bool:
+        return bool(await self._redis.set(key, _pack(value), ex=expires_in_seconds, nx=True))
+
+    async def delete_str_key(
+            self,
+            key: str,
+    ) -> None:
+        await self._redis.delete(key)
+
+    async def delete_str_key_if_value_equals(
+            self,
+            key: str,
+            value: str,
+    ) -> bool:
+        return bool(await self._delete_if_value_equals(keys=[key], args=[value]))
+
+    async def get_many(
+            self,
+            keys: Sequence[str],
+    ) -> List[str | None]:
+        if not keys:
+            return []
+        return [_unpack(raw)[0] for raw in await self._redis.mget(keys)]
+
+    async def set_many(
+            self,
+            items: Mapping[str, str],
+            expires_in_seconds: int,
+    ) -> None:
+        if not items:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, _pack(value), ex=expires_in_seconds)
+            await pipe.execute()
+
+    async def delete_many(
+            self,
+            keys: Iterable[str],
+    ) -> None:
+        keys = list(keys)
+        if keys:
+            await self._redis.delete(*keys)
+
+    async def _get_raw(
+            self,
+            key: str,
+    ) -> bytes | None:
+        return await self._redis.get(key)
@@ -0,0 +1,259 @@
+import asyncio
+import time
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+)
+
+from redis.asyncio import Redis
+from redis.asyncio.connection import Connection
+
+from backend.core.optimazers.cache.memory_lru import MemoryLRUCache
+from backend.core.utilities.loggers.logger import logger
+from backend.storages.kv.simple_cache.impl.redis_kv.redis_kv import RedisKeyValueSimpleCache
+
+_INVALIDATE_CHANNEL = "__redis__:invalidate"
+# Отсутствие ключа тоже кешируется локально - для чёрного списка токенов это основной случай
+_MISSING = object()
+
+
+class TrackingRedisKeyValueSimpleCache(RedisKeyValueSimpleCache):
+    """
+    `RedisKeyValueSimpleCache` с клиентским кешированием чтений на стороне процесса (Redis client tracking).
+
+    Чтения идут через отдельное соединение с `CLIENT TRACKING ON REDIRECT <id слушателя>`: Redis запоминает
+    прочитанные им ключи и при их изменении, удалении или истечении присылает ключ в канал
+    `__redis__:invalidate` соединению-слушателю. Прочитанное значение (и его отсутствие) хранится локально
+    до такого сообщения, но не дольше `local_ttl_s`.
+
+    Локальные значения используются, только пока слушатель подписан и отвечал на heartbeat не позже
+    `max_staleness_s` назад; при переподключении любого из соединений локальный кеш сбрасывается.
+    Свои записи процесс сбрасывает локально сразу, не дожидаясь сообщения.
+
+    Args:
+        redis_client (Redis): Клиент для записей и чтений без отслеживания.
+        tracking_client (Redis): Клиент с единственным соединением (`single_connection_client=True`) для чтений.
+        listener_client (Redis): Клиент слушателя; его соединениям задано имя `listener_name`.
+        listener_name (str): Уникальное имя соединения-слушателя - по нему находится его CLIENT ID.
+        local_ttl_s (float): Предельный срок жизни локального значения.
+        max_entries (int): Максимальное число локальных значений.
+        max_staleness_s (float): Допустимое время без вестей от слушателя.
+    """
+
+    def __init__(
+            self,
+            redis_client: Redis,
+            tracking_client: Redis,
+            listener_client: Redis,
+            listener_name: str,
+            local_ttl_s: float = 60,
+            max_entries: int = 100_000,
+            max_staleness_s: float = 3.0,
+            reconnect_delay_s: float = 1.0,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(redis_client)
+        self._tracking_redis = tracking_client
+        self._listener_redis = listener_client
+        self._listener_name = listener_name
+        self._local_ttl_s = local_ttl_s
+        self._max_staleness_s = max_staleness_s
+        self._heartbeat_interval_s = max_staleness_s / 3
+        self._reconnect_delay_s = reconnect_delay_s
+        self._clock = clock
+
+        self._local = MemoryLRUCache(max_entries=max_entries, clock=clock)
+        # Ключ -> метка чтения, идущего сейчас. Инвалидация удаляет метку, и прочитанное значение не сохраняется
+        self._pending: Dict[str, object] = {}
+        # Растёт при каждом сбросе локального кеша: чтение, начатое до сброса, результат не сохраняет
+        self._epoch = 0
+
+        self._listener_id: Optional[int] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._connected = False
+        self._last_seen_at = float("-inf")
+        self._reconnect_callback_registered = False
+
+    async def set_str_value_by_str_key(
+            self,
+            key: str,
+            value: str,
+            expires_in_seconds: int,
+    ) -> None:
+        await super().set_str_value_by_str_key(key, value, expires_in_seconds)
+        self._forget(key)
+
+    async def set_str_value_by_str_key_if_not_exists(
+            self,
+            key: str,
+            value: str,
+            expires_in_seconds: int,
+    ) -> bool:
+        is_set = await super().set_str_value_by_str_key_if_not_exists(key, value, expires_in_seconds)
+        self._forget(key)
+        return is_set
+
+    async def delete_str_key(
+            self,
+            key: str,
+    ) -> None:
+        await super().delete_str_key(key)
+        self._forget(key)
+
+    async def delete_str_key_if_value_equals(
+            self,
+            key: str,
+            value: str,
+    ) -> bool:
+        is_deleted = await super().delete_str_key_if_value_equals(key, value)
+        self._forget(key)
+        return is_deleted
+
+    async def set_many(
+            self,
+            items: Mapping[str, str],
+            expires_in_seconds: int,
+    ) -> None:
+        await super().set_many(items, expires_in_seconds)
+        for key in items:
+            self._forget(key)
+
+    async def delete_many(
+            self,
+            keys: Iterable[str],
+    ) -> None:
+        keys = list(keys)
+        await super().delete_many(keys)
+        for key in keys:
+            self._forget(key)
+
+    async def _get_raw(
+            self,
+            key: str,
+    ) -> bytes | None:
+        if not self._is_fresh():
+            return await super()._get_raw(key)
+
+        cached = self._local.get(key)
+        if cached is not None:
+            return None if cached is _MISSING else cached
+
+        epoch = self._epoch
+        mark = object()
+        self._pending[key] = mark
+        try:
+            raw = await self._tracking_redis.get(key)
+        finally:
+            is_still_valid = self._pending.get(key) is mark
+            if is_still_valid:
+                del self._pending[key]
+
+        if is_still_valid and epoch == self._epoch and self._is_fresh():
+            self._local.set(
+                key,
+                raw if raw is not None else _MISSING,
+                ttl_s=self._local_ttl_s,
+                size=len(key) + len(raw or b""),
+            )
+        return raw
+
+    def _forget(
+            self,
+            key: str,
+    ) -> None:
+        self._local.delete(key)
+        self._pending.pop(key, None)
+
+    def _flush_local(self) -> None:
+        self._epoch += 1
+        self._local.clear()
+        self._pending.clear()
+
+    def _is_fresh(self) -> bool:
+        self._ensure_listening()
+        return self._connected and self._clock() - self._last_seen_at <= self._max_staleness_s
+
+    def _ensure_listening(self) -> None:
+        if self._listener_task is not None and not self._listener_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._listener_task = loop.create_task(self._listen_forever())
+
+    async def _listen_forever(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                self._connected = False
+                raise
+            except Exception as e:
+                logger.exception(f"Redis tracking listener failed, reconnecting: {e}")
+            self._connected = False
+            self._flush_local()
+            await asyncio.sleep(self._reconnect_delay_s)
+
+    async def _listen(self) -> None:
+        async with self._listener_redis.pubsub() as pubsub:
+            await pubsub.subscribe(_INVALIDATE_CHANNEL)
+            await self._enable_tracking(await self._get_listener_id())
+            # Сообщения, пришедшие без подписки, потеряны
+            self._flush_local()
+            self._connected = True
+            self._last_seen_at = self._clock()
+
+            next_ping_at = self._clock()
+            while True:
+                if self._clock() >= next_ping_at:
+                    await pubsub.ping()
+                    next_ping_at = self._clock() + self._heartbeat_interval_s
+
+                message = await pubsub.get_message(timeout=self._heartbeat_interval_s)
+                if message is None:
+                    if self._clock() - self._last_seen_at > self._max_staleness_s:
+                        raise ConnectionError("No pong from Redis within the staleness bound")
+                    continue
+
+                self._last_seen_at = self._clock()
+                if message["type"] != "message":
+                    continue
+                if message["data"] is None:  # FLUSHALL/FLUSHDB - сбрасывается всё
+                    self._flush_local()
+                    continue
+                for key in message["data"]:
+                    self._forget(key.decode("utf-8") if isinstance(key, bytes) else key)
+
+    async def _get_listener_id(self) -> int:
+        for client in await self._tracking_redis.client_list(_type="pubsub"):
+            if client.get("name") == self._listener_name:
+                return int(client["id"])
+        raise ConnectionError(f"Tracking listener connection {self._listener_name} is not visible to Redis")
+
+    async def _enable_tracking(
+            self,
+            listener_id: int,
+    ) -> None:
+        await self._tracking_redis.initialize()
+        if not self._reconnect_callback_registered:
+            self._tracking_redis.connection.register_connect_callback(self._on_tracking_reconnect)
+            self._reconnect_callback_registered = True
+
+        # Соединение могло отслеживать ключи для прежнего слушателя - перенаправляем заново
+        await self._tracking_redis.execute_command("CLIENT", "TRACKING", "OFF")
+        await self._tracking_redis.execute_command("CLIENT", "TRACKING", "ON", "REDIRECT", listener_id)
+        self._listener_id = listener_id
+
+    async def _on_tracking_reconnect(
+            self,
+            connection: Connection,
+    ) -> None:
+        # Новое соединение ничего не отслеживает: прежние локальные значения некому инвалидировать
+        self._flush_local()
+        if self._listener_id is not None:
+            await connection.send_command("CLIENT", "TRACKING", "ON", "REDIRECT", self._listener_id)
+            await connection.read_response()
@@ -1,7 +1,11 @@
 import datetime
 from typing import (
+    Iterable,
+    List,
+    Mapping,
     Protocol,
     runtime_checkable,
+    Sequence,
     Tuple,
     Optional,
 )
@@ -35,3 +39,52 @@ class IKeyValueSimpleCache(Protocol):
             expires_in_seconds: int,
     ) -> None:
         ...
+
+    async def set_str_value_by_str_key_if_not_exists(
+            self,
+            key: str,
+            value: str,
+            expires_in_seconds: int,
+    ) -> bool:
+        """
+        Записывает значение, только если ключа ещё нет. Возвращает True, если значение записано.
+        """
+        ...
+
+    async def delete_str_key(
+            self,
+            key: str,
+    ) -> None:
+        ...
+
+    async def delete_str_key_if_value_equals(
+            self,
+            key: str,
+            value: str,
+    ) -> bool:
+        """
+        Атомарно удаляет ключ, только если в нём записано `value`. Возвращает True, если ключ удалён.
+        """
+        ...
+
+    async def get_many(
+            self,
+            keys: Sequence[str],
+    ) -> List[str | None]:
+        """
+        Значения ключей за одно обращение к хранилищу - в том же порядке, None для отсутствующих.
+        """
+        ...
+
+    async def set_many(
+            self,
+            items: Mapping[str, str],
+            expires_in_seconds: int,
+    ) -> None:
+        ...
+
+    async def delete_many(
+            self,
+            keys: Iterable[str],
+    ) -> None:
+        ...
@@ -0,0 +1,24 @@
+from backend.configuration.settings import settings
+from backend.storages.kv.simple_cache.impl.memory_kv.provider import get_memory_kv_simple_cache
+from backend.storages.kv.simple_cache.impl.redis_kv.provider import get_redis_kv_simple_cache
+from backend.storages.kv.simple_cache.interface import IKeyValueSimpleCache
+
+
+def get_kv_simple_cache() -> IKeyValueSimpleCache:
+    """
+    Хранилище из `settings.KV_SIMPLE_CACHE_BACKEND`: "redis" (общее для всех процессов) или "memory"
+    (в памяти процесса - только для развёртывания в один процесс).
+    """
+    if settings.KV_SIMPLE_CACHE_BACKEND == "memory":
+        return get_memory_kv_simple_cache()
+    return get_redis_kv_simple_cache()
+
+
+def get_read_mostly_kv_simple_cache() -> IKeyValueSimpleCache:
+    """
+    Хранилище для редко меняющихся ключей, которые читаются на каждом запросе (чёрный список токенов).
+    С `settings.REDIS_KV_CLIENT_TRACKING` чтения из Redis кешируются в процессе до сообщения об изменении ключа.
+    """
+    if settings.KV_SIMPLE_CACHE_BACKEND == "memory":
+        return get_memory_kv_simple_cache()
+    return get_redis_kv_simple_cache(tracking=settings.REDIS_KV_CLIENT_TRACKING)
@@ -0,0 +1,141 @@
+import asyncio
+import os
+import uuid
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from typing import (
+    Awaitable,
+    Callable,
+    Iterable,
+    NamedTuple,
+)
+
+# Тесты идут в одном процессе: хранилище кеша - в памяти, шины инвалидации нет
+os.environ.setdefault("KV_SIMPLE_CACHE_BACKEND", "memory")
+
+import pytest
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import NullPool
+
+from backend.core.database.connection import Base
+from backend.core.models import (
+    Contest,
+    Permission,
+    Problem,
+    ProblemCard,
+    QuizField,
+    User,
+)
+from backend.core.models.permission import (
+    PermissionActionType,
+    PermissionResourceType,
+)
+
+
+@compiles(BigInteger, "sqlite")
+def _compile_big_integer_for_sqlite(type_, compiler, **kw) -> str:
+    # В SQLite автоинкрементный первичный ключ - только INTEGER PRIMARY KEY
+    return "INTEGER"
+
+
+class FakeClock:
+    """
+    Управляемый источник времени для компонентов с параметром `clock`: время меняется только присваиванием `now`.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+async def _create_tables(engine: AsyncEngine) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+
+@pytest.fixture(scope="session")
+def sqlite_engine(tmp_path_factory) -> AsyncEngine:
+    """
+    Файловая SQLite-база на весь прогон. Тесты делят данные, поэтому создают свои строки и не рассчитывают
+    на пустые таблицы; зато id не повторяются, и общие кеши процесса (`LazyCache`, `PrincipalCache`)
+    не отдают одному тесту строки другого. Без пула: каждый `asyncio.run` открывает свои соединения.
+    """
+    pytest.importorskip("aiosqlite")
+    path = tmp_path_factory.mktemp("db") / "test.sqlite"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    asyncio.run(_create_tables(engine))
+    return engine
+
+
+@pytest.fixture
+def session_maker(sqlite_engine) -> async_sessionmaker:
+    return async_sessionmaker(bind=sqlite_engine, expire_on_commit=False)
+
+
+class ContestChain(NamedTuple):
+    user_id: int
+    contest_id: int
+    quiz_field_id: int
+    problem_card_id: int
+
+
+@pytest.fixture
+def make_contest_chain(session_maker) -> Callable[..., Awaitable[ContestChain]]:
+    """
+    Создаёт пользователя сайта и контест с полем квиза и карточкой задачи; пользователь получает на контест
+    права `granted`.
+    """
+
+    async def make(granted: Iterable[PermissionActionType] = ()) -> ContestChain:
+        started_at = datetime(2026, 10, 17, 10, tzinfo=timezone.utc)
+        async with session_maker() as session:
+            user = User(domain_number=0, username=uuid.uuid4().hex, hashed_password="-", uuid=str(uuid.uuid4()))
+            contest = Contest(
+                name="contest",
+                started_at=started_at,
+                closed_at=started_at + timedelta(hours=2),
+                start_points=100,
+                number_of_slots_for_problems=1,
+            )
+            problem = Problem(statement="-", answer="-")
+            session.add_all([user, contest, problem])
+            await session.flush()
+
+            quiz_field = QuizField(contest_id=contest.id, number_of_rows=1, number_of_columns=1)
+            session.add(quiz_field)
+            await session.flush()
+
+            problem_card = ProblemCard(
+                problem_id=problem.id, category_name="cat", category_price=100,
+                quiz_field_id=quiz_field.id, row=1, column=1,
+            )
+            session.add(problem_card)
+            session.add_all([
+                Permission(
+                    user_id=user.id,
+                    resource_type=PermissionResourceType.CONTEST,
+                    resource_id=contest.id,
+                    permission_type=action,
+                )
+                for action in granted
+            ])
+            await session.commit()
+            return ContestChain(user.id, contest.id, quiz_field.id, problem_card.id)
+
+    return make
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from backend.core.models import (
+    Permission,
+    ProblemCard,
+    QuizField,
+)
+from backend.core.models.permission import (
+    PermissionActionType,
+    PermissionResourceType,
+)
+from backend.core.repository.crud.access import AccessCRUDRepository
+
+# Идентификатор, которого нет ни в одной таблице
+MISSING_ID = 10 ** 9
+
+
+def _run(session_maker, query):
+    async def scenario():
+        async with session_maker() as session:
+            return await query(AccessCRUDRepository(session))
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("granted", [
+    (),
+    (PermissionActionType.ADMIN,),
+    (PermissionActionType.EDIT,),
+    tuple(PermissionActionType),
+])
+def test_each_permission_column_maps_to_its_action(session_maker, make_contest_chain, granted):
+    chain = asyncio.run(make_contest_chain(granted=granted))
+    expected = frozenset(action.value for action in granted)
+
+    contest_access = _run(session_maker, lambda repo: repo.get_contest_access(
+        user_id=chain.user_id, contest_id=chain.contest_id))
+    quiz_field, quiz_field_access = _run(session_maker, lambda repo: repo.get_quiz_field_access(
+        user_id=chain.user_id, quiz_field_id=chain.quiz_field_id))
+    problem_card, card_quiz_field, card_access = _run(session_maker, lambda repo: repo.get_problem_card_access(
+        user_id=chain.user_id, problem_card_id=chain.problem_card_id))
+
+    assert contest_access.contest.id == chain.contest_id
+    assert quiz_field.id == card_quiz_field.id == chain.quiz_field_id
+    assert problem_card.id == chain.problem_card_id
+    assert contest_access.granted == quiz_field_access.granted == card_access.granted == expected
+
+
+def test_permissions_of_other_users_contests_and_resources_are_not_granted(session_maker, make_contest_chain):
+    chain = asyncio.run(make_contest_chain(granted=[PermissionActionType.EDIT]))
+    other = asyncio.run(make_contest_chain(granted=[]))
+
+    async def grant_elsewhere():
+        async with session_maker() as session:
+            session.add_all([
+                # Права на чужой контест и на домен, а не на контест
+                Permission(user_id=other.user_id, resource_type=PermissionResourceType.CONTEST,
+                           resource_id=chain.contest_id + 10 ** 6, permission_type=PermissionActionType.ADMIN),
+                Permission(user_id=other.user_id, resource_type=PermissionResourceType.DOMAIN,
+                           resource_id=chain.contest_id, permission_type=PermissionActionType.ADMIN),
+            ])
+            await session.commit()
+
+    asyncio.run(grant_elsewhere())
+
+    access = _run(session_maker, lambda repo: repo.get_contest_access(
+        user_id=other.user_id, contest_id=chain.contest_id))
+    assert access.contest.id == chain.contest_id
+    assert access.granted == frozenset()
+
+
+def test_user_without_any_link_to_contest_gets_no_rights(session_maker, make_contest_chain):
+    chain = asyncio.run(make_contest_chain(granted=[PermissionActionType.ADMIN]))
+
+    # Не участник и без прав - строка есть, прав нет
+    _, _, access = _run(session_maker, lambda repo: repo.get_problem_card_access(
+        user_id=MISSING_ID, problem_card_id=chain.problem_card_id))
+    assert access.granted == frozenset()
+
+
+def test_missing_entities_return_none(session_maker):
+    assert _run(session_maker, lambda repo: repo.get_contest_access(user_id=1, contest_id=MISSING_ID)) is None
+    assert _run(session_maker, lambda repo: repo.get_quiz_field_access(user_id=1, quiz_field_id=MISSING_ID)) is None
+    assert _run(session_maker, lambda repo: repo.get_problem_card_access(
+        user_id=1, problem_card_id=MISSING_ID)) is None
+
+
+def test_missing_links_keep_the_row(session_maker, make_contest_chain):
+    chain = asyncio.run(make_contest_chain(granted=[PermissionActionType.EDIT]))
+
+    async def add_orphans():
+        # SQLite без PRAGMA foreign_keys не проверяет внешние ключи - так получаем оборванные звенья
+        async with session_maker() as session:
+            orphan_quiz_field = QuizField(contest_id=MISSING_ID, number_of_rows=1, number_of_columns=1)
+            card_without_quiz_field = ProblemCard(
+                problem_id=MISSING_ID, category_name="cat", category_price=100,
+                quiz_field_id=MISSING_ID, row=1, column=1,
+            )
+            session.add_all([orphan_quiz_field, card_without_quiz_field])
+            await session.flush()
+            card_without_contest = ProblemCard(
+                problem_id=MISSING_ID, category_name="cat", category_price=100,
+                quiz_field_id=orphan_quiz_field.id, row=1, column=1,
+            )
+            session.add(card_without_contest)
+            await session.commit()
+            return orphan_quiz_field.id, card_without_quiz_field.id, card_without_contest.id
+
+    quiz_field_id, card_without_quiz_field_id, card_without_contest_id = asyncio.run(add_orphans())
+
+    quiz_field, access = _run(session_maker, lambda repo: repo.get_quiz_field_access(
+        user_id=chain.user_id, quiz_field_id=quiz_field_id))
+    assert quiz_field.id == quiz_field_id
+    assert access is None
+
+    problem_card, quiz_field, access = _run(session_maker, lambda repo: repo.get_problem_card_access(
+        user_id=chain.user_id, problem_card_id=card_without_quiz_field_id))
+    assert problem_card.id == card_without_quiz_field_id
+    assert quiz_field is None and access is None
+
+    problem_card, quiz_field, access = _run(session_maker, lambda repo: repo.get_problem_card_access(
+        user_id=chain.user_id, problem_card_id=card_without_contest_id))
+    assert problem_card.id == card_without_contest_id
+    assert quiz_field.id == quiz_field_id
+    assert access is None
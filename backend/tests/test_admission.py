@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from backend.core.optimazers.admission import (
+    AdmissionRejected,
+    PriorityAdmissionGate,
+)
+
+
+def _gate(
+        max_concurrency: int = 1,
+        max_queue: int = 10,
+        queue_timeout_s: float = 1.0,
+) -> PriorityAdmissionGate:
+    return PriorityAdmissionGate(
+        max_concurrency=max_concurrency,
+        max_queue=max_queue,
+        queue_timeout_s=queue_timeout_s,
+        retry_after_s=3,
+    )
+
+
+def test_free_slots_are_taken_immediately():
+    async def scenario():
+        gate = _gate(max_concurrency=2)
+        await gate.acquire()
+        await gate.acquire()
+        assert gate._active == 2
+
+        gate.release()
+        gate.release()
+        assert gate._active == 0
+
+    asyncio.run(scenario())
+
+
+def test_released_slot_goes_to_lowest_priority_value_then_fifo():
+    async def scenario():
+        gate = _gate()
+        await gate.acquire()
+        admitted = []
+
+        async def request(name: str, priority: int) -> None:
+            await gate.acquire(priority=priority)
+            admitted.append(name)
+
+        tasks = [
+            asyncio.create_task(request("low-1", 1)),
+            asyncio.create_task(request("low-2", 1)),
+            asyncio.create_task(request("high", 0)),
+        ]
+        await asyncio.sleep(0)
+        for _ in tasks:
+            gate.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        assert admitted == ["high", "low-1", "low-2"]
+        assert gate._active == 1
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_immediately_with_retry_after():
+    async def scenario():
+        gate = _gate(max_queue=1)
+        await gate.acquire()
+        waiter = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await gate.acquire()
+        assert exc_info.value.retry_after_s == 3
+
+        gate.release()
+        await waiter
+
+    asyncio.run(scenario())
+
+
+def test_wait_longer_than_timeout_is_rejected_and_leaves_queue():
+    async def scenario():
+        gate = _gate(queue_timeout_s=0.01)
+        await gate.acquire()
+
+        with pytest.raises(AdmissionRejected):
+            await gate.acquire()
+        assert not any(gate._queues.values())
+
+        gate.release()
+        assert gate._active == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_that_was_handed_a_slot_passes_it_on():
+    async def scenario():
+        gate = _gate()
+        await gate.acquire()
+        first = asyncio.create_task(gate.acquire())
+        second = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+
+        # Слот передан первому, но тот отменён раньше, чем успел проснуться
+        gate.release()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        await asyncio.wait_for(second, timeout=1)
+        assert gate._active == 1
+
+    asyncio.run(scenario())
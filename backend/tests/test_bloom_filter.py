@@ -0,0 +1,82 @@
+import asyncio
+import hashlib
+import time
+
+from jose import jwt
+
+from backend.handlers.token_blacklist.impl.main.bloom_filter import (
+    BloomFilter,
+    ExpiringBloomFilter,
+)
+from backend.handlers.token_blacklist.impl.main.main import TokenBlacklistHandler
+from backend.storages.kv.simple_cache.impl.memory_kv.memory_kv import MemoryKeyValueSimpleCache
+
+
+def _digest(value: int) -> bytes:
+    return hashlib.sha256(str(value).encode()).digest()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(_digest(i))
+
+    assert all(_digest(i) in bloom for i in range(1000))
+
+
+def test_bloom_filter_false_positive_rate_is_close_to_target():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(_digest(i))
+
+    false_positives = sum(_digest(i) in bloom for i in range(1000, 11000))
+    assert false_positives < 10000 * 0.03
+
+
+def test_expiring_filter_forgets_keys_after_their_bucket_passes(clock):
+    clock.now = 100.0
+    bloom = ExpiringBloomFilter(bucket_s=10, bucket_capacity=100, error_rate=0.01, clock=clock)
+    bloom.add(_digest(1), expires_at=115.0)
+    bloom.add(_digest(2), expires_at=135.0)
+
+    # До конца корзины ключ может отвечать положительно и после своего срока
+    clock.now = 119.9
+    assert _digest(1) in bloom
+
+    clock.now = 120.0
+    assert _digest(1) not in bloom
+    assert _digest(2) in bloom
+    assert len(bloom._buckets) == 1
+
+
+def test_expiring_filter_ignores_already_expired_keys(clock):
+    clock.now = 100.0
+    bloom = ExpiringBloomFilter(bucket_s=10, bucket_capacity=100, error_rate=0.01, clock=clock)
+    bloom.add(_digest(1), expires_at=100.0)
+
+    assert _digest(1) not in bloom
+    assert not bloom._buckets
+
+
+def test_legacy_entries_are_checked_only_for_tokens_issued_before_cutoff():
+    async def scenario():
+        now = time.time()
+        kv = MemoryKeyValueSimpleCache()
+        handler = TokenBlacklistHandler(
+            kv_storage=kv, legacy_cutoff_at=now - 100, token_lifetimes_s={"access": 3600},
+        )
+        old_token = jwt.encode({"token_type": "access", "exp": now - 200 + 3600}, "secret")
+        new_token = jwt.encode({"token_type": "access", "exp": now + 3600}, "secret")
+        # Записи прежнего формата - сам токен как ключ
+        await kv.set_str_value_by_str_key(old_token, "1", expires_in_seconds=60)
+        await kv.set_str_value_by_str_key(new_token, "1", expires_in_seconds=60)
+
+        assert await handler.check_token_in_blacklist(old_token)
+        assert not await handler.check_token_in_blacklist(new_token)
+
+        expired_cutoff = TokenBlacklistHandler(
+            kv_storage=kv, legacy_cutoff_at=now - 3700, token_lifetimes_s={"access": 3600},
+        )
+        assert not await expired_cutoff.check_token_in_blacklist(old_token)
+
+    asyncio.run(scenario())
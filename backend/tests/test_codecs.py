@@ -0,0 +1,125 @@
+import datetime
+import json
+from enum import Enum
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import pytest
+from pydantic import (
+    BaseModel,
+    Field,
+)
+
+from backend.core.optimazers.cache.codecs import (
+    MsgpackTrustedCodec,
+    OrjsonTrustedCodec,
+    PydanticJsonCodec,
+    construct_trusted,
+)
+from backend.core.schemas.contest import (
+    ArrayContestantInStandings,
+    ContestantInStandings,
+    ContestStandings,
+)
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Leaf(BaseModel):
+    color: Color
+    at: datetime.datetime
+
+
+class Node(BaseModel):
+    name: str = Field(alias="title")
+    leaves: List[Leaf]
+    children: List["Node"] = []
+    pair: Tuple[int, Color]
+    tags: Set[str]
+    by_id: Dict[int, Leaf]
+    optional_leaf: Optional[Leaf] = None
+    day: datetime.date
+    number_or_text: int | str
+
+
+def _node_data() -> dict:
+    leaf = {"color": "red", "at": "2026-10-17T12:00:00+00:00"}
+    return {
+        "title": "root",
+        "leaves": [leaf],
+        "children": [{
+            "title": "child", "leaves": [], "pair": [2, "blue"], "tags": [], "by_id": {},
+            "day": "2026-10-18", "number_or_text": "x",
+        }],
+        "pair": [1, "blue"],
+        "tags": ["a", "b"],
+        "by_id": {"7": leaf},
+        "optional_leaf": None,
+        "day": "2026-10-17",
+        "number_or_text": 5,
+    }
+
+
+def test_construct_trusted_matches_validation_for_json_round_trip():
+    data = json.loads(json.dumps(_node_data()))
+
+    assert construct_trusted(Node, data) == Node.model_validate(data)
+
+
+def test_construct_trusted_restores_nested_types():
+    node = construct_trusted(Node, _node_data())
+
+    assert isinstance(node.leaves[0], Leaf)
+    assert node.leaves[0].color is Color.RED
+    assert node.leaves[0].at == datetime.datetime(2026, 10, 17, 12, tzinfo=datetime.timezone.utc)
+    assert isinstance(node.children[0], Node)
+    assert node.pair == (1, Color.BLUE)
+    assert node.tags == {"a", "b"}
+    assert node.by_id == {7: node.leaves[0]}
+    assert node.day == datetime.date(2026, 10, 17)
+
+
+def test_construct_trusted_keeps_defaults_for_missing_fields():
+    data = _node_data()
+    del data["children"]
+
+    assert construct_trusted(Node, data).children == []
+
+
+def _standings() -> ContestStandings:
+    return ContestStandings(
+        contest_id=1,
+        name="contest",
+        started_at=datetime.datetime(2026, 10, 17, 10, tzinfo=datetime.timezone.utc),
+        closed_at=datetime.datetime(2026, 10, 17, 15, tzinfo=datetime.timezone.utc),
+        standings=ArrayContestantInStandings(body=[
+            ContestantInStandings(contestant_id=1, name="a", points=30, rank=1),
+            ContestantInStandings(contestant_id=2, name="b", points=10, rank=2),
+        ]),
+    )
+
+
+def test_trusted_codec_round_trip_matches_pydantic_codec():
+    standings = _standings()
+    trusted, pydantic_json = OrjsonTrustedCodec(), PydanticJsonCodec()
+
+    assert trusted.decode(ContestStandings, trusted.encode(standings)) == standings
+    # Значения, записанные воркером MQ через `model_dump_json`, читаются тем же кодеком
+    assert trusted.decode(ContestStandings, pydantic_json.encode(standings)) == standings
+
+
+def test_msgpack_codec_reads_its_own_values_and_json():
+    pytest.importorskip("msgpack")
+    standings = _standings()
+    codec = MsgpackTrustedCodec()
+
+    assert codec.decode(ContestStandings, codec.encode(standings)) == standings
+    assert codec.decode(ContestStandings, standings.model_dump_json()) == standings
@@ -0,0 +1,240 @@
+import asyncio
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+
+import pytest
+from sqlalchemy import (
+    event,
+    func,
+    select,
+)
+
+from backend.core.models import Contest
+
+from backend.core.repository.crud.uow import UnitOfWork
+from backend.core.services.domain.contest import ContestService
+from backend.core.services.domain.quiz_field import QuizFieldService
+from backend.core.schemas.quiz_field import QuizFieldInfoForEditor
+from backend.core.utilities.exceptions.database import EntityDoesNotExist
+
+STARTED_AT = datetime(2026, 10, 17, 10, tzinfo=timezone.utc)
+
+
+class AllowAllPolicy:
+    """
+    Политика доступа, разрешающая всё: тесты проверяют кеширование, а не права.
+    """
+
+    def __getattr__(self, name):
+        async def check(**_) -> bool:
+            return True
+
+        return check
+
+
+class QueryCounter:
+    def __init__(self, engine) -> None:
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        self._engine = engine
+
+    def _on_execute(self, *_) -> None:
+        self.count += 1
+
+    def close(self) -> None:
+        event.remove(self._engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+
+@pytest.fixture
+def queries(sqlite_engine):
+    counter = QueryCounter(sqlite_engine)
+    yield counter
+    counter.close()
+
+
+async def _create_contest(session_maker, full: bool = False):
+    async with session_maker() as session:
+        uow = UnitOfWork(session)
+        async with uow:
+            create = uow.contest_repo.create_full_contest if full else uow.contest_repo.create_contest
+            return await create(
+                name="contest",
+                started_at=STARTED_AT,
+                closed_at=STARTED_AT + timedelta(hours=2),
+                start_points=100,
+                number_of_slots_for_problems=1,
+            )
+
+
+async def _read_quiz_field(session_maker, contest_id: int) -> QuizFieldInfoForEditor:
+    async with session_maker() as session:
+        service = QuizFieldService(uow=UnitOfWork(session), access_policy=AllowAllPolicy())
+        return await service.quiz_field_info_for_editor(user_id=1, contest_id=contest_id)
+
+
+async def _read_submissions(session_maker, contest_id: int):
+    async with session_maker() as session:
+        service = ContestService(uow=UnitOfWork(session), access_policy=AllowAllPolicy())
+        return await service.contest_submissions(user_id=1, contest_id=contest_id)
+
+
+def test_quiz_field_update_evicts_cached_editor_view(session_maker, queries):
+    async def scenario():
+        contest = await _create_contest(session_maker, full=True)
+
+        first = await _read_quiz_field(session_maker, contest.id)
+        queries.count = 0
+        second = await _read_quiz_field(session_maker, contest.id)
+        assert not first.use_cache and second.use_cache
+        assert queries.count == 0
+
+        async with session_maker() as session:
+            uow = UnitOfWork(session)
+            async with uow:
+                await uow.quiz_field_repo.update_quiz_field(
+                    quiz_field_id=first.quiz_field_id, number_of_rows=3, number_of_columns=4, )
+
+        queries.count = 0
+        third = await _read_quiz_field(session_maker, contest.id)
+        assert not third.use_cache and queries.count > 0
+        assert (third.number_of_rows, third.number_of_columns) == (3, 4)
+
+    asyncio.run(scenario())
+
+
+def test_contest_update_evicts_cached_submissions(session_maker):
+    async def scenario():
+        contest = await _create_contest(session_maker)
+
+        assert not (await _read_submissions(session_maker, contest.id)).use_cache
+        assert (await _read_submissions(session_maker, contest.id)).use_cache
+
+        async with session_maker() as session:
+            uow = UnitOfWork(session)
+            async with uow:
+                await uow.contest_repo.update_contest(
+                    contest_id=contest.id,
+                    name="renamed",
+                    started_at=contest.started_at,
+                    closed_at=contest.closed_at,
+                    start_points=contest.start_points,
+                    number_of_slots_for_problems=contest.number_of_slots_for_problems,
+                    rule_type=contest.rule_type,
+                    flag_user_can_have_negative_points=False,
+                )
+
+        submissions = await _read_submissions(session_maker, contest.id)
+        assert not submissions.use_cache
+        assert submissions.name == "renamed"
+
+    asyncio.run(scenario())
+
+
+def test_writes_of_other_contest_keep_cached_view(session_maker):
+    async def scenario():
+        contest = await _create_contest(session_maker, full=True)
+        await _read_quiz_field(session_maker, contest.id)
+
+        await _create_contest(session_maker, full=True)
+
+        assert (await _read_quiz_field(session_maker, contest.id)).use_cache
+
+    asyncio.run(scenario())
+
+
+async def _next_contest_id(session_maker) -> int:
+    # SQLite выдаёт следующий rowid как max(id) + 1
+    async with session_maker() as session:
+        return (await session.scalar(select(func.max(Contest.id))) or 0) + 1
+
+
+async def _assert_cached_miss(read, queries) -> None:
+    with pytest.raises(EntityDoesNotExist):
+        await read()
+    queries.count = 0
+    with pytest.raises(EntityDoesNotExist):
+        await read()
+    assert queries.count == 0
+
+
+def test_created_quiz_field_evicts_cached_miss(session_maker, queries):
+    async def scenario():
+        contest = await _create_contest(session_maker)
+        await _assert_cached_miss(lambda: _read_quiz_field(session_maker, contest.id), queries)
+
+        async with session_maker() as session:
+            uow = UnitOfWork(session)
+            async with uow:
+                await uow.quiz_field_repo.create_quiz_field(
+                    contest_id=contest.id, number_of_rows=2, number_of_columns=2, )
+
+        queries.count = 0
+        quiz_field = await _read_quiz_field(session_maker, contest.id)
+        assert not quiz_field.use_cache and queries.count > 0
+
+    asyncio.run(scenario())
+
+
+def test_created_contest_evicts_cached_miss(session_maker, queries):
+    async def scenario():
+        contest_id = await _next_contest_id(session_maker)
+        await _assert_cached_miss(lambda: _read_submissions(session_maker, contest_id), queries)
+
+        contest = await _create_contest(session_maker)
+        assert contest.id == contest_id
+
+        queries.count = 0
+        submissions = await _read_submissions(session_maker, contest_id)
+        assert not submissions.use_cache and queries.count > 0
+
+    asyncio.run(scenario())
+
+
+def test_created_full_contest_evicts_cached_miss(session_maker, queries):
+    async def scenario():
+        contest_id = await _next_contest_id(session_maker)
+        await _assert_cached_miss(lambda: _read_quiz_field(session_maker, contest_id), queries)
+
+        contest = await _create_contest(session_maker, full=True)
+        assert contest.id == contest_id
+
+        queries.count = 0
+        quiz_field = await _read_quiz_field(session_maker, contest_id)
+        assert not quiz_field.use_cache and queries.count > 0
+        assert len(quiz_field.problem_cards) == 1
+
+    asyncio.run(scenario())
+
+
+def test_problem_card_write_evicts_cached_editor_view_without_extra_reads(session_maker, sqlite_engine):
+    async def scenario():
+        contest = await _create_contest(session_maker, full=True)
+        quiz_field = await _read_quiz_field(session_maker, contest.id)
+
+        statements = []
+
+        def on_execute(conn, cursor, statement, *_) -> None:
+            statements.append(statement)
+
+        event.listen(sqlite_engine.sync_engine, "before_cursor_execute", on_execute)
+        try:
+            async with session_maker() as session:
+                uow = UnitOfWork(session)
+                async with uow:
+                    await uow.problem_card_repo.create_problem_card_with_problem(
+                        quiz_field_id=quiz_field.quiz_field_id, row=1, column=2, category_name="new",
+                        category_price=200, statement="2 + 2", answer="4", contest_id=contest.id,
+                    )
+        finally:
+            event.remove(sqlite_engine.sync_engine, "before_cursor_execute", on_execute)
+        # Контест для инвалидации передан вызывающим - поле квиза не перечитывается
+        assert not any(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+
+        updated = await _read_quiz_field(session_maker, contest.id)
+        assert not updated.use_cache
+        assert len(updated.problem_cards) == len(quiz_field.problem_cards) + 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.core.models import (
+    Contestant,
+    ContestantPointsHistory,
+)
+from backend.core.repository.crud import contestant as contestant_module
+from backend.core.repository.crud.base import AFTER_COMMIT_HOOKS_KEY
+from backend.core.repository.crud.contestant import ContestantCRUDRepository
+
+
+class ScriptedSession:
+    """
+    Сессия, которая отдаёт заранее заданные результаты запросов по порядку.
+    """
+
+    def __init__(self, *results) -> None:
+        self.info = {}
+        self.added = []
+        self._results = list(results)
+
+    async def execute(self, statement):
+        return self._results.pop(0)
+
+    async def flush(self) -> None:
+        for number, entry in enumerate(self.added, start=100):
+            entry.id = number
+
+    def add(self, instance) -> None:
+        self.added.append(instance)
+
+
+class FakeStandingsEngine:
+    def __init__(self) -> None:
+        self.updates = []
+
+    async def update_contestant(self, **kwargs) -> None:
+        self.updates.append(kwargs)
+
+
+@pytest.fixture
+def standings_engine(monkeypatch):
+    engine = FakeStandingsEngine()
+    monkeypatch.setattr(contestant_module, "get_standings_engine", lambda: engine)
+    return engine
+
+
+def _update(points_before, last_version, points_after, name="new name"):
+    contestant = Contestant(id=7, name=name, points=points_after)
+    session = ScriptedSession(
+        SimpleNamespace(one_or_none=lambda: (points_before, last_version)),  # SELECT ... FOR UPDATE
+        None,  # UPDATE
+        SimpleNamespace(one_or_none=lambda: (contestant, 3)),
+    )
+    repo = ContestantCRUDRepository(session)
+    asyncio.run(repo.update_contestant(contestant_id=7, name=name, password="secret", points=points_after))
+    return session
+
+
+def _run_standings_hook(session) -> None:
+    # Первым регистрируется обновление таблицы
+    asyncio.run(session.info[AFTER_COMMIT_HOOKS_KEY][0]())
+
+
+def test_points_change_records_history(standings_engine):
+    session = _update(points_before=10, last_version=41, points_after=25)
+
+    assert [(entry.contestant_id, entry.points) for entry in session.added] == [(7, 25)]
+    assert all(isinstance(entry, ContestantPointsHistory) for entry in session.added)
+
+    asyncio.run(session.flush())
+    _run_standings_hook(session)
+    assert standings_engine.updates == [
+        dict(contest_id=3, contestant_id=7, name="new name", points=25, version=100),
+    ]
+
+
+def test_edit_without_points_change_keeps_history(standings_engine):
+    session = _update(points_before=10, last_version=41, points_after=10)
+
+    assert session.added == []
+
+    _run_standings_hook(session)
+    # Имя уходит в таблицу с версией последней записи очков
+    assert standings_engine.updates == [
+        dict(contest_id=3, contestant_id=7, name="new name", points=10, version=41),
+    ]
+
+
+def test_edit_without_history_uses_zero_version(standings_engine):
+    session = _update(points_before=10, last_version=None, points_after=10)
+
+    assert session.added == []
+
+    _run_standings_hook(session)
+    assert standings_engine.updates[0]["version"] == 0
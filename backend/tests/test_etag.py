@@ -0,0 +1,135 @@
+import asyncio
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from types import SimpleNamespace
+
+import pytest
+from fastapi import (
+    HTTPException,
+    Response,
+)
+from starlette.requests import Request
+
+from backend.core.dependencies import etag as etag_module
+from backend.core.dependencies.etag import ContestETag
+
+
+class FakeVersionHandler:
+    def __init__(self) -> None:
+        self.version = 1
+
+    async def get_version(self, contest_id: int) -> int:
+        return self.version
+
+
+class FakePolicyContext:
+    def __init__(self, contest) -> None:
+        self.contest = contest
+
+    async def get_contest_access(self, user_id: int, contest_id: int):
+        return SimpleNamespace(contest=self.contest)
+
+
+def _request(
+        if_none_match: str | None = None,
+        query: str = "contest_id=1",
+) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({
+        "type": "http", "method": "GET", "path": "/api/v1/contest/standings",
+        "query_string": query.encode(), "headers": headers,
+    })
+
+
+def _contest(**moments) -> SimpleNamespace:
+    now = datetime.now(timezone.utc)
+    defaults = dict(
+        started_at=now - timedelta(hours=1), freeze_at=None, unfreeze_at=None, closed_at=now + timedelta(hours=1),
+    )
+    return SimpleNamespace(**{**defaults, **moments})
+
+
+@pytest.fixture
+def version_handler(monkeypatch) -> FakeVersionHandler:
+    handler = FakeVersionHandler()
+    monkeypatch.setattr(etag_module, "get_contest_version_handler", lambda: handler)
+    return handler
+
+
+def _call(
+        dependency: ContestETag,
+        request: Request,
+        user_id: int = 10,
+):
+    return asyncio.run(dependency(request, Response(), SimpleNamespace(id=user_id, domain_number=1), uow=None))
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (None, False),
+        ('W/"1-abc"', True),
+        ('"1-abc"', True),
+        ('"0-xyz", W/"1-abc"', True),
+        ("*", True),
+        ('W/"2-abc"', False),
+    ],
+)
+def test_matches_uses_weak_comparison(if_none_match, expected):
+    assert ContestETag._matches(if_none_match, 'W/"1-abc"') is expected
+
+
+def test_etag_depends_on_version_user_and_query(version_handler):
+    dependency = ContestETag()
+    etag = _call(dependency, _request())
+
+    assert _call(dependency, _request()) == etag
+    assert _call(dependency, _request(), user_id=11) != etag
+    assert _call(dependency, _request(query="contest_id=1&limit=5")) != etag
+    version_handler.version = 2
+    assert _call(dependency, _request()) != etag
+
+
+def test_matching_if_none_match_raises_304(version_handler):
+    dependency = ContestETag()
+    etag = _call(dependency, _request())
+
+    with pytest.raises(HTTPException) as exc_info:
+        _call(dependency, _request(if_none_match=etag))
+    assert exc_info.value.status_code == 304
+    assert exc_info.value.headers["ETag"] == etag
+
+
+def test_no_etag_and_no_304_without_access(version_handler, monkeypatch):
+    async def deny(**_):
+        return None
+
+    monkeypatch.setattr(etag_module, "get_policy_context", lambda uow: FakePolicyContext(_contest()))
+    dependency = ContestETag(access_check=deny)
+
+    assert _call(dependency, _request(if_none_match="*")) is None
+
+
+def test_etag_changes_when_contest_time_phase_changes(version_handler, monkeypatch):
+    async def allow(**_):
+        return object()
+
+    now = datetime.now(timezone.utc)
+    policy_context = FakePolicyContext(_contest(freeze_at=now + timedelta(minutes=5)))
+    monkeypatch.setattr(etag_module, "get_policy_context", lambda uow: policy_context)
+    dependency = ContestETag(access_check=allow)
+    before_freeze = _call(dependency, _request())
+
+    policy_context.contest = _contest(freeze_at=now - timedelta(minutes=5))
+    assert _call(dependency, _request()) != before_freeze
+
+
+def test_time_quantum_is_applied_only_while_contest_runs():
+    now = datetime.now(timezone.utc)
+    dependency = ContestETag(time_quantum_s=60)
+
+    assert ":" in dependency._get_time_state(_contest())
+    assert ":" not in dependency._get_time_state(_contest(closed_at=now - timedelta(minutes=1)))
@@ -0,0 +1,225 @@
+import asyncio
+import datetime
+
+import pytest
+from pydantic import BaseModel
+
+from backend.core.optimazers.cache.lazy_cache import (
+    DEFAULT_NEGATIVE_CACHE_TTLS,
+    LazyCache,
+    _make_key,
+)
+from backend.core.optimazers.cache.tags import (
+    CONTEST_TAG_PREFIX,
+    CacheTagRegistry,
+    contest_tag,
+    user_tag,
+)
+from backend.core.utilities.exceptions.database import EntityDoesNotExist
+from backend.storages.kv.simple_cache.impl.memory_kv.memory_kv import MemoryKeyValueSimpleCache
+
+
+class Value(BaseModel):
+    n: int
+    use_cache: bool = False  # LazyCache отмечает в нём, взят ли результат из кеша
+
+
+class CountingFunction:
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.calls = 0
+        self._delay_s = delay_s
+
+    async def __call__(self, n: int) -> Value:
+        self.calls += 1
+        await asyncio.sleep(self._delay_s)
+        return Value(n=n)
+
+
+def _decorate(lazy_cache: LazyCache, func: CountingFunction, **options):
+    async def get_value(n: int) -> Value:
+        return await func(n=n)
+
+    return lazy_cache.decorator_fabric(model_class=Value, **options)(get_value)
+
+
+def test_concurrent_misses_are_computed_once():
+    async def scenario():
+        func = CountingFunction(delay_s=0.01)
+        cached = _decorate(LazyCache(MemoryKeyValueSimpleCache()), func, use_l1=False, )
+
+        results = await asyncio.gather(*(cached(n=1) for _ in range(20)))
+
+        assert func.calls == 1
+        assert all(result.n == 1 for result in results)
+
+    asyncio.run(scenario())
+
+
+def test_waits_for_value_computed_under_another_process_lock():
+    async def scenario():
+        kv = MemoryKeyValueSimpleCache()
+        func = CountingFunction()
+        cached = _decorate(LazyCache(kv), func, use_l1=False, distributed_lock_s=5, )
+        cache_key = _make_key(None, "get_value", {"n": 1}, "json")
+        await kv.set_str_value_by_str_key(f"lock:{cache_key}", "other-process", expires_in_seconds=5)
+
+        async def other_process_stores_value() -> None:
+            await asyncio.sleep(0.1)
+            await kv.set_str_value_by_str_key(cache_key, Value(n=1).model_dump_json(), expires_in_seconds=5)
+
+        result, _ = await asyncio.gather(cached(n=1), other_process_stores_value())
+
+        assert result.n == 1
+        assert func.calls == 0
+        assert await kv.get_str_value_by_str_key(f"lock:{cache_key}") == "other-process"
+
+    asyncio.run(scenario())
+
+
+def test_lock_taken_over_after_expiry_is_not_released_by_previous_owner():
+    async def scenario():
+        kv = MemoryKeyValueSimpleCache()
+        lazy_cache = LazyCache(kv)
+
+        async def load_longer_than_lock() -> str:
+            # Блокировка истекла, её взял другой процесс
+            await kv.delete_str_key("lock:key")
+            await kv.set_str_value_by_str_key("lock:key", "other-process", expires_in_seconds=5)
+            return "value"
+
+        assert await lazy_cache._load_with_distributed_lock("key", load_longer_than_lock, lock_ttl_s=5) == "value"
+        assert await kv.get_str_value_by_str_key("lock:key") == "other-process"
+
+        async def load() -> str:
+            return "value"
+
+        await kv.delete_str_key("lock:key")
+        await lazy_cache._load_with_distributed_lock("key", load, lock_ttl_s=5)
+        assert await kv.get_str_value_by_str_key("lock:key") is None
+
+    asyncio.run(scenario())
+
+
+def test_tag_invalidation_recomputes_value_in_l1_and_l2():
+    async def scenario():
+        kv = MemoryKeyValueSimpleCache()
+        registry = CacheTagRegistry(kv, tag_ttl_s=60, tracked_prefixes=(CONTEST_TAG_PREFIX,), )
+        func = CountingFunction()
+        cached = _decorate(
+            LazyCache(kv, tag_registry=registry), func,
+            get_from_cache_not_later_than_s=60, result_cached_time_s=60, tags=lambda n: [contest_tag(n)],
+        )
+
+        assert not (await cached(n=1)).use_cache
+        assert (await cached(n=1)).use_cache
+        assert func.calls == 1
+
+        await registry.invalidate(contest_tag(2))
+        await cached(n=1)
+        assert func.calls == 1
+
+        await registry.invalidate(contest_tag(1))
+        assert not (await cached(n=1)).use_cache
+        assert func.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_untracked_tags_are_not_stored_and_cannot_be_cached_by():
+    async def scenario():
+        kv = MemoryKeyValueSimpleCache()
+        registry = CacheTagRegistry(kv, tag_ttl_s=60, tracked_prefixes=(CONTEST_TAG_PREFIX,), )
+
+        await registry.invalidate(user_tag(1))
+        assert kv._bytes == 0
+
+        cached = _decorate(
+            LazyCache(kv, tag_registry=registry), CountingFunction(), tags=lambda n: [user_tag(n)],
+        )
+        with pytest.raises(ValueError):
+            await cached(n=1)
+
+    asyncio.run(scenario())
+
+
+def test_cached_failure_is_raised_again_without_calling_function():
+    async def scenario():
+        calls = 0
+
+        async def get_value(n: int) -> Value:
+            nonlocal calls
+            calls += 1
+            raise EntityDoesNotExist(f"Value {n} not found")
+
+        cached = LazyCache(MemoryKeyValueSimpleCache()).decorator_fabric(
+            model_class=Value, negative_cache_ttls=DEFAULT_NEGATIVE_CACHE_TTLS,
+        )(get_value)
+
+        for _ in range(3):
+            with pytest.raises(EntityDoesNotExist, match="Value 1 not found"):
+                await cached(n=1)
+        assert calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_failures_are_not_cached_without_negative_ttls():
+    async def scenario():
+        calls = 0
+
+        async def get_value(n: int) -> Value:
+            nonlocal calls
+            calls += 1
+            raise EntityDoesNotExist("not found")
+
+        cached = LazyCache(MemoryKeyValueSimpleCache()).decorator_fabric(model_class=Value)(get_value)
+
+        for _ in range(2):
+            with pytest.raises(EntityDoesNotExist):
+                await cached(n=1)
+        assert calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_stale_value_is_refreshed_in_background_without_mq():
+    async def scenario():
+        kv = MemoryKeyValueSimpleCache()
+        calls = 0
+
+        async def get_counter(n: int) -> Value:
+            nonlocal calls
+            calls += 1
+            return Value(n=calls)
+
+        cached = LazyCache(kv).decorator_fabric(
+            model_class=Value, use_l1=False,
+            get_from_cache_not_later_than_s=1, result_cached_time_s=60, refresh_cache_if_ttl_less_than_s=1,
+        )(get_counter)
+
+        assert (await cached(n=0)).n == 1
+
+        # Значение в L2 устарело
+        cache_key = _make_key(None, "get_counter", {"n": 0}, "json")
+        entry = kv._entries[cache_key]
+        kv._entries[cache_key] = entry._replace(set_at=entry.set_at - datetime.timedelta(seconds=5))
+
+        stale = await cached(n=0)
+        assert stale.n == 1 and stale.use_cache
+        await asyncio.sleep(0.01)
+
+        assert calls == 2
+        assert (await cached(n=0)).n == 2
+
+    asyncio.run(scenario())
+
+
+def test_method_refresh_without_mq_or_proxy_fails_at_decoration():
+    class Service:
+        async def get_value(self, n: int) -> Value:
+            return Value(n=n)
+
+    with pytest.raises(ValueError):
+        LazyCache(MemoryKeyValueSimpleCache()).decorator_fabric(
+            model_class=Value, refresh_cache_if_ttl_less_than_s=1,
+        )(Service.get_value)
@@ -0,0 +1,107 @@
+import asyncio
+import math
+import random
+
+import pytest
+
+from backend.storages.kv.simple_cache.impl.memory_kv.memory_kv import MemoryKeyValueSimpleCache
+from backend.storages.kv.simple_cache.impl.memory_kv.timing_wheel import HierarchicalTimingWheel
+
+
+def test_wheel_rejects_non_power_of_two_slots():
+    with pytest.raises(ValueError):
+        HierarchicalTimingWheel(slots_per_level=10)
+
+
+def test_wheel_fires_key_not_before_deadline():
+    wheel = HierarchicalTimingWheel(tick_s=1.0, slots_per_level=4, levels=2)
+    wheel.schedule("a", 2.5)
+
+    assert wheel.advance(2.0) == []
+    assert wheel.advance(3.0) == ["a"]
+    assert len(wheel) == 0
+
+
+def test_wheel_cancel_and_reschedule():
+    wheel = HierarchicalTimingWheel(tick_s=1.0, slots_per_level=4, levels=2)
+    wheel.schedule("a", 2)
+    wheel.schedule("b", 2)
+    wheel.cancel("a")
+    wheel.schedule("b", 5)
+
+    assert wheel.advance(3) == []
+    assert wheel.advance(5) == ["b"]
+
+
+def test_wheel_matches_brute_force_across_cascades_and_horizon():
+    # Горизонт колеса - 4 ** 2 = 16 тиков: часть сроков лежит за ним
+    rng = random.Random(42)
+    wheel = HierarchicalTimingWheel(tick_s=1.0, slots_per_level=4, levels=2)
+    deadlines = {}
+    now = 0
+
+    for step in range(300):
+        key = rng.randrange(40)
+        if rng.random() < 0.2:
+            wheel.cancel(key)
+            deadlines.pop(key, None)
+        else:
+            expires_at = now + rng.uniform(0.1, 60)
+            wheel.schedule(key, expires_at)
+            deadlines[key] = max(math.ceil(expires_at), now + 1)
+
+        now += rng.randrange(4)
+        expired = wheel.advance(now)
+        expected = {k for k, tick in deadlines.items() if tick <= now}
+        assert set(expired) == expected, step
+        for k in expected:
+            del deadlines[k]
+
+    assert len(wheel) == len(deadlines)
+
+
+def test_kv_expires_entries_and_frees_bytes(clock):
+    async def scenario():
+        kv = MemoryKeyValueSimpleCache(clock=clock)
+        await kv.set_str_value_by_str_key("a", "1", expires_in_seconds=5)
+        await kv.set_many({"b": "2", "c": "3"}, expires_in_seconds=10)
+
+        clock.now = 5.0
+        assert await kv.get_many(["a", "b", "c"]) == [None, "2", "3"]
+
+        clock.now = 10.0
+        assert await kv.get_str_value_by_str_key("b") is None
+        assert kv._bytes == 0
+
+    asyncio.run(scenario())
+
+
+def test_kv_evicts_least_recently_read_over_max_bytes():
+    async def scenario():
+        # Каждая запись - 2 символа + накладные расходы 200 байт
+        kv = MemoryKeyValueSimpleCache(max_bytes=450)
+        await kv.set_str_value_by_str_key("a", "1", expires_in_seconds=10)
+        await kv.set_str_value_by_str_key("b", "2", expires_in_seconds=10)
+        await kv.get_str_value_by_str_key("a")
+        await kv.set_str_value_by_str_key("c", "3", expires_in_seconds=10)
+
+        assert await kv.get_many(["a", "b", "c"]) == ["1", None, "3"]
+
+    asyncio.run(scenario())
+
+
+def test_kv_set_if_not_exists_and_compare_and_delete(clock):
+    async def scenario():
+        kv = MemoryKeyValueSimpleCache(clock=clock)
+        assert await kv.set_str_value_by_str_key_if_not_exists("lock", "me", expires_in_seconds=5)
+        assert not await kv.set_str_value_by_str_key_if_not_exists("lock", "other", expires_in_seconds=5)
+
+        assert not await kv.delete_str_key_if_value_equals("lock", "other")
+        assert await kv.delete_str_key_if_value_equals("lock", "me")
+        assert await kv.get_str_value_by_str_key("lock") is None
+
+        await kv.set_str_value_by_str_key("lock", "me", expires_in_seconds=5)
+        clock.now = 6.0
+        assert await kv.set_str_value_by_str_key_if_not_exists("lock", "other", expires_in_seconds=5)
+
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+from backend.core.optimazers.cache.memory_lru import MemoryLRUCache
+
+
+def test_get_returns_value_until_ttl_expires(clock):
+    cache = MemoryLRUCache(clock=clock)
+    cache.set("a", 1, ttl_s=10)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used_entry_over_max_entries():
+    cache = MemoryLRUCache(max_entries=2)
+    cache.set("a", 1, ttl_s=10)
+    cache.set("b", 2, ttl_s=10)
+    cache.get("a")  # "b" становится самой давней
+    cache.set("c", 3, ttl_s=10)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_evicts_until_total_size_fits_max_bytes():
+    cache = MemoryLRUCache(max_bytes=10)
+    cache.set("a", 1, ttl_s=10, size=4)
+    cache.set("b", 2, ttl_s=10, size=4)
+    cache.set("c", 3, ttl_s=10, size=4)
+
+    assert cache.get("a") is None
+    assert cache.size_bytes == 8
+
+
+def test_entry_larger_than_cache_is_not_stored():
+    cache = MemoryLRUCache(max_bytes=10)
+    cache.set("a", 1, ttl_s=10, size=4)
+    cache.set("big", 2, ttl_s=10, size=11)
+
+    assert cache.get("big") is None
+    assert cache.get("a") == 1
+
+
+def test_overwrite_replaces_size_and_non_positive_ttl_deletes():
+    cache = MemoryLRUCache()
+    cache.set("a", 1, ttl_s=10, size=5)
+    cache.set("a", 2, ttl_s=10, size=3)
+    assert cache.get("a") == 2
+    assert cache.size_bytes == 3
+
+    cache.set("a", 3, ttl_s=0)
+    assert cache.get("a") is None
+    assert cache.size_bytes == 0
+
+
+def test_delete_and_clear():
+    cache = MemoryLRUCache()
+    cache.set("a", 1, ttl_s=10, size=2)
+    cache.set("b", 2, ttl_s=10, size=2)
+
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.get("a") is None
+    assert cache.size_bytes == 2
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
@@ -0,0 +1,102 @@
+import asyncio
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from backend.core.repository.crud.contest import ContestCRUDRepository
+from backend.core.schemas.contest import ContestantInStandings
+from backend.core.services.domain.contest import ContestService
+
+STARTED_AT = datetime(2026, 10, 17, 10, tzinfo=timezone.utc)
+
+
+class CapturingSession:
+    def __init__(self) -> None:
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: [])
+
+
+def _downsampled_sql(
+        contestant_ids=(1, 2),
+        until: datetime = STARTED_AT + timedelta(hours=1),
+        max_points: int = 60,
+) -> str | None:
+    session = CapturingSession()
+    repo = ContestCRUDRepository(session)
+    asyncio.run(repo.get_downsampled_points_history(
+        contest_id=5, contestant_ids=list(contestant_ids), since=STARTED_AT, until=until, max_points=max_points,
+    ))
+    if not session.statements:
+        return None
+    compiled = session.statements[0].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+    )
+    return " ".join(str(compiled).split())
+
+
+def test_downsampling_takes_last_value_per_contestant_and_bucket():
+    sql = _downsampled_sql()
+
+    bucket = (
+        "greatest(floor(EXTRACT(epoch FROM contestant_points_history.created_at - '2026-10-17 10:00:00+00:00')"
+        " / CAST(60.0 AS FLOAT)), -1)"
+    )
+    assert f"SELECT DISTINCT ON (contestant_points_history.contestant_id, {bucket})" in sql
+    assert (
+        f"ORDER BY contestant_points_history.contestant_id, {bucket}, "
+        f"contestant_points_history.created_at DESC, contestant_points_history.id DESC"
+    ) in sql
+    assert "contestant_points_history.contest_id = 5" in sql
+    assert "contestant_points_history.contestant_id IN (1, 2)" in sql
+    assert "contestant_points_history.created_at <= '2026-10-17 11:00:00+00:00'" in sql
+
+
+def test_downsampling_bucket_is_at_least_one_second():
+    sql = _downsampled_sql(until=STARTED_AT + timedelta(seconds=10), max_points=100)
+
+    assert "/ CAST(1.0 AS FLOAT)), -1)" in sql
+
+
+def test_downsampling_without_contestants_skips_query():
+    assert _downsampled_sql(contestant_ids=()) is None
+
+
+def test_history_series_follow_top_order_and_keep_empty_series():
+    contest = SimpleNamespace(id=5, started_at=STARTED_AT, closed_at=STARTED_AT + timedelta(hours=2))
+    top = [
+        ContestantInStandings(contestant_id=2, name="b", points=30, rank=1),
+        ContestantInStandings(contestant_id=1, name="a", points=10, rank=2),
+        ContestantInStandings(contestant_id=3, name="c", points=0, rank=3),
+    ]
+    rows = [
+        (1, STARTED_AT, 0),
+        (1, STARTED_AT + timedelta(minutes=5), 10),
+        (2, STARTED_AT + timedelta(minutes=1), 30),
+    ]
+
+    history = ContestService._map_contest_standings_history(contest, top, rows, is_frozen=False, )
+
+    assert [series.contestant_id for series in history.series] == [2, 1, 3]
+    assert [point.points for point in history.series[1].history] == [0, 10]
+    assert history.series[2].history == []
+
+
+def test_standings_as_of_falls_back_to_start_points():
+    session = CapturingSession()
+    repo = ContestCRUDRepository(session)
+    asyncio.run(repo.get_contestant_in_standings(contest_id=5, as_of=STARTED_AT))
+    compiled = session.statements[0].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+    )
+    sql = " ".join(str(compiled).split())
+
+    assert "contestant_points_history.created_at <= '2026-10-17 10:00:00+00:00'" in sql
+    assert "THEN contest.start_points ELSE contestant.points END" in sql
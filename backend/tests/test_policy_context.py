@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from backend.core.models.permission import (
+    PermissionActionType,
+    PermissionResourceType,
+)
+from backend.core.repository.crud.uow import UnitOfWork
+from backend.core.services.access_policies.context import get_policy_context
+from backend.core.services.access_policies.problem_card import ProblemCardAccessPolicy
+from backend.core.utilities.exceptions.permission import PermissionDenied
+
+policy = ProblemCardAccessPolicy()
+
+
+async def _check_all(uow: UnitOfWork, chain) -> None:
+    await policy.can_user_edit_problem_card(uow=uow, user_id=chain.user_id, problem_card_id=chain.problem_card_id)
+    await policy.can_user_edit_quiz_field(uow=uow, user_id=chain.user_id, quiz_field_id=chain.quiz_field_id)
+    await policy.can_user_manage_contest(uow=uow, user_id=chain.user_id, contest_id=chain.contest_id)
+
+
+def test_policy_chain_reads_each_entity_at_most_once(session_maker, make_contest_chain):
+    async def scenario():
+        chain = await make_contest_chain(granted=[PermissionActionType.EDIT])
+        async with session_maker() as session:
+            uow = UnitOfWork(session)
+            for _ in range(3):
+                await _check_all(uow, chain)
+
+            db_fetches = get_policy_context(uow).db_fetches
+            assert db_fetches
+            assert max(db_fetches.values()) == 1
+
+    asyncio.run(scenario())
+
+
+def test_write_resets_policy_context(session_maker, make_contest_chain):
+    async def scenario():
+        chain = await make_contest_chain(granted=[PermissionActionType.EDIT])
+        async with session_maker() as session:
+            uow = UnitOfWork(session)
+            await _check_all(uow, chain)
+            context = get_policy_context(uow)
+
+            async with uow:
+                await uow.quiz_field_repo.update_quiz_field(
+                    quiz_field_id=chain.quiz_field_id, number_of_rows=2, number_of_columns=2, )
+
+            assert get_policy_context(uow) is not context
+            await _check_all(uow, chain)
+            assert get_policy_context(uow).db_fetches[("problem_card_access", (chain.user_id, chain.problem_card_id))] == 1
+
+    asyncio.run(scenario())
+
+
+def test_granted_permission_is_seen_by_next_check(session_maker, make_contest_chain):
+    async def scenario():
+        chain = await make_contest_chain(granted=[])
+        async with session_maker() as session:
+            uow = UnitOfWork(session)
+            assert await policy.can_user_manage_contest(
+                uow=uow, user_id=chain.user_id, contest_id=chain.contest_id, raise_if_none=False) is None
+
+            async with uow:
+                await uow.permission_repo.create_permission(
+                    user_id=chain.user_id,
+                    resource_type=PermissionResourceType.CONTEST.value,
+                    permission_type=PermissionActionType.EDIT.value,
+                    resource_id=chain.contest_id,
+                )
+
+            assert await policy.can_user_manage_contest(
+                uow=uow, user_id=chain.user_id, contest_id=chain.contest_id) is not None
+
+    asyncio.run(scenario())
+
+
+def test_rollback_resets_policy_context(session_maker, make_contest_chain):
+    async def scenario():
+        chain = await make_contest_chain(granted=[])
+        async with session_maker() as session:
+            uow = UnitOfWork(session)
+            with pytest.raises(PermissionDenied):
+                await policy.can_user_manage_contest(uow=uow, user_id=chain.user_id, contest_id=chain.contest_id)
+            context = get_policy_context(uow)
+
+            with pytest.raises(RuntimeError):
+                async with uow:
+                    raise RuntimeError
+
+            assert get_policy_context(uow) is not context
+
+    asyncio.run(scenario())
@@ -0,0 +1,68 @@
+import asyncio
+from contextlib import contextmanager
+from typing import (
+    Iterator,
+    List,
+)
+
+from sqlalchemy import event
+
+from backend.core.models import User
+from backend.core.optimazers.cache.principal import Principal
+from backend.core.repository.crud.uow import UnitOfWork
+
+
+@contextmanager
+def _record_statements(engine) -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_get_user_returns_orm_row_when_principal_is_cached(session_maker, make_contest_chain, sqlite_engine):
+    async def scenario():
+        chain = await make_contest_chain(granted=[])
+        async with session_maker() as session:
+            principal = await UnitOfWork(session).user_repo.get_principal_by_id(user_id=chain.user_id)
+            assert isinstance(principal, Principal)
+
+        async with session_maker() as session:
+            uow = UnitOfWork(session)
+            with _record_statements(sqlite_engine) as statements:
+                assert await uow.user_repo.get_principal_by_id(user_id=chain.user_id) == principal
+                assert await uow.user_repo.get_principal_by_uuid(user_uuid=principal.uuid) == principal
+            assert statements == []
+
+            user = await uow.user_repo.get_user_by_id(user_id=chain.user_id)
+            assert isinstance(user, User)
+            assert user in session
+            assert user.hashed_password == "-"
+
+            user = await uow.user_repo.get_user_by_uuid(user_uuid=principal.uuid)
+            assert user in session
+            assert user.hashed_password == "-"
+
+    asyncio.run(scenario())
+
+
+def test_updated_user_is_not_taken_from_cache(session_maker, make_contest_chain):
+    async def scenario():
+        chain = await make_contest_chain(granted=[])
+        async with session_maker() as session:
+            await UnitOfWork(session).user_repo.get_principal_by_id(user_id=chain.user_id)
+
+        async with session_maker() as session:
+            uow = UnitOfWork(session)
+            async with uow:
+                await uow.user_repo.update_user(user_id=chain.user_id, username="renamed", password="secret")
+                principal = await uow.user_repo.get_principal_by_id(user_id=chain.user_id)
+                assert principal.username == "renamed"
+
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import (
+    AsyncMock,
+    MagicMock,
+)
+
+import pytest
+
+from backend.core.schemas.contest import (
+    ArrayContestantInStandings,
+    ContestantInStandings,
+    ContestStandings,
+    ContestStandingsEventType,
+)
+from backend.core.services.domain.contest import ContestService
+from backend.core.utilities.exceptions.logic import FeatureUnavailable
+
+
+def _service(
+        engine=None,
+        event_bus=None,
+) -> ContestService:
+    service = ContestService.__new__(ContestService)
+    service.standings_engine = engine
+    service.standings_event_bus = event_bus
+    service.contest_standings = AsyncMock(return_value=ContestStandings.model_construct(
+        contest_id=1, freeze_at=None, is_frozen=False, standings=ArrayContestantInStandings(body=[]),
+    ))
+    return service
+
+
+def _engine_and_bus():
+    engine = MagicMock()
+    engine.is_ready = AsyncMock(return_value=True)
+    engine.get_standings = AsyncMock(return_value=[
+        ContestantInStandings(contestant_id=1, name="a", points=5, rank=1),
+    ])
+    event_bus = MagicMock()
+    event_bus.subscribe = AsyncMock(return_value=asyncio.Queue())
+    return engine, event_bus
+
+
+async def _open_stream(service: ContestService):
+    return await service.contest_standings_events(
+        user_id=1, contest_id=1, heartbeat_interval_s=0.05, max_lifetime_s=0.12,
+    )
+
+
+def test_stream_without_engine_is_unavailable():
+    with pytest.raises(FeatureUnavailable):
+        asyncio.run(_open_stream(_service()))
+
+
+def test_stream_that_is_never_iterated_does_not_subscribe():
+    async def scenario():
+        engine, event_bus = _engine_and_bus()
+        events = await _open_stream(_service(engine, event_bus))
+        await events.aclose()
+
+        event_bus.subscribe.assert_not_awaited()
+        event_bus.unsubscribe.assert_not_called()
+
+    asyncio.run(scenario())
+
+
+def test_stream_sends_snapshot_read_after_subscribing_and_unsubscribes():
+    async def scenario():
+        engine, event_bus = _engine_and_bus()
+        events = [event async for event in await _open_stream(_service(engine, event_bus))]
+
+        assert events[0].event_type == ContestStandingsEventType.SNAPSHOT
+        assert events[0].standings.body[0].points == 5
+        assert {event.event_type for event in events[1:]} == {ContestStandingsEventType.HEARTBEAT}
+        event_bus.unsubscribe.assert_called_once()
+
+    asyncio.run(scenario())